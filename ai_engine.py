@@ -2,9 +2,11 @@
 #  AI DOCUMENTATION ENGINE (OpenAI GPT)
 # ============================================================
 
+import json
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from utils.ai_cache import responses, response_key
 
 # ------------------------------------------------------------
 #  LOAD .env FILE
@@ -13,16 +15,47 @@ load_dotenv()
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not API_KEY:
-    raise Exception("❌ OPENAI_API_KEY missing in .env file")
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
+MAX_TOKENS = 2000
+
+PARSE_ERROR = "Error parsing AI output"
+
+_client = None
+
+
+def get_client():
+    """
+    OpenAI client, created on first use so a stub client can be passed
+    to generate_ai_docs() without an API key or the openai package.
+    """
+    global _client
 
-client = OpenAI(api_key=API_KEY)
+    if _client is None:
+        if not API_KEY:
+            raise Exception("❌ OPENAI_API_KEY missing in .env file")
+        from openai import OpenAI
+        _client = OpenAI(api_key=API_KEY)
+    return _client
+
+
+def get_async_client():
+    """
+    AsyncOpenAI client for utils.ai_batch. The SDK's own retries are
+    off: the batch runner retries with its own backoff and rate limits.
+    """
+    if not API_KEY:
+        raise Exception("❌ OPENAI_API_KEY missing in .env file")
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=API_KEY, max_retries=0)
 
 
 # ------------------------------------------------------------
 #  BUILD PROMPT
 # ------------------------------------------------------------
 def build_prompt(parsed):
+    # The stanza index is byte offsets for the audits, not config data
+    parsed = {key: value for key, value in parsed.items() if key != "stanza_index"}
     return f"""
 You are NetDoc AI, an enterprise-grade network engineering assistant.
 
@@ -67,24 +100,57 @@ IMPORTANT:
 # ------------------------------------------------------------
 #  CALL OPENAI GPT API
 # ------------------------------------------------------------
-def generate_ai_docs(parsed):
-    prompt = build_prompt(parsed)
+def build_messages(parsed):
+    return [
+        {"role": "system", "content": "You are NetDoc AI, a network engineering expert."},
+        {"role": "user", "content": build_prompt(parsed)},
+    ]
+
+
+def generate_ai_docs(parsed, client=None, use_cache=True):
+    """
+    AI documentation for one parsed config. Responses are cached by
+    (normalized prompt, model, temperature) with a TTL, so the same
+    config is only sent to the API once (utils.ai_cache). `client`
+    defaults to the OpenAI client; benchmarks/bench_ai_cache.py passes
+    a local stub.
+    """
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are NetDoc AI, a network engineering expert."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.2,
-        max_tokens=2000
-    )
+    messages = build_messages(parsed)
+    key = response_key(messages, MODEL, TEMPERATURE)
 
-    raw_text = completion.choices[0].message.content
+    raw_text = responses.get(key) if use_cache else None
+    if raw_text is not None:
+        return parse_ai_output(raw_text)
 
-    # Parse JSON safely
-    import json
+    completion = (client or get_client()).chat.completions.create(**completion_args(messages))
+    return store_response(key, completion.choices[0].message.content, use_cache)
 
+
+def completion_args(messages):
+    return {
+        "model": MODEL,
+        "messages": messages,
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_TOKENS,
+    }
+
+
+def store_response(key, raw_text, use_cache=True):
+    """Parse a completion and cache it under `key` unless it is unparseable."""
+    docs = parse_ai_output(raw_text)
+
+    # Unparseable answers are not cached: the next call retries
+    failed = isinstance(docs, dict) and docs.get("summary") == PARSE_ERROR
+    if use_cache and not failed:
+        responses.put(key, raw_text)
+    return docs
+
+
+# ------------------------------------------------------------
+#  PARSE MODEL OUTPUT
+# ------------------------------------------------------------
+def parse_ai_output(raw_text):
     # Direct JSON result
     try:
         return json.loads(raw_text)
@@ -99,7 +165,7 @@ def generate_ai_docs(parsed):
         return json.loads(clean)
     except:
         return {
-            "summary": "Error parsing AI output",
+            "summary": PARSE_ERROR,
             "explanation": raw_text,
             "best_practices": [],
             "recommendations": []
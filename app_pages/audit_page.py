@@ -1,7 +1,9 @@
 import streamlit as st
 from auth_engine import current_user
-from utils.parser import parse_config
-from main import run_security_audit, generate_topology_mermaid, export_all_formats
+from audit_pipeline import AuditPipeline
+from utils.audit_cache import ALL_ENGINES, run_audit_cached
+from utils.parse_cache import parse_config_cached
+from main import generate_topology_mermaid, export_all_formats
 
 
 def goto(page):
@@ -29,14 +31,23 @@ def audit_page():
     if uploaded:
         config_text = uploaded.read().decode()
 
-        parsed = parse_config(config_text)
-        audit = run_security_audit(parsed["raw"])
+        parsed = parse_config_cached(config_text)
+        # One scan for all three reports; a cache miss runs the pipeline
+        reports = run_audit_cached(
+            parsed["raw"], lambda raw: AuditPipeline(parsed).reports(), engine=ALL_ENGINES, user=user
+        )
+        audit = reports["main"]
         topo = generate_topology_mermaid(parsed["raw"])
         exports = export_all_formats(audit, topo)
 
         st.subheader("Audit Result")
         st.json(audit)
 
+        with st.expander("Detailed Audit"):
+            st.json(reports["audit"])
+        with st.expander("Security Posture"):
+            st.json(reports["security"])
+
         st.subheader("Topology")
         st.markdown(f"```mermaid\n{topo}\n```")
 
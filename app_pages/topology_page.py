@@ -1,7 +1,13 @@
+import os
+
 import streamlit as st
 from auth_engine import current_user
-from utils.parser import parse_config
+from utils.parse_cache import parse_config_cached
 from main import generate_topology_mermaid
+from topology_engine import TopologyViews
+from topology_layout import view_svg
+from utils.topology_graph import TOPOLOGY_PATH, TopologyGraph
+from utils.topology_snapshots import SnapshotStore
 
 
 def goto(page):
@@ -9,6 +15,17 @@ def goto(page):
     st.rerun()
 
 
+@st.cache_resource
+def fleet_views(mtime: float) -> TopologyViews:
+    """Reloaded only when the saved fleet graph changes on disk."""
+    return TopologyViews(TopologyGraph.load(TOPOLOGY_PATH))
+
+
+@st.cache_resource
+def snapshot_store() -> SnapshotStore:
+    return SnapshotStore()
+
+
 def topology_page():
     user = current_user()
     if not user:
@@ -27,9 +44,38 @@ def topology_page():
     config = st.text_area("Paste configuration", height=300)
 
     if st.button("Generate Topology"):
-        parsed = parse_config(config)
+        parsed = parse_config_cached(config)
         topo = generate_topology_mermaid(parsed["raw"])
         st.markdown(f"```mermaid\n{topo}\n```")
 
+    # Fleet map (saved by `python -m utils.fleet`), one budgeted view at a time
+    if os.path.exists(TOPOLOGY_PATH):
+        st.subheader("Fleet map")
+        views = fleet_views(os.path.getmtime(TOPOLOGY_PATH))
+        group = st.selectbox("View", ["Overview"] + [g for g, n in zip(views.groups, views.sizes) if n])
+        page = 0
+        if group != "Overview":
+            page = st.number_input("Page", 1, views.pages(group), 1) - 1
+
+        # Laid out server side (cached per view); Mermaid on request
+        view = "overview" if group == "Overview" else group
+        if st.checkbox("Show Mermaid source"):
+            scene = views.overview_scene() if view == "overview" else views.group_scene(view, page)
+            st.code(scene.mermaid())
+        else:
+            st.markdown(view_svg(views, view, page), unsafe_allow_html=True)
+
+    # What changed between two fleet snapshots
+    store = snapshot_store()
+    snapshots = store.ids()
+    if len(snapshots) > 1:
+        st.subheader("Changes")
+        old = st.selectbox("From", snapshots, index=len(snapshots) - 2)
+        new = st.selectbox("To", snapshots, index=len(snapshots) - 1)
+        diff = store.diff(old, new)
+        for key in ("added_devices", "removed_devices", "added_links", "removed_links"):
+            with st.expander(f"{key.replace('_', ' ').capitalize()}: {len(diff[key])}"):
+                st.write(diff[key])
+
     if st.button("Back"):
         goto("dashboard")
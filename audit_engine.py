@@ -1,4 +1,14 @@
-import re
+import os
+
+from audit_rules import RULES, scan, scan_incremental, sections
+from rule_engine import TIMINGS, is_skipped
+from utils.cache import LRUCache
+from utils.parser import interface_table, stanza_index
+
+
+# Last rule snapshot per hostname, for incremental re-audits
+SNAPSHOT_ENTRIES = int(os.getenv("NETDOC_AUDIT_SNAPSHOTS", "4096"))
+_snapshots = LRUCache(SNAPSHOT_ENTRIES)
 
 
 # ============================================================
@@ -17,10 +27,66 @@ def run_security_audit(parsed):
       }
     """
 
-    raw = parsed.get("raw", "")
-    interfaces = parsed.get("interfaces", {})
+    return build_audit(parsed, audit_findings(parsed))
+
+
+def audit_findings(parsed):
+    """{rule_id: [findings]} for every "audit" rule (empty list = passed)."""
+    return scan(parsed.get("raw", ""), "audit", stanza_index(parsed))
+
+
+def gated_sections(parsed) -> set:
+    """Report sections build_audit() leaves out for this device."""
+    # CDP exposure only matters on a device that actually has CDP neighbors
+    return set() if parsed.get("cdp_neighbors", {}) else {"cdp_issues"}
+
+
+def failed_rules(parsed, findings) -> list:
+    """
+    Ids of "audit" rules that failed, as build_audit() reports them:
+    rules of gated sections and rules skipped (long line / budget)
+    are not failures.
+    """
+    gated = gated_sections(parsed)
+    return [
+        rule.rule_id for rule in RULES.rules("audit")
+        if rule.section not in gated
+        and findings.get(rule.rule_id)
+        and not is_skipped(rule.rule_id, findings[rule.rule_id])
+    ]
+
+
+def reaudit(parsed):
+    """
+    run_security_audit() for a new snapshot of a known device. The
+    config is diffed per stanza against the last snapshot seen for the
+    same hostname and only rules depending on changed stanzas re-run;
+    the rest reuse their cached findings.
+    """
+
+    hostname = parsed.get("hostname", "Unknown")
+    snapshot = scan_incremental(
+        parsed.get("raw", ""), "audit", stanza_index(parsed), _snapshots.get(hostname)
+    )
+    _snapshots.put(hostname, snapshot)
+    return build_audit(parsed, snapshot.evaluate())
+
+
+def forget_device(hostname: str):
+    """Drop the cached snapshot so the next reaudit() runs in full."""
+    _snapshots.pop(hostname)
+
+
+def build_audit(parsed, findings, interfaces=None):
+    """
+    Assemble the audit report from {rule_id: [findings]} (rules of other
+    engines are ignored). `interfaces` is a precomputed interface_table().
+    """
+
+    if interfaces is None:
+        interfaces = interface_table(parsed)
     vlans = parsed.get("vlans", [])
-    neighbors = parsed.get("cdp_neighbors", {})
+    gated = gated_sections(parsed)
 
     audit = {
         "hostname": parsed.get("hostname", "Unknown"),
@@ -34,46 +100,29 @@ def run_security_audit(parsed):
         "summary": []
     }
 
+    # Every declarative rule (audit_rules.py), grouped by report section
+    found = sections(findings, "audit")
+
     # ============================================================
     # 1) Weak Passwords
     # ============================================================
-    weak_pw_patterns = [
-        r"password\s+\d?\s*cisco",
-        r"password\s+\d?\s*admin",
-        r"password\s+\d?\s*1234",
-        r"username\s+\w+\s+password",
-        r"enable password",
-        r"enable secret 5\s*\$1\$"  # weak MD5
-    ]
-
-    for pattern in weak_pw_patterns:
-        matches = re.findall(pattern, raw, flags=re.IGNORECASE)
-        for m in matches:
-            audit["weak_passwords"].append(m)
-
-    if not audit["weak_passwords"]:
-        audit["weak_passwords"] = ["OK"]
+    audit["weak_passwords"] = found["weak_passwords"] or ["OK"]
 
 
     # ============================================================
     # 2) AAA Misconfiguration
     # ============================================================
-    if "aaa new-model" not in raw.lower():
-        audit["aaa_misconfig"].append("AAA not enabled")
-
-    if "tacacs" not in raw.lower() and "radius" not in raw.lower():
-        audit["aaa_misconfig"].append("No TACACS+/RADIUS configured")
-
-    if not audit["aaa_misconfig"]:
-        audit["aaa_misconfig"] = ["OK"]
+    audit["aaa_misconfig"] = found["aaa_misconfig"] or ["OK"]
 
 
     # ============================================================
     # 3) Unused Interfaces Not Shutdown
     # ============================================================
-    for intf, data in interfaces.items():
-        if "admin_down" not in data and data.get("status") == "up" and data.get("protocol") == "down":
-            audit["unused_interface_issues"].append(f"{intf} admin UP but not used")
+    with TIMINGS.timed("audit.interfaces.unused", len(interfaces)) as check:
+        for intf, data in interfaces.items():
+            if "admin_down" not in data and data.get("status") == "up" and data.get("protocol") == "down":
+                audit["unused_interface_issues"].append(f"{intf} admin UP but not used")
+        check.matches = len(audit["unused_interface_issues"])
 
     if not audit["unused_interface_issues"]:
         audit["unused_interface_issues"] = ["OK"]
@@ -84,35 +133,29 @@ def run_security_audit(parsed):
     # ============================================================
     default_vlans = ["1", "1002", "1003", "1004", "1005"]
 
-    for v in vlans:
-        if str(v) in default_vlans:
-            audit["vlan_issues"].append(f"Default VLAN {v} still active")
+    with TIMINGS.timed("audit.vlan.defaults", len(vlans)) as check:
+        for v in vlans:
+            if str(v) in default_vlans:
+                audit["vlan_issues"].append(f"Default VLAN {v} still active")
+        check.matches = len(audit["vlan_issues"])
 
-    if "switchport access vlan 1" in raw.lower():
-        audit["vlan_issues"].append("Interfaces using VLAN 1")
+    audit["vlan_issues"] += found["vlan_issues"]
 
     if not audit["vlan_issues"]:
         audit["vlan_issues"] = ["OK"]
 
 
     # ============================================================
-    # 5) STP Security
+    # 5) STP Security (per access/trunk port when the config is indexed)
     # ============================================================
-    if "spanning-tree portfast" not in raw.lower():
-        audit["stp_issues"].append("Missing PortFast")
-
-    if "bpduguard enable" not in raw.lower():
-        audit["stp_issues"].append("No BPDU Guard")
-
-    if not audit["stp_issues"]:
-        audit["stp_issues"] = ["OK"]
+    audit["stp_issues"] = found["stp_issues"] or ["OK"]
 
 
     # ============================================================
     # 6) CDP Exposure
     # ============================================================
-    if neighbors and "no cdp run" not in raw.lower():
-        audit["cdp_issues"].append("CDP enabled — exposes device info")
+    if "cdp_issues" not in gated:
+        audit["cdp_issues"] = found["cdp_issues"]
 
     if not audit["cdp_issues"]:
         audit["cdp_issues"] = ["OK"]
@@ -121,14 +164,7 @@ def run_security_audit(parsed):
     # ============================================================
     # 7) ACL Gaps
     # ============================================================
-    if "access-list" not in raw.lower():
-        audit["acl_issues"].append("No ACLs configured anywhere")
-
-    if "line vty" in raw.lower() and "access-class" not in raw.lower():
-        audit["acl_issues"].append("VTY lines allow open access (no ACL)")
-
-    if not audit["acl_issues"]:
-        audit["acl_issues"] = ["OK"]
+    audit["acl_issues"] = found["acl_issues"] or ["OK"]
 
 
     # ============================================================
@@ -0,0 +1,67 @@
+# ============================================================
+#  AUDIT PIPELINE — parse once, scan once, three report views
+#
+#  main.run_security_audit, audit_engine.run_security_audit and
+#  security_engine.run_security_audit each scan the config for their
+#  own rules. The pipeline runs every rule of every engine in one
+#  compiled scan over the parsed config, then projects each
+#  engine's report schema from the shared findings. The audit page
+#  goes through here; benchmarks.bench_rules.compare() times it
+#  against the first-release engines.
+# ============================================================
+
+import audit_engine
+import main
+import security_engine
+from audit_rules import scan
+from utils.parse_cache import parse_config_cached
+from utils.parser import interface_table, stanza_index
+
+
+ENGINES = ("main", "audit", "security")
+
+
+class AuditPipeline:
+    """
+    Shared views of one parsed config: stanza index (from the parser),
+    interface table and the findings of every rule. Each report method
+    is a thin projection and costs no further scan.
+    """
+
+    __slots__ = ("parsed", "interfaces", "findings")
+
+    def __init__(self, parsed: dict):
+        self.parsed = parsed
+        self.interfaces = interface_table(parsed)
+        self.findings = scan(parsed.get("raw", ""), None, stanza_index(parsed))
+
+    @classmethod
+    def from_text(cls, text: str) -> "AuditPipeline":
+        return cls(parse_config_cached(text))
+
+    # --------------------------------------------------------
+    # Engine projections (same schema as each run_security_audit)
+    # --------------------------------------------------------
+    def main_report(self) -> dict:
+        return main.build_report(self.findings)
+
+    def audit_report(self) -> dict:
+        return audit_engine.build_audit(self.parsed, self.findings, self.interfaces)
+
+    def security_report(self) -> dict:
+        return security_engine.build_security_audit(self.parsed, self.findings, self.interfaces)
+
+    def reports(self, engines=ENGINES) -> dict:
+        """{"main": ..., "audit": ..., "security": ...} for the requested engines."""
+        build = {
+            "main": self.main_report,
+            "audit": self.audit_report,
+            "security": self.security_report,
+        }
+        return {engine: build[engine]() for engine in engines}
+
+
+def audit_all(source) -> dict:
+    """All three reports for a config text or an already parsed dict."""
+    pipeline = AuditPipeline.from_text(source) if isinstance(source, str) else AuditPipeline(source)
+    return pipeline.reports()
@@ -0,0 +1,157 @@
+# ============================================================
+#  AUDIT RULES — every static check, declared once
+#
+#  audit_engine, security_engine and main.run_security_audit read
+#  their findings from one compiled scan of these rules. Triggers
+#  match case-insensitively unless declared case_sensitive; Regex
+#  triggers only run where their anchor literal occurs.
+# ============================================================
+
+from rule_engine import RULES, Regex, evaluate_incremental
+
+
+# ------------------------------------------------------------
+#  audit_engine
+# ------------------------------------------------------------
+_PORTFAST = Regex(r"^\s*spanning-tree portfast\b", anchor="spanning-tree portfast")
+
+# Passwords can sit under any stanza (username, line, router bgp,
+# interface ppp ...), so these rules keep whole-config scope.
+for i, (pattern, anchor) in enumerate((
+    (r"password\s+\d?\s*cisco", "password"),
+    (r"password\s+\d?\s*admin", "password"),
+    (r"password\s+\d?\s*1234", "password"),
+    (r"username\s+\w+\s+password", "username"),
+    (r"enable password", "enable password"),
+    (r"enable secret 5\s*\$1\$", "enable secret 5"),  # weak MD5
+), 1):
+    RULES.add(f"audit.weak_password.{i}", "audit", "weak_passwords",
+              collect=Regex(pattern, anchor), severity="high")
+
+RULES.add("audit.aaa.new_model", "audit", "aaa_misconfig", "AAA not enabled",
+          absent="aaa new-model", severity="high")
+RULES.add("audit.aaa.servers", "audit", "aaa_misconfig", "No TACACS+/RADIUS configured",
+          absent=("tacacs", "radius"), severity="medium")
+
+RULES.add("audit.vlan.access_vlan1", "audit", "vlan_issues", "{name} using VLAN 1",
+          scope="interface", severity="low",
+          present=Regex(r"^\s*switchport access vlan 1\s*$", anchor="switchport access vlan 1"))
+RULES.add("audit.vlan.access_vlan1_any", "audit", "vlan_issues", "Interfaces using VLAN 1",
+          fallback_for="interface", present="switchport access vlan 1", severity="low")
+
+RULES.add("audit.stp.portfast", "audit", "stp_issues", "{name} access port missing PortFast",
+          scope="interface", present="switchport mode access", absent=_PORTFAST,
+          unless=("spanning-tree portfast default", "spanning-tree portfast edge default"),
+          severity="low")
+RULES.add("audit.stp.bpduguard", "audit", "stp_issues", "{name} access port missing BPDU Guard",
+          scope="interface", present="switchport mode access",
+          absent="spanning-tree bpduguard enable", unless="bpduguard default", severity="medium")
+RULES.add("audit.stp.trunk_portfast", "audit", "stp_issues", "{name} PortFast enabled on trunk port",
+          scope="interface", present=("switchport mode trunk", _PORTFAST),
+          absent="spanning-tree portfast trunk", severity="medium")
+RULES.add("audit.stp.portfast_any", "audit", "stp_issues", "Missing PortFast",
+          fallback_for="interface", absent="spanning-tree portfast", severity="low")
+RULES.add("audit.stp.bpduguard_any", "audit", "stp_issues", "No BPDU Guard",
+          fallback_for="interface", absent="bpduguard enable", severity="medium")
+
+# Only reported when CDP neighbours were actually discovered
+RULES.add("audit.cdp.enabled", "audit", "cdp_issues", "CDP enabled — exposes device info",
+          absent="no cdp run", severity="low")
+
+RULES.add("audit.acl.none", "audit", "acl_issues", "No ACLs configured anywhere",
+          absent="access-list", severity="high")
+RULES.add("audit.acl.vty_open", "audit", "acl_issues", "VTY lines {name} allow open access (no ACL)",
+          scope="line", scope_name="vty", absent="access-class", severity="high")
+RULES.add("audit.acl.vty_open_any", "audit", "acl_issues", "VTY lines allow open access (no ACL)",
+          fallback_for="line", present="line vty", absent="access-class", severity="high")
+
+
+# ------------------------------------------------------------
+#  security_engine
+# ------------------------------------------------------------
+WEAK_KEYWORDS = ("cisco", "admin", "1234", "12345", "password")
+
+for i, (pattern, anchor) in enumerate((
+    (r"password 0 \S+", "password 0"),
+    (r"username \S+ password", "username"),
+    (r"enable password \S+", "enable password"),
+    (r"enable secret \S+", "enable secret"),
+    (r"password \S+", "password"),
+    (r"secret \S+", "secret"),
+), 1):
+    RULES.add(f"security.weak_password.{i}", "security", "weak_passwords",
+              collect=Regex(pattern, anchor), match_filter=WEAK_KEYWORDS)
+
+RULES.add("security.aaa.disabled", "security", "aaa_status", "AAA is NOT enabled",
+          absent="aaa new-model")
+RULES.add("security.stp.portfast", "security", "stp_issues", "No STP PortFast detected",
+          absent="spanning-tree portfast")
+RULES.add("security.stp.bpduguard", "security", "stp_issues", "No BPDU Guard detected",
+          absent="bpduguard")
+RULES.add("security.vlan.svi1", "security", "default_vlan_risks", "VLAN 1 active — not recommended",
+          present=Regex(r"interface vlan ?1", anchor="interface vlan"))
+RULES.add("security.vlan.trunk1", "security", "default_vlan_risks", "VLAN 1 allowed on trunk",
+          present=Regex(r"switchport trunk allowed vlan.*1", anchor="switchport trunk allowed vlan",
+                        case_sensitive=True))
+RULES.add("security.logging.buffered", "security", "logging", "Logging not configured",
+          absent="logging buffered")
+RULES.add("security.cdp.enabled", "security", "cdp_exposure", "CDP is enabled — may expose topology",
+          present="cdp run")
+
+
+# ------------------------------------------------------------
+#  main.run_security_audit (issues / warnings / info)
+#  These checks were plain `in` tests on the config text, so they
+#  stay case-sensitive.
+# ------------------------------------------------------------
+_VLAN_ID = Regex(r"vlan (\d+)", anchor="vlan ", case_sensitive=True)
+
+RULES.add("main.password.plaintext", "main", "issues",
+          "⚠️ Plain-text password detected. Use secret 5 or 9 hashing.",
+          present=("username", "password"), any_of=("password 0", "password "), case_sensitive=True)
+RULES.add("main.vlan.none", "main", "warnings", "No VLANs detected in configuration.",
+          absent=_VLAN_ID, case_sensitive=True)
+RULES.add("main.vlan.detected", "main", "info", "Detected VLANs: {matches}",
+          collect=_VLAN_ID, case_sensitive=True)
+RULES.add("main.stp.missing", "main", "warnings", "STP not found — risky for L2 loops.",
+          absent="spanning-tree", case_sensitive=True)
+RULES.add("main.stp.portfast", "main", "warnings", "PortFast missing on access ports.",
+          present="spanning-tree", absent="spanning-tree portfast", case_sensitive=True)
+RULES.add("main.ospf.detected", "main", "info", "OSPF detected.",
+          present="router ospf", case_sensitive=True)
+RULES.add("main.ospf.passive", "main", "warnings", "OSPF passive-interface default not configured.",
+          present="router ospf", absent="passive-interface default", case_sensitive=True)
+RULES.add("main.ospf.missing", "main", "warnings", "OSPF not found.",
+          absent="router ospf", case_sensitive=True)
+RULES.add("main.bgp.detected", "main", "info", "BGP detected.",
+          present="router bgp", case_sensitive=True)
+RULES.add("main.bgp.no_neighbors", "main", "issues", "BGP configured but no neighbors found.",
+          present="router bgp", absent="neighbor", case_sensitive=True)
+RULES.add("main.bgp.missing", "main", "warnings", "BGP not found.",
+          absent="router bgp", case_sensitive=True)
+RULES.add("main.acl.none", "main", "warnings", "No ACLs found — verify security posture.",
+          absent="access-list", case_sensitive=True)
+
+
+# ------------------------------------------------------------
+#  Projection helper
+# ------------------------------------------------------------
+def sections(findings: dict, engine: str) -> dict:
+    """Group {rule_id: [findings]} into {section: [findings]} in rule order."""
+    grouped = {}
+    for rule in RULES.rules(engine):
+        grouped.setdefault(rule.section, []).extend(findings.get(rule.rule_id, ()))
+    return grouped
+
+
+def scan(raw: str, engine: str = None, stanza_index: dict = None) -> dict:
+    """Run one compiled scan and return {rule_id: [findings]}."""
+    return RULES.compile(engine).scan(raw or "", stanza_index).evaluate()
+
+
+def scan_incremental(raw: str, engine: str, stanza_index: dict = None, previous=None):
+    """
+    Like scan(), but returns a RuleSnapshot. Pass the previous snapshot
+    of the same device to re-run scoped rules only on changed stanzas.
+    """
+    return evaluate_incremental(RULES.compile(engine), raw or "", stanza_index, previous)
@@ -0,0 +1 @@
+# unmodified copies of the first-release engines, for speedup baselines only — never imported by the app
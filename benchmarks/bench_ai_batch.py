@@ -0,0 +1,179 @@
+# ===============================================================
+#  NetDoc AI — AI BATCH RUNNER CHECKS + BENCHMARK (fake API)
+#  Run:  python -m benchmarks.bench_ai_batch
+# ===============================================================
+
+import asyncio
+import os
+import re
+import time
+from types import SimpleNamespace
+
+# Short backoff so retried requests do not stall the checks
+os.environ.setdefault("NETDOC_AI_BACKOFF", "0.01")
+os.environ.setdefault("NETDOC_AI_BACKOFF_MAX", "0.05")
+
+from utils.ai_batch import RateLimiter, document_device, iter_ai_docs  # noqa: E402
+
+DOCS = '{"summary": "ok", "explanation": "", "best_practices": [], "recommendations": []}'
+_HOSTNAME = re.compile(r"'hostname': '([^']*)'")
+
+
+# ---------------------------------------------------------------
+# Fake AsyncOpenAI: scripted failures per hostname, fixed latency
+# ---------------------------------------------------------------
+class FakeAPIError(Exception):
+    """Shaped like openai.APIStatusError: status_code + response.headers."""
+
+    def __init__(self, status_code: int, retry_after: float = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeClient:
+    """
+    client.chat.completions.create() that pops the next scripted
+    exception for the hostname in the prompt, then answers with DOCS
+    (usage: `tokens` total). `slow` maps hostnames to their own latency.
+    Records every call and every cancellation.
+    """
+
+    def __init__(self, script: dict = None, latency: float = 0.0, tokens: int = 500, slow: dict = None):
+        self.script = {host: list(errors) for host, errors in (script or {}).items()}
+        self.latency = latency
+        self.slow = slow or {}
+        self.tokens = tokens
+        self.calls = []  # (hostname, monotonic time)
+        self.cancelled = 0
+        self.in_flight = self.peak = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        host = _HOSTNAME.search(kwargs["messages"][-1]["content"]).group(1)
+        self.calls.append((host, time.monotonic()))
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.slow.get(host, self.latency))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        if self.script.get(host):
+            raise self.script[host].pop(0)
+        return SimpleNamespace(
+            usage=SimpleNamespace(total_tokens=self.tokens),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=DOCS))],
+        )
+
+    async def close(self):
+        pass
+
+
+def _parsed(host: str) -> dict:
+    return {"hostname": host, "interfaces": [], "vlans": []}
+
+
+def _document(host: str, client, limiter=None, **kwargs) -> dict:
+    limiter = limiter or RateLimiter(rpm=60_000, tpm=10**8)
+    return asyncio.run(document_device(host, _parsed(host), client, limiter, use_cache=False, **kwargs))
+
+
+# ---------------------------------------------------------------
+# Checks (each raises AssertionError on failure)
+# ---------------------------------------------------------------
+def check_retry_after():
+    """A 429 waits out its Retry-After, then the retry succeeds."""
+    client = FakeClient({"R1": [FakeAPIError(429, retry_after=0.2)]})
+    record = _document("R1", client)
+    (_, first), (_, second) = client.calls
+    assert record["error"] is None and record["attempts"] == 2, record
+    assert second - first >= 0.2, second - first
+
+
+def check_not_retryable():
+    """A 400 is reported at once, never retried."""
+    client = FakeClient({"R1": [FakeAPIError(400)]})
+    record = _document("R1", client)
+    assert record["attempts"] == 1 and len(client.calls) == 1, record
+    assert record["error"] == "FakeAPIError: HTTP 400", record
+
+
+def check_retries_exhausted():
+    """A server that keeps failing gives up after `retries` retries."""
+    client = FakeClient({"R1": [FakeAPIError(503)] * 10})
+    record = _document("R1", client, retries=2)
+    assert record["attempts"] == 3 and len(client.calls) == 3, record
+    assert record["error"] == "FakeAPIError: HTTP 503", record
+
+
+def check_token_refund():
+    """Failed attempts give their token estimate back; a success costs its usage."""
+    limiter = RateLimiter(rpm=60_000, tpm=10**6)
+    full = limiter.tokens.level
+    client = FakeClient({"R1": [FakeAPIError(503), FakeAPIError(429, retry_after=0)]}, tokens=500)
+    record = _document("R1", client, limiter)
+    assert record["error"] is None and record["attempts"] == 3, record
+    # Refill during the run only adds; the bucket is capped at `full`
+    assert full - 500 <= limiter.tokens.level <= full, (full, limiter.tokens.level)
+
+
+def check_early_exit():
+    """A consumer that stops after one record cancels the requests in flight."""
+    hosts = ["R0"] + [f"S{i}" for i in range(7)]
+    client = FakeClient(latency=0.05, slow={host: 10.0 for host in hosts[1:]})
+
+    async def first_record():
+        runner = iter_ai_docs(((h, _parsed(h)) for h in hosts), client=client,
+                              concurrency=4, use_cache=False)
+        async for record in runner:
+            break
+        await runner.aclose()
+        await asyncio.sleep(0)  # let the cancellations land
+        # asyncio.run() cancels leftovers on exit anyway: check before that
+        return record, client.cancelled, client.in_flight
+
+    record, cancelled, in_flight = asyncio.run(first_record())
+    assert record["device"] == "R0" and record["error"] is None, record
+    assert len(client.calls) == 4 and cancelled == 3 and in_flight == 0, (len(client.calls), cancelled, in_flight)
+
+
+def check_batch() -> int:
+    check_retry_after()
+    check_not_retryable()
+    check_retries_exhausted()
+    check_token_refund()
+    check_early_exit()
+    return 5
+
+
+# ---------------------------------------------------------------
+# Throughput against a 50 ms fake API, by concurrency
+# ---------------------------------------------------------------
+async def _run_batch(devices: int, concurrency: int, client) -> list:
+    items = ((f"D{i}", _parsed(f"D{i}")) for i in range(devices))
+    limiter = RateLimiter(rpm=10**6, tpm=10**9)
+    return [r async for r in iter_ai_docs(items, client=client, concurrency=concurrency,
+                                          limiter=limiter, use_cache=False)]
+
+
+def run(devices: int = 200, latency: float = 0.05, levels=(1, 8, 32)):
+    print(f"{'concurrency':>11} {'seconds':>8} {'devices/s':>10} {'peak':>5}")
+
+    for concurrency in levels:
+        client = FakeClient(latency=latency)
+        start = time.perf_counter()
+        records = asyncio.run(_run_batch(devices, concurrency, client))
+        elapsed = time.perf_counter() - start
+        assert len(records) == devices and not any(r["error"] for r in records)
+        print(f"{concurrency:>11} {elapsed:>8.2f} {devices / elapsed:>10.1f} {client.peak:>5}")
+
+
+if __name__ == "__main__":
+    print(f"ai batch ok: {check_batch()} checks")
+    run()
@@ -0,0 +1,109 @@
+# ===============================================================
+#  NetDoc AI — AI RESPONSE CACHE CHECKS (stub client, no API key)
+#  Run:  python -m benchmarks.bench_ai_cache
+# ===============================================================
+
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+# A throwaway cache directory, so the checks never see (or leave) real entries
+os.environ.setdefault("NETDOC_CACHE_DIR", tempfile.mkdtemp(prefix="netdoc-bench-"))
+
+from ai_engine import PARSE_ERROR, generate_ai_docs  # noqa: E402
+from utils.ai_cache import ResponseCache, responses  # noqa: E402
+from utils.parse_cache import CACHE_DIR  # noqa: E402
+
+DOCS = '{"summary": "ok", "explanation": "", "best_practices": [], "recommendations": []}'
+
+
+# ---------------------------------------------------------------
+# Stub OpenAI client: fixed answer, counts calls
+# ---------------------------------------------------------------
+class StubClient:
+    def __init__(self, content: str = DOCS):
+        self.content = content
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+
+def _parsed(host: str) -> dict:
+    return {"hostname": host, "interfaces": [], "vlans": []}
+
+
+def _counts() -> tuple:
+    stats = responses.stats()
+    return stats["hits"], stats["misses"]
+
+
+# ---------------------------------------------------------------
+# Checks (each raises AssertionError on failure)
+# ---------------------------------------------------------------
+def check_tiers():
+    """Miss -> API; then a memory hit; after a memory wipe, a disk hit."""
+    client = StubClient()
+    hits, misses = _counts()
+    disk_hits = responses.stats()["tiers"]["disk"]["hits"]
+
+    first = generate_ai_docs(_parsed("TIER1"), client=client)
+    again = generate_ai_docs(_parsed("TIER1"), client=client)
+    responses.clear_memory()
+    from_disk = generate_ai_docs(_parsed("TIER1"), client=client)
+
+    assert first == again == from_disk and first["summary"] == "ok", (first, again, from_disk)
+    assert client.calls == 1, client.calls
+    assert _counts() == (hits + 2, misses + 1), (_counts(), hits, misses)
+    assert responses.stats()["tiers"]["disk"]["hits"] == disk_hits + 1, responses.stats()
+
+
+def check_unparseable_not_cached():
+    """An answer that is not JSON is returned but asked for again next time."""
+    client = StubClient("Sorry, I cannot help with that.")
+
+    for _ in range(2):
+        docs = generate_ai_docs(_parsed("GARBLED1"), client=client)
+        assert docs["summary"] == PARSE_ERROR, docs
+    assert client.calls == 2, client.calls
+
+
+def check_ttl():
+    """An expired entry is a miss, counted as expired and deleted from both tiers."""
+    directory = os.path.join(CACHE_DIR, "ai-ttl")
+    cache = ResponseCache(directory, ttl=0.05)
+    cache.put("k", DOCS)
+    assert cache.get("k") == DOCS
+
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert (cache.hits, cache.misses, cache.expired) == (1, 1, 1), cache.stats()
+
+    # Gone from disk too: a fresh cache over the same directory misses
+    assert ResponseCache(directory, ttl=3600).get("k") is None
+
+
+def check_hit_rate():
+    """hit_rate = hits / (hits + misses) over every lookup."""
+    cache = ResponseCache(None)
+    cache.put("a", DOCS)
+    for key in ("a", "a", "a", "b"):
+        cache.get(key)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (3, 1, 0.75), stats
+
+
+def check_cache() -> int:
+    check_tiers()
+    check_unparseable_not_cached()
+    check_ttl()
+    check_hit_rate()
+    return 4
+
+
+if __name__ == "__main__":
+    print(f"ai cache ok: {check_cache()} checks")
+    print(responses.stats())
@@ -0,0 +1,100 @@
+# ===============================================================
+#  NetDoc AI — DEVICE MODEL ROUND TRIP + MEMORY BENCHMARK
+#  Run:  python -m benchmarks.bench_models
+# ===============================================================
+
+import gc
+import io
+import tracemalloc
+
+from utils.models import Device
+from utils.parser import parse_config, parse_config_stream, parse_device, stanza_index
+
+SAMPLE_PATH = "samples/sample_config.txt"
+
+
+# ---------------------------------------------------------------
+# Synthetic fleet: access switches plus `show` bundles
+# ---------------------------------------------------------------
+def synthetic_device(i: int, ports: int = 24) -> str:
+    lines = [f"hostname SW{i}"]
+    for port in range(ports):
+        lines += [
+            f"interface GigabitEthernet1/0/{port}",
+            f" switchport access vlan {10 + port % 8}",
+            "!",
+        ]
+    lines += [f"vlan {vid}" for vid in range(10, 18)]
+    lines += ["router ospf 1", " neighbor 10.0.0.1", "access-list 10 permit any"]
+    return "\n".join(lines)
+
+
+def synthetic_fleet(devices: int) -> list:
+    """Every fourth device is the sample show bundle, the rest configs."""
+    with open(SAMPLE_PATH, encoding="utf-8") as f:
+        sample = f.read()
+    return [
+        synthetic_device(i) if i % 4 else sample.replace("CORE1", f"CORE{i}")
+        for i in range(devices)
+    ]
+
+
+# ---------------------------------------------------------------
+# parse -> Device -> to_dict() must give back every parser key
+# ---------------------------------------------------------------
+def check_round_trip(texts) -> int:
+    """
+    Raise AssertionError on the first parsed dict that Device does not
+    give back key for key (and in key order). Returns the dicts checked.
+    """
+
+    checked = 0
+    for text in texts:
+        indexed = parse_config(text)
+        stanza_index(indexed)
+
+        for parsed in (
+            parse_config(text),
+            indexed,
+            parse_config_stream(io.StringIO(text)),
+            parse_config_stream(io.StringIO(text), keep_raw=True),
+        ):
+            rebuilt = Device.from_parsed(parsed).to_dict()
+            assert rebuilt == parsed and list(rebuilt) == list(parsed), (
+                f"{parsed.get('hostname')}: "
+                f"{[k for k in parsed if rebuilt.get(k) != parsed[k]] or list(rebuilt)}"
+            )
+            checked += 1
+
+    return checked
+
+
+# ---------------------------------------------------------------
+# Memory held by a parsed fleet: legacy dicts vs Device objects
+# ---------------------------------------------------------------
+def _held_mb(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return held / 2**20
+
+
+def run(sizes=(1_000, 10_000)):
+    print(f"{'devices':>8} {'dicts MB':>9} {'Device MB':>10} {'ratio':>6}")
+
+    for n in sizes:
+        texts = synthetic_fleet(n)
+        dicts = _held_mb(lambda: [parse_config_stream(io.StringIO(t)) for t in texts])
+        devices = _held_mb(lambda: [parse_device(io.StringIO(t)) for t in texts])
+        print(f"{n:>8} {dicts:>9.2f} {devices:>10.2f} {dicts / devices:>5.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"round trip ok: {check_round_trip(synthetic_fleet(8))} parsed dicts")
+    run()
@@ -0,0 +1,104 @@
+# ===============================================================
+#  NetDoc AI — PARSER BENCHMARK
+#  Run:  python -m benchmarks.bench_parser
+# ===============================================================
+
+import io
+import time
+
+from benchmarks.baseline import parser as baseline_parser
+from utils.parser import parse_config, parse_config_stream, stanza_index
+
+SAMPLE_PATH = "samples/sample_config.txt"
+
+
+# ---------------------------------------------------------------
+# Synthetic Cisco config of roughly `target_mb` megabytes
+# ---------------------------------------------------------------
+def synthetic_config(target_mb: float) -> str:
+    header = [
+        "hostname BENCH-CORE1",
+        "!",
+        "aaa new-model",
+        "router ospf 10",
+        " passive-interface default",
+        "router bgp 65001",
+        " neighbor 10.0.0.2 remote-as 65002",
+        "ip access-list extended MGMT",
+        " permit ip 10.0.0.0 0.0.0.255 any",
+    ]
+
+    block = []
+    i = 0
+    size = 0
+    target = int(target_mb * 1024 * 1024)
+
+    while size < target:
+        stanza = (
+            f"interface GigabitEthernet{i // 48}/0/{i % 48}\n"
+            f" description access port {i}\n"
+            f" switchport mode access\n"
+            f" switchport access vlan {10 + i % 200}\n"
+            f" spanning-tree portfast\n"
+            f" spanning-tree bpduguard enable\n"
+            f"!\n"
+        )
+        block.append(stanza)
+        size += len(stanza)
+        i += 1
+
+    return "\n".join(header) + "\n" + "".join(block)
+
+
+# ---------------------------------------------------------------
+# parse_config (whole-text path) must equal the stanza walk
+# ---------------------------------------------------------------
+def check_paths(texts) -> int:
+    """
+    Raise AssertionError when parse_config() and parse_config_stream()
+    (keep_raw=True) disagree on a text, before or after stanza_index()
+    fills in the index. Returns the texts checked.
+    """
+
+    checked = 0
+    for text in texts:
+        fast, walked = parse_config(text), parse_config_stream(io.StringIO(text), keep_raw=True)
+        assert fast == walked and list(fast) == list(walked), fast.get("hostname")
+        assert stanza_index(fast) == stanza_index(walked) and list(fast) == list(walked)
+        checked += 1
+    return checked
+
+
+# ---------------------------------------------------------------
+# Time parse_config against the first-release parser
+# ---------------------------------------------------------------
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes=(1, 2, 4, 8, 16), repeat=3):
+    """`+ index` also builds the stanza index the audits read."""
+    print(f"{'size MB':>8} {'baseline':>9} {'parse':>8} {'+ index':>8} {'speedup':>8} {'s / MB':>8}")
+
+    for mb in sizes:
+        text = synthetic_config(mb)
+
+        baseline = _best(lambda: baseline_parser.parse_config(text), repeat)
+        parse = _best(lambda: parse_config(text), repeat)
+        indexed = _best(lambda: stanza_index(parse_config(text)), repeat)
+
+        print(f"{mb:>8} {baseline:>9.3f} {parse:>8.3f} {indexed:>8.3f} "
+              f"{baseline / parse:>7.2f}x {parse / mb:>8.3f}")
+
+
+if __name__ == "__main__":
+    with open(SAMPLE_PATH, encoding="utf-8") as f:
+        sample = f.read()
+    print(f"paths agree: {check_paths([synthetic_config(1), sample])} configs")
+    run()
@@ -0,0 +1,125 @@
+# ===============================================================
+#  NetDoc AI — INCREMENTAL RE-AUDIT CHECK + BENCHMARK
+#  Run:  python -m benchmarks.bench_reaudit
+# ===============================================================
+
+import random
+import time
+
+import audit_engine
+from benchmarks.bench_parser import synthetic_config
+from utils.parser import parse_config
+
+
+# Lines the random edits draw from: stanza heads, children, and trigger
+# lines that also turn up under unrelated stanzas.
+EDIT_LINES = (
+    "interface GigabitEthernet0/1", "interface GigabitEthernet0/2", "interface Vlan1",
+    " switchport mode access", " switchport mode trunk", " switchport access vlan 1",
+    " spanning-tree portfast", " spanning-tree bpduguard enable", " description tacacs uplink",
+    " access-class 10 in", " password cisco", " transport input ssh",
+    "line con 0", "line vty 0 4", "line vty 5 15",
+    "router ospf 1", "router bgp 65001", " neighbor 10.0.0.2 remote-as 65002",
+    "aaa new-model", "aaa authentication login default group tacacs+",
+    "tacacs-server host 10.0.0.9", "radius-server host 10.0.0.8",
+    "access-list 10 permit any", "ip access-list extended MGMT", " permit ip any any",
+    "spanning-tree portfast default", "spanning-tree mode rapid-pvst",
+    "no cdp run", "cdp run", "username admin password 0 cisco", "enable secret 5 $1$abc",
+    "hostname R1", "banner motd ^C line vty access-list ^C", "snmp-server community public RO",
+)
+
+
+# ---------------------------------------------------------------
+# reaudit() must always equal a full audit of the same snapshot
+# ---------------------------------------------------------------
+def check_deleted_stanza():
+    """Deleting a scoped stanza (here `line vty 0 4`) used to crash reaudit()."""
+    audit_engine.forget_device("Unknown")
+    audit_engine.reaudit(parse_config("line con 0\nline vty 0 4"))
+    new = parse_config("line con 0")
+    assert audit_engine.reaudit(new) == audit_engine.run_security_audit(new)
+    audit_engine.forget_device("Unknown")
+
+
+def check_trigger_elsewhere():
+    """A trigger under an unrelated stanza still counts for whole-config rules."""
+    audit_engine.forget_device("R1")
+    audit_engine.reaudit(parse_config("hostname R1\nrouter ospf 1"))
+    new = parse_config("hostname R1\nrouter ospf 1\n switchport access vlan 1")
+    assert audit_engine.reaudit(new) == audit_engine.run_security_audit(new)
+
+
+def _full(parsed) -> dict:
+    return audit_engine.build_audit(parsed, audit_engine.audit_findings(parsed))
+
+
+def check_reaudit(configs: int = 200, edits: int = 8, seed: int = 11) -> int:
+    """
+    Feed random edit sequences of one device through reaudit() and
+    raise AssertionError when a result differs from a full audit.
+    Returns the snapshots checked.
+    """
+
+    check_deleted_stanza()
+    check_trigger_elsewhere()
+    rng = random.Random(seed)
+    checked = 0
+
+    for _ in range(configs):
+        audit_engine.forget_device("R1")
+        lines = ["hostname R1"] + [rng.choice(EDIT_LINES) for _ in range(rng.randint(0, 25))]
+
+        for _ in range(edits):
+            parsed = parse_config("\n".join(lines))
+            incremental, full = audit_engine.reaudit(parsed), _full(parsed)
+            assert incremental == full, (lines, {
+                k: (incremental[k], full[k]) for k in full if incremental.get(k) != full[k]
+            })
+            checked += 1
+
+            at = rng.randint(1, len(lines))
+            action = rng.random()
+            if action < 0.4 or len(lines) == 1:
+                lines.insert(at, rng.choice(EDIT_LINES))
+            elif action < 0.7:
+                del lines[min(at, len(lines) - 1)]
+            else:
+                lines[min(at, len(lines) - 1)] = rng.choice(EDIT_LINES)
+
+    audit_engine.forget_device("R1")
+    return checked
+
+
+# ---------------------------------------------------------------
+# One edited interface: reaudit() vs a full audit
+# ---------------------------------------------------------------
+def run(sizes=(1, 4), repeat=5):
+    print(f"{'size MB':>8} {'full s':>8} {'reaudit s':>10} {'speedup':>8}")
+
+    for mb in sizes:
+        text = synthetic_config(mb)
+        edited = text.replace(" description access port 7\n", " description access port 7b\n", 1)
+        parsed, parsed_edit = parse_config(text), parse_config(edited)
+        audit_engine.run_security_audit(parsed_edit)  # index both outside the timing
+        audit_engine.run_security_audit(parsed)
+
+        full = incremental = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            audit_engine.run_security_audit(parsed_edit)
+            elapsed = time.perf_counter() - start
+            full = elapsed if full is None else min(full, elapsed)
+
+            audit_engine.forget_device("BENCH-CORE1")
+            audit_engine.reaudit(parsed)
+            start = time.perf_counter()
+            audit_engine.reaudit(parsed_edit)
+            elapsed = time.perf_counter() - start
+            incremental = elapsed if incremental is None else min(incremental, elapsed)
+
+        print(f"{mb:>8} {full:>8.3f} {incremental:>10.3f} {full / incremental:>7.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"reaudit ok: {check_reaudit()} snapshots")
+    run()
@@ -0,0 +1,82 @@
+# ===============================================================
+#  NetDoc AI — AUDIT RULE COST REPORT
+#  Run:  python -m benchmarks.bench_rules
+# ===============================================================
+
+import time
+
+import audit_engine
+import main
+import security_engine
+from audit_pipeline import AuditPipeline
+from benchmarks.baseline import audit_engine as baseline_audit
+from benchmarks.baseline import main as baseline_main
+from benchmarks.baseline import security_engine as baseline_security
+from benchmarks.bench_parser import synthetic_config
+from rule_engine import timed_rules
+from utils.parser import interface_table, parse_config
+
+
+# ---------------------------------------------------------------
+# Run all three audit engines with per-rule timing on
+# ---------------------------------------------------------------
+def run(sizes=(0.5, 1, 2), repeat=5, top=20, pipeline=False):
+    """pipeline=True audits through AuditPipeline (one scan for all engines)."""
+    with timed_rules() as timings:
+        timings.clear()
+
+        for mb in sizes:
+            text = synthetic_config(mb)
+            parsed = parse_config(text)
+
+            for _ in range(repeat):
+                if pipeline:
+                    AuditPipeline(parsed).reports()
+                    continue
+                audit_engine.run_security_audit(parsed)
+                security_engine.run_security_audit(parsed)
+                main.run_security_audit(text)
+
+        print(timings.report(top))
+
+
+# ---------------------------------------------------------------
+# AuditPipeline vs the three first-release engines it replaces
+# ---------------------------------------------------------------
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compare(sizes=(0.5, 1, 2, 4), repeat=5):
+    print(f"{'size MB':>8} {'baseline':>9} {'engines':>9} {'pipeline':>9} {'speedup':>8}")
+
+    for mb in sizes:
+        text = synthetic_config(mb)
+        parsed = parse_config(text)
+        # The baseline engines expect interfaces as a {name: {...}} table
+        legacy = dict(parsed, interfaces=interface_table(parsed))
+
+        baseline = _best(lambda: (
+            baseline_main.run_security_audit(legacy["raw"]),
+            baseline_audit.run_security_audit(legacy),
+            baseline_security.run_security_audit(legacy),
+        ), repeat)
+        engines = _best(lambda: (
+            main.run_security_audit(parsed["raw"]),
+            audit_engine.run_security_audit(parsed),
+            security_engine.run_security_audit(parsed),
+        ), repeat)
+        pipeline = _best(lambda: AuditPipeline(parsed).reports(), repeat)
+
+        print(f"{mb:>8} {baseline:>9.4f} {engines:>9.4f} {pipeline:>9.4f} {baseline / pipeline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
+    compare()
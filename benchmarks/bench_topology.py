@@ -0,0 +1,97 @@
+# ===============================================================
+#  NetDoc AI — TOPOLOGY BENCHMARK
+#  Run:  python -m benchmarks.bench_topology
+# ===============================================================
+
+import random
+import time
+
+from utils.link_inference import SubnetIndex, infer_links
+from utils.topology_analysis import components, cut_points, loop_candidates, shortest_path
+from utils.topology_graph import TopologyGraph
+
+
+# ---------------------------------------------------------------
+# Synthetic fleet: per-site access rings hung off a core mesh
+# ---------------------------------------------------------------
+def synthetic_fleet(devices: int, sites: int = 50, uplinks: int = 2, seed: int = 7) -> TopologyGraph:
+    rng = random.Random(seed)
+    graph = TopologyGraph()
+
+    for i in range(devices):
+        site = i % sites
+        name = f"site{site}-sw{i}"
+        links = [
+            (f"Gi1/0/{k}", f"site{site}-sw{rng.randrange(site, devices, sites)}", f"Gi1/1/{k}")
+            for k in range(uplinks)
+        ]
+        if i >= sites:
+            links.append(("Te1/1/1", f"site{site}-sw{i - sites}", "Te1/1/2"))
+        elif i:
+            links.append(("Te0/0/1", f"site{i - 1}-sw{i - 1}", "Te0/0/2"))
+        graph.update_device(name, links)
+
+    return graph
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+# ---------------------------------------------------------------
+# Build + each analysis across growing fleets
+# ---------------------------------------------------------------
+def run(sizes=(1_000, 10_000, 50_000), repeat=3):
+    print(f"{'devices':>8} {'links':>8} {'build':>7} {'csr':>7} {'path':>7} {'cuts':>7} {'loops':>7} {'comps':>7}")
+
+    for n in sizes:
+        start = time.perf_counter()
+        graph = synthetic_fleet(n)
+        build = time.perf_counter() - start
+
+        source, target = graph.names[0], graph.names[-1]
+        steps = {
+            "csr": lambda: (setattr(graph, "_csr", None), graph.csr()),
+            "path": lambda: shortest_path(graph, source, target),
+            "cuts": lambda: cut_points(graph),
+            "loops": lambda: loop_candidates(graph),
+            "comps": lambda: components(graph),
+        }
+        best = {name: min(_timed(fn) for _ in range(repeat)) for name, fn in steps.items()}
+
+        print(
+            f"{n:>8} {graph.edge_count():>8} {build:>7.3f} "
+            + " ".join(f"{best[name]:>7.3f}" for name in steps)
+        )
+
+
+# ---------------------------------------------------------------
+# Subnet link inference: random /30 point-to-point addressing
+# ---------------------------------------------------------------
+def synthetic_addresses(devices: int, per_device: int = 4, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(devices):
+        for k in range(per_device):
+            block = rng.randrange(devices * per_device // 2)
+            host = block * 4 + 1 + rng.randrange(2)
+            entries.append((f"sw{i}", f"GigabitEthernet0/{k}", f"10.{host >> 16 & 255}.{host >> 8 & 255}.{host & 255}/30"))
+    return entries
+
+
+def run_inference(sizes=(1_000, 10_000, 50_000)):
+    print(f"{'devices':>8} {'ifaces':>8} {'links':>8} {'infer s':>8}")
+
+    for n in sizes:
+        entries = synthetic_addresses(n)
+        start = time.perf_counter()
+        links = infer_links(SubnetIndex(entries))
+        elapsed = time.perf_counter() - start
+        print(f"{n:>8} {len(entries):>8} {len(links):>8} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    run()
+    run_inference()
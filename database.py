@@ -6,7 +6,7 @@ import os
 import datetime
 from sqlalchemy import (
     create_engine, Column, Integer, String, DateTime,
-    ForeignKey, Text
+    ForeignKey, Text, inspect, text
 )
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 
@@ -108,10 +108,43 @@ class AuditReport(Base):
     audit_json = Column(Text)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # Audit result cache key (utils/audit_cache.py)
+    config_hash = Column(String, index=True, nullable=True)
+    ruleset_version = Column(String, index=True, nullable=True)
+
     user = relationship("User", back_populates="audits")
     organization = relationship("Organization", back_populates="audits")
 
 
+# ===============================================================
+#  MIGRATIONS (idempotent, run on every startup)
+# ===============================================================
+# Columns added after a table was first created: create_all() never
+# alters an existing table, so older databases get them here.
+ADDED_COLUMNS = {
+    "audit_reports": ("config_hash", "ruleset_version"),
+}
+
+
+def migrate():
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table_name, columns in ADDED_COLUMNS.items():
+            table = Base.metadata.tables[table_name]
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+
+            for name in columns:
+                column = table.c[name]
+                if name not in existing:
+                    ddl = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl}"))
+                if column.index:
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name} ON {table_name} ({name})"
+                    ))
+
+
 # ===============================================================
 #  INIT DB
 # ===============================================================
@@ -119,6 +152,7 @@ def init_db():
     print("📌 Initializing database…")
 
     Base.metadata.create_all(bind=engine)
+    migrate()
     db = SessionLocal()
 
     # Create default org if none exists
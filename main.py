@@ -5,6 +5,8 @@
 import json
 import re
 
+from audit_rules import scan, sections
+
 
 # =====================================================================
 #  SECURITY AUDIT ENGINE
@@ -14,60 +16,23 @@ def run_security_audit(config_text: str) -> dict:
     Analyze network configuration text and generate a structured audit report.
     """
 
-    issues = []
-    warnings = []
-    info = []
-
-    # -------------------------------------------------------------
-    # PASSWORD SECURITY CHECK
-    # -------------------------------------------------------------
-    if "username" in config_text and "password" in config_text:
-        if "password 0" in config_text or "password " in config_text:
-            issues.append("⚠️ Plain-text password detected. Use secret 5 or 9 hashing.")
+    return build_report(scan(config_text, "main"))
 
-    # -------------------------------------------------------------
-    # VLAN CHECKS
-    # -------------------------------------------------------------
-    vlan_matches = re.findall(r"vlan (\d+)", config_text)
-    if not vlan_matches:
-        warnings.append("No VLANs detected in configuration.")
-    else:
-        info.append(f"Detected VLANs: {', '.join(vlan_matches)}")
 
-    # -------------------------------------------------------------
-    # STP CHECKS
-    # -------------------------------------------------------------
-    if "spanning-tree" not in config_text:
-        warnings.append("STP not found — risky for L2 loops.")
-    else:
-        if "spanning-tree portfast" not in config_text:
-            warnings.append("PortFast missing on access ports.")
-
-    # -------------------------------------------------------------
-    # OSPF CHECKS
-    # -------------------------------------------------------------
-    if "router ospf" in config_text:
-        info.append("OSPF detected.")
-        if "passive-interface default" not in config_text:
-            warnings.append("OSPF passive-interface default not configured.")
-    else:
-        warnings.append("OSPF not found.")
+def build_report(findings: dict) -> dict:
+    """
+    Project {rule_id: [findings]} onto the issues / warnings / info report.
+    """
 
     # -------------------------------------------------------------
-    # BGP CHECKS
+    # PASSWORD / VLAN / STP / OSPF / BGP / ACL CHECKS
+    # Declared in audit_rules.py ("main.*"), evaluated in one scan
     # -------------------------------------------------------------
-    if "router bgp" in config_text:
-        info.append("BGP detected.")
-        if "neighbor" not in config_text:
-            issues.append("BGP configured but no neighbors found.")
-    else:
-        warnings.append("BGP not found.")
+    found = sections(findings, "main")
 
-    # -------------------------------------------------------------
-    # ACCESS-LIST CHECKS
-    # -------------------------------------------------------------
-    if "access-list" not in config_text:
-        warnings.append("No ACLs found — verify security posture.")
+    issues = found["issues"]
+    warnings = found["warnings"]
+    info = found["info"]
 
     # -------------------------------------------------------------
     # FINAL STRUCTURED REPORT
@@ -1,7 +1,7 @@
 import streamlit as st
 from auth import login_required
 from database import SessionLocal, UploadedConfig
-from utils.parser import parse_config
+from utils.parse_cache import parse_config_cached
 import json
 from datetime import datetime
 
@@ -30,7 +30,7 @@ def upload_page():
         for f in uploaded_files:
             raw_text = f.read().decode(errors="ignore")
 
-            parsed = parse_config(raw_text)
+            parsed = parse_config_cached(raw_text)
             parsed_json = json.dumps(parsed)
 
             record = UploadedConfig(
@@ -0,0 +1,1243 @@
+# ============================================================
+#  RULE ENGINE — declarative audit rules, one-pass matcher
+#
+#  Rules state literal / regex triggers. Whole-config triggers are
+#  looked up lazily with plain substring finds; regex triggers only
+#  run on the lines where their anchor literal occurs. Stanza
+#  triggers are located once per config and bucketed into stanzas,
+#  so each rule is evaluated once per distinct set of hits rather
+#  than once per stanza.
+# ============================================================
+
+import hashlib
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain
+
+import numpy as np
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+
+# ------------------------------------------------------------
+#  OPTIONAL PER-RULE TIMING
+# ------------------------------------------------------------
+class _Sample:
+    __slots__ = ("matches",)
+
+    def __init__(self):
+        self.matches = 0
+
+
+class RuleTimings:
+    """
+    Wall time, match count and input size per rule/check, kept for the
+    last `max_samples` runs of each. Off unless NETDOC_RULE_TIMING is
+    set or code runs inside timed_rules(); when off, recording costs a
+    single attribute check.
+
+    The shared literal pass of a compiled scan is recorded as
+    "<engine>.scan"; a rule's time covers confirming its own regex
+    triggers plus evaluating it.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self.enabled = bool(os.getenv("NETDOC_RULE_TIMING"))
+        self.max_samples = max_samples
+        self._samples = {}
+
+    def record(self, check_id: str, seconds: float, matches: int = 0, size: int = 0):
+        samples = self._samples.get(check_id)
+        if samples is None:
+            samples = self._samples[check_id] = deque(maxlen=self.max_samples)
+        samples.append((seconds, matches, size))
+
+    @contextmanager
+    def timed(self, check_id: str, size: int = 0):
+        """Time a hand-written check; set `.matches` on the yielded sample."""
+        sample = _Sample()
+        if not self.enabled:
+            yield sample
+            return
+
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            self.record(check_id, time.perf_counter() - start, sample.matches, size)
+
+    def stats(self) -> dict:
+        """{check_id: {runs, p50/p95/p99/max/total seconds, mean matches, mean bytes}}."""
+        stats = {}
+        for check_id, samples in self._samples.items():
+            seconds = sorted(s for s, _, _ in samples)
+            runs = len(seconds)
+
+            def pct(q):
+                return seconds[min(runs - 1, int(q * runs))]
+
+            stats[check_id] = {
+                "runs": runs,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": seconds[-1],
+                "total": sum(seconds),
+                "matches": sum(m for _, m, _ in samples) / runs,
+                "bytes": sum(b for _, _, b in samples) / runs,
+            }
+        return stats
+
+    def slowest(self, n: int = 10, by: str = "p95") -> list:
+        """[(check_id, stats)] sorted by the given statistic, slowest first."""
+        ranked = sorted(self.stats().items(), key=lambda item: item[1][by], reverse=True)
+        return ranked[:n]
+
+    def report(self, n: int = 20, by: str = "p95") -> str:
+        lines = [f"{'rule':<36} {'runs':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'matches':>8} {'KB':>8}"]
+        for check_id, st in self.slowest(n, by):
+            lines.append(
+                f"{check_id:<36} {st['runs']:>6} {st['p50'] * 1e3:>8.3f} {st['p95'] * 1e3:>8.3f}"
+                f" {st['p99'] * 1e3:>8.3f} {st['matches']:>8.1f} {st['bytes'] / 1024:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def clear(self):
+        self._samples.clear()
+
+
+TIMINGS = RuleTimings()
+
+
+@contextmanager
+def timed_rules():
+    """Enable TIMINGS for the duration of the block."""
+    previous = TIMINGS.enabled
+    TIMINGS.enabled = True
+    try:
+        yield TIMINGS
+    finally:
+        TIMINGS.enabled = previous
+
+
+# ------------------------------------------------------------
+#  REGEX SAFETY (uploaded configs are untrusted)
+# ------------------------------------------------------------
+RULE_BUDGET_MS = float(os.getenv("NETDOC_RULE_BUDGET_MS", "2000"))
+MAX_REGEX_LINE = 1024  # longer lines are not run through regex triggers (rule is skipped)
+MAX_OVERLAPPING_REPEATS = 2  # longest allowed run of unbounded repeats over shared chars
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_WILDCARD = None  # first-char set that may start with anything
+
+
+class UnsafePatternError(ValueError):
+    """A rule regex that can backtrack catastrophically."""
+
+
+def _first_chars(items):
+    """Characters a sequence can start with (None = anything)."""
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            return {chr(av).lower()}
+        if op == sre_constants.SUBPATTERN:
+            return _first_chars(av[-1])
+        if op in _REPEATS and av[0] > 0:
+            return _first_chars(av[2])
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+        return _WILDCARD
+    return set()
+
+
+def _branches_overlap(branches) -> bool:
+    seen = set()
+    for branch in branches:
+        if not branch:
+            return True  # (a|aa)* is factored into a(?:|a)*
+        first = _first_chars(branch)
+        if first is _WILDCARD or first & seen:
+            return True
+        seen |= first
+    return False
+
+
+# Character buckets, to tell whether two repeats can match the same text
+_ALL = frozenset(("space", "digit", "word", "other"))
+_CATEGORY_BUCKETS = {
+    "CATEGORY_SPACE": {"space"},
+    "CATEGORY_NOT_SPACE": {"digit", "word", "other"},
+    "CATEGORY_DIGIT": {"digit"},
+    "CATEGORY_NOT_DIGIT": {"space", "word", "other"},
+    "CATEGORY_WORD": {"digit", "word"},
+    "CATEGORY_NOT_WORD": {"space", "other"},
+}
+
+
+def _char_bucket(code: int) -> set:
+    ch = chr(code)
+    if ch.isspace():
+        return {"space"}
+    if ch.isdigit():
+        return {"digit"}
+    if ch.isalnum() or ch == "_":
+        return {"word"}
+    return {"other"}
+
+
+def _char_class(op, av) -> frozenset:
+    """Buckets a single-character item can match (_ALL when unsure)."""
+    if op == sre_constants.LITERAL:
+        return frozenset(_char_bucket(av))
+    if op == sre_constants.IN:
+        buckets = set()
+        for item_op, item_av in av:
+            if item_op == sre_constants.NEGATE:
+                return _ALL
+            if item_op == sre_constants.LITERAL:
+                buckets |= _char_bucket(item_av)
+            elif item_op == sre_constants.CATEGORY:
+                buckets |= _CATEGORY_BUCKETS.get(str(item_av), _ALL)
+            else:
+                return _ALL
+        return frozenset(buckets)
+    return _ALL
+
+
+def _check_sequence(items, pattern: str):
+    """
+    Reject more than MAX_OVERLAPPING_REPEATS unbounded repeats in a row
+    that can all match the same characters (`a.*a.*a.*b` backtracks
+    polynomially: every split of the line is tried).
+    """
+
+    run, common = 0, _ALL
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            _check_sequence(av[-1], pattern)
+            run, common = 0, _ALL
+            continue
+
+        if op in _REPEATS:
+            low, high, body = av
+            if high != sre_constants.MAXREPEAT:
+                if low == 0:
+                    continue  # optional item: may match nothing, keeps the run
+                chars = _char_class(*body[0]) if len(body) == 1 else _ALL
+                common &= chars
+                if not common:
+                    run, common = 0, _ALL
+                continue
+
+            chars = _char_class(*body[0]) if len(body) == 1 else _ALL
+            if run and common & chars:
+                run, common = run + 1, common & chars
+            elif run and low == 0:
+                continue  # `\s*` between two `\S+` can match nothing
+            else:
+                run, common = 1, chars
+            if run > MAX_OVERLAPPING_REPEATS:
+                raise UnsafePatternError(
+                    f"{pattern!r}: {run} unbounded repeats in a row can match the same text"
+                )
+            continue
+
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+
+        common &= _char_class(op, av)
+        if not common:
+            run, common = 0, _ALL
+
+
+def _check_items(items, pattern: str, outer):
+    """`outer` is None, or whether the enclosing repeat is unbounded."""
+    in_repeat = outer is not None
+    for op, av in items:
+        if op in _REPEATS:
+            _, high, body = av
+            unbounded = high == sre_constants.MAXREPEAT
+            if high > 1 and in_repeat and (unbounded or outer):
+                raise UnsafePatternError(
+                    f"{pattern!r}: nested quantifier with an unbounded repeat (use a "
+                    f"possessive quantifier or an atomic group)"
+                )
+            _check_items(body, pattern, (unbounded or bool(outer)) if high > 1 else outer)
+        elif op == getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+            _check_items(av[2], pattern, None)
+        elif op == getattr(sre_constants, "ATOMIC_GROUP", None):
+            _check_items(av, pattern, None)
+        elif op == sre_constants.SUBPATTERN:
+            _check_items(av[-1], pattern, outer)
+        elif op == sre_constants.BRANCH:
+            if in_repeat and _branches_overlap(av[1]):
+                raise UnsafePatternError(f"{pattern!r}: overlapping alternatives inside a repeat")
+            for branch in av[1]:
+                _check_items(branch, pattern, outer)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _check_items(av[1], pattern, outer)
+        elif op == sre_constants.GROUPREF_EXISTS:
+            for branch in av[1:]:
+                if branch is not None:
+                    _check_items(branch, pattern, outer)
+
+
+def check_pattern(pattern: str):
+    """
+    Reject patterns prone to catastrophic backtracking: a quantifier
+    nested in another one when either is unbounded (`(a+)+`,
+    `(\\s*\\w+)*`, `(.*a){20}`), or alternatives that can start with
+    the same character inside a repeat (`(a|ab)*`), or long runs of
+    repeats over the same characters (`a.*a.*a.*b`). Possessive
+    quantifiers and atomic groups are accepted. Raises
+    UnsafePatternError.
+    """
+    parsed = sre_parse.parse(pattern)
+    _check_items(parsed, pattern, None)
+    _check_sequence(parsed, pattern)
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+SKIPPED = None  # stanza_findings() key holding the flag of a skipped rule
+
+
+def skipped_finding(rule_id: str, reason: str) -> str:
+    return f"⚠️ Rule {rule_id} skipped: {reason}"
+
+
+def is_skipped(rule_id: str, findings: list) -> bool:
+    """True when a rule's findings are only its skipped flag (not a failure)."""
+    return len(findings) == 1 and findings[0].startswith(skipped_finding(rule_id, ""))
+
+
+# ------------------------------------------------------------
+#  TRIGGERS
+# ------------------------------------------------------------
+class Exact:
+    """Literal trigger matched case-sensitively (plain strings ignore case)."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __eq__(self, other):
+        return isinstance(other, Exact) and self.text == other.text
+
+    def __hash__(self):
+        return hash((Exact, self.text))
+
+    def __repr__(self):
+        return f"Exact({self.text!r})"
+
+
+def _spells_upper(items) -> bool:
+    """True if a parsed pattern has an upper-case letter to match."""
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL):
+            if chr(av) != chr(av).lower():
+                return True
+        elif op == sre_constants.RANGE:
+            low, high = av
+            if high > 0x7F or (low <= ord("Z") and high >= ord("A")):
+                return True
+        elif op == sre_constants.IN:
+            if _spells_upper(av):
+                return True
+        else:
+            # Groups, repeats, branches, lookarounds: recurse into their bodies
+            for sub in av if isinstance(av, (tuple, list)) else (av,):
+                for body in sub if isinstance(sub, list) else (sub,):
+                    if isinstance(body, sre_parse.SubPattern) and _spells_upper(body):
+                        return True
+    return False
+
+
+class Regex:
+    """
+    Regex trigger. `anchor` is a literal that every match must contain;
+    the pattern is only run when the anchor occurs. Case-insensitive
+    patterns without upper-case letters run case-sensitively over the
+    lowercased config (re.IGNORECASE is ~20x slower).
+    """
+
+    __slots__ = ("pattern", "anchor", "case_sensitive", "on_lower", "line_start", "regex", "_hash")
+
+    def __init__(self, pattern: str, anchor: str, case_sensitive: bool = False):
+        self.pattern = pattern
+        self.case_sensitive = case_sensitive
+        self.anchor = Exact(anchor) if case_sensitive else anchor.lower()
+
+        parsed = sre_parse.parse(pattern)
+        self.on_lower = not case_sensitive and not _spells_upper(parsed)
+        # `^...` can only match at the start of a line: match() there instead of search()
+        self.line_start = bool(parsed) and parsed[0] == (
+            sre_constants.AT, sre_constants.AT_BEGINNING
+        )
+
+        flags = re.MULTILINE
+        if not case_sensitive and not self.on_lower:
+            flags |= re.IGNORECASE
+        self.regex = re.compile(pattern, flags)
+        self._hash = hash((self.pattern, self.anchor))
+
+    def __eq__(self, other):
+        return isinstance(other, Regex) and (self.pattern, self.anchor) == (other.pattern, other.anchor)
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        if self.case_sensitive:
+            return f"Regex({self.pattern!r}, anchor={self.anchor.text!r}, case_sensitive=True)"
+        return f"Regex({self.pattern!r}, anchor={self.anchor!r})"
+
+
+def _trigger(value, case_sensitive: bool = False):
+    if isinstance(value, (Regex, Exact)):
+        return value
+    return Exact(value) if case_sensitive else value.lower()
+
+
+def _triggers(values, case_sensitive: bool = False) -> tuple:
+    if values is None:
+        return ()
+    if isinstance(values, (str, Regex, Exact)):
+        values = (values,)
+    return tuple(_trigger(v, case_sensitive) for v in values)
+
+
+# ------------------------------------------------------------
+#  RULE
+# ------------------------------------------------------------
+SEVERITY_WEIGHTS = {"info": 0, "low": 1, "medium": 3, "high": 7, "critical": 10}
+
+
+class Rule:
+    """
+    A rule fires when every `present` trigger is found, at least one
+    `any_of` trigger is found (if given) and no `absent` trigger is
+    found. `unless` triggers are checked against the whole config and
+    suppress the rule entirely (e.g. a global default that covers it).
+
+    scope        stanza kind from parsed["stanza_index"] ("interface",
+                 "line", ...): the rule is evaluated per stanza and
+                 `{name}` in the message is the stanza name.
+    scope_name   only stanzas whose name starts with this (e.g. "vty");
+                 it is stripped from `{name}`.
+    fallback_for only run when the index has no stanzas of this kind
+                 (whole-text version of a scoped rule).
+    collect      regex whose matches become the findings; with
+                 `{matches}` in the message they are joined into one.
+    match_filter keep collected matches containing one of these words.
+    severity     key of SEVERITY_WEIGHTS, used for fleet risk scoring.
+    budget_ms    wall-time budget for confirming the rule's regexes and
+                 evaluating it (default RULE_BUDGET_MS). A rule over
+                 budget is skipped and flagged instead of stalling.
+    case_sensitive  plain string triggers match exactly (as Exact);
+                 Regex triggers carry their own flag.
+    """
+
+    __slots__ = (
+        "rule_id", "engine", "section", "message",
+        "present", "absent", "any_of", "unless",
+        "collect", "match_filter", "scope", "scope_name", "fallback_for",
+        "severity", "budget_ms", "case_sensitive",
+    )
+
+    def __init__(self, rule_id, engine, section, message=None, present=(), absent=(),
+                 any_of=(), unless=(), collect=None, match_filter=(), scope=None,
+                 scope_name=None, fallback_for=None, severity="medium",
+                 budget_ms=None, case_sensitive=False):
+        if severity not in SEVERITY_WEIGHTS:
+            raise ValueError(f"{rule_id}: unknown severity {severity!r}")
+
+        self.rule_id = rule_id
+        self.engine = engine
+        self.section = section
+        self.message = message
+        self.case_sensitive = case_sensitive
+        self.present = _triggers(present, case_sensitive)
+        self.absent = _triggers(absent, case_sensitive)
+        self.any_of = _triggers(any_of, case_sensitive)
+        self.unless = _triggers(unless, case_sensitive)
+        self.collect = collect
+        self.match_filter = tuple(w.lower() for w in match_filter)
+        self.scope = scope
+        self.scope_name = scope_name
+        self.fallback_for = fallback_for
+        self.severity = severity
+        self.budget_ms = budget_ms
+
+    def triggers(self):
+        yield from self.present
+        yield from self.absent
+        yield from self.any_of
+        yield from self.unless
+        if self.collect is not None:
+            yield self.collect
+
+    @property
+    def weight(self) -> int:
+        return SEVERITY_WEIGHTS[self.severity]
+
+    @property
+    def budget(self) -> float:
+        """Budget in seconds."""
+        return (self.budget_ms if self.budget_ms is not None else RULE_BUDGET_MS) / 1000
+
+    def fingerprint(self) -> str:
+        return repr(tuple(
+            getattr(self, slot) if not isinstance(getattr(self, slot), tuple)
+            else tuple(map(repr, getattr(self, slot)))
+            for slot in self.__slots__
+        ))
+
+    def __repr__(self):
+        return f"Rule({self.rule_id!r})"
+
+
+# ------------------------------------------------------------
+#  REGISTRY
+# ------------------------------------------------------------
+class RuleRegistry:
+    def __init__(self):
+        self._rules = {}
+        self._compiled = {}
+
+    def register(self, rule: Rule) -> Rule:
+        if rule.rule_id in self._rules:
+            raise ValueError(f"Duplicate rule id: {rule.rule_id}")
+        if rule.collect is not None and not isinstance(rule.collect, Regex):
+            raise ValueError(f"{rule.rule_id}: collect must be a Regex trigger")
+        for trigger in rule.triggers():
+            if isinstance(trigger, Regex):
+                try:
+                    check_pattern(trigger.pattern)
+                except UnsafePatternError as e:
+                    raise UnsafePatternError(f"{rule.rule_id}: {e}") from None
+
+        self._rules[rule.rule_id] = rule
+        self._compiled.clear()
+        return rule
+
+    def add(self, rule_id, engine, section, message=None, **kwargs) -> Rule:
+        return self.register(Rule(rule_id, engine, section, message, **kwargs))
+
+    def rules(self, engine: str = None) -> list:
+        return [r for r in self._rules.values() if engine is None or r.engine == engine]
+
+    def __getitem__(self, rule_id):
+        return self._rules[rule_id]
+
+    def __len__(self):
+        return len(self._rules)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever any rule definition changes (cache key material)."""
+        digest = hashlib.sha256()
+        for rule in self._rules.values():
+            digest.update(rule.fingerprint().encode())
+        return digest.hexdigest()[:16]
+
+    def compile(self, engine: str = None) -> "CompiledRules":
+        compiled = self._compiled.get(engine)
+        if compiled is None:
+            compiled = self._compiled[engine] = CompiledRules(self.rules(engine))
+        return compiled
+
+
+# ------------------------------------------------------------
+#  MATCHER
+# ------------------------------------------------------------
+REGEX_CHUNK = 64 * 1024  # regex triggers check their deadline every this many characters
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _pairs(flat: list) -> list:
+    return [(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+
+
+def _text(trigger) -> str:
+    return trigger.text if isinstance(trigger, Exact) else trigger
+
+
+def _chunks(text: str, start: int, end: int):
+    """Split [start, end) at line breaks into pieces of about REGEX_CHUNK."""
+    while end - start > REGEX_CHUNK:
+        cut = text.rfind("\n", start, start + REGEX_CHUNK) + 1
+        if cut <= start:
+            cut = start + REGEX_CHUNK
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+class CompiledRules:
+    """
+    Matching plan for a set of rules. Whole-config triggers are looked
+    up when a rule first needs them (a substring search stops at the
+    first hit, regexes only run when their anchor occurs). Triggers of
+    stanza-scoped rules are each located once over the config and
+    bucketed into stanzas; a rule is then evaluated once per distinct
+    set of hits, not once per stanza.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = list(rules)
+
+        # Per stanza kind, the triggers its scoped rules test per stanza
+        self.stanza_triggers = {}
+        for rule in self.rules:
+            if rule.scope is not None:
+                triggers = self.stanza_triggers.setdefault(rule.scope, [])
+                for trigger in (*rule.present, *rule.absent, *rule.any_of):
+                    if trigger not in triggers and _text(trigger) != "":
+                        triggers.append(trigger)
+
+        # A regex shared by several rules may use the largest of their budgets
+        self.trigger_budget = {}
+        for rule in self.rules:
+            for trigger in rule.triggers():
+                if isinstance(trigger, Regex):
+                    self.trigger_budget[trigger] = max(self.trigger_budget.get(trigger, 0), rule.budget)
+        # Only collect triggers need every match; the rest stop at the first
+        self.collecting = {rule.collect for rule in self.rules if rule.collect is not None}
+
+        self.version = hashlib.sha256(
+            "".join(rule.fingerprint() for rule in self.rules).encode()
+        ).hexdigest()[:16]
+        self._subsets = {}
+
+        engines = {rule.engine for rule in self.rules}
+        self.engine = engines.pop() if len(engines) == 1 else "*"
+
+    def subset(self, rules: list) -> "CompiledRules":
+        """Compiled matcher for just these rules (memoized by rule ids)."""
+        key = frozenset(rule.rule_id for rule in rules)
+        compiled = self._subsets.get(key)
+        if compiled is None:
+            compiled = self._subsets[key] = CompiledRules(rules)
+        return compiled
+
+    def scan(self, raw: str, stanza_index: dict = None, ranges: list = None) -> "Scan":
+        """
+        Match the config. `ranges` (sorted, non-overlapping [start, end)
+        offsets) limits matching to those slices; offsets stay relative
+        to raw so the stanza index still lines up. Stanza hits are
+        computed here, whole-config triggers when a rule first asks.
+        """
+
+        timing = TIMINGS.enabled
+        if timing:
+            started = time.perf_counter()
+
+        scan = Scan(self, raw, stanza_index or {}, ranges)
+        hits = sum(len(found) for kind in self.stanza_triggers for found in scan.stanza_hits(kind).values())
+
+        if timing:
+            size = sum(end - start for start, end in scan.spans)
+            TIMINGS.record(f"{self.engine}.scan", time.perf_counter() - started, hits, size)
+        return scan
+
+
+# ------------------------------------------------------------
+#  SCAN RESULT + RULE EVALUATION
+# ------------------------------------------------------------
+class Scan:
+    def __init__(self, compiled: CompiledRules, raw: str, stanza_index: dict, ranges: list = None):
+        self.compiled = compiled
+        self.raw = raw
+        self.stanza_index = stanza_index
+        self.spans = list(ranges) if ranges is not None else [(0, len(raw))]
+        self.size = len(raw)
+
+        self.matches = {}  # regex trigger -> [matched text] over the spans
+        self.trigger_seconds = {}
+        self.overrun = set()
+        self.overlong = {}  # regex trigger -> start of a line too long to match
+        self.skipped = {}  # rule_id -> reason, for rules cut off by their budget or a long line
+        self._lower = None
+        self._newlines_at = None
+        self._long = None
+        self._found = {}
+        self._stanza_hits = {}
+
+    @property
+    def lower(self) -> str:
+        """Lowercased raw, made on first use (case-sensitive rules never need it)."""
+        if self._lower is None:
+            lower = self.raw.lower()
+            # Case folding can change lengths for a few non-ASCII characters;
+            # then fold ASCII only, so offsets keep lining up with raw.
+            self._lower = lower if len(lower) == len(self.raw) else self.raw.translate(_ASCII_LOWER)
+        return self._lower
+
+    # --------------------------------------------------------
+    # Trigger lookups
+    # --------------------------------------------------------
+    def _haystack(self, literal) -> str:
+        return self.raw if isinstance(literal, Exact) else self.lower
+
+    def _find(self, literal, start: int, end: int) -> bool:
+        return self._haystack(literal).find(_text(literal), start, end) != -1
+
+    def _deadline(self, trigger: Regex, started: float) -> float:
+        budget = self.compiled.trigger_budget.get(trigger, RULE_BUDGET_MS / 1000)
+        return started + budget - self.trigger_seconds.get(trigger, 0.0)
+
+    def _segments(self, trigger: Regex, ranges):
+        """ranges minus over-long lines, chunked; notes long lines holding the anchor."""
+        for start, end in ranges:
+            pos = start
+            for line_start, line_end in self._long_lines(start, end):
+                if trigger not in self.overlong and self._find(trigger.anchor, line_start, line_end):
+                    # Matching it could run unbounded: the rule is skipped, never passed silently
+                    self.overlong[trigger] = self.raw[line_start:line_start + 40].strip()
+                if line_start > pos:
+                    yield from _chunks(self.raw, pos, line_start)
+                pos = line_end
+            if pos < end:
+                yield from _chunks(self.raw, pos, end)
+
+    def _confirm(self, trigger: Regex, ranges, first: bool) -> list:
+        """[matched text] of trigger in ranges; first=True stops at one."""
+        clock = time.perf_counter
+        started = clock()
+        deadline = self._deadline(trigger, started)
+
+        regex = trigger.regex
+        text = self.lower if trigger.on_lower else self.raw
+        # Matches in the lowercased copy are reported in the config's own case
+        plain = text is self.raw and regex.groups < 2
+        group = 1 if regex.groups else 0
+        raw = self.raw
+
+        found = []
+        for start, end in self._segments(trigger, ranges):
+            if first:
+                match = regex.search(text, start, end)
+                if match is not None:
+                    found.append(raw[match.start(group):match.end(group)])
+                    break
+            elif plain:
+                found += regex.findall(text, start, end)
+            else:
+                found += [raw[m.start(group):m.end(group)] for m in regex.finditer(text, start, end)]
+            if clock() > deadline:
+                self.overrun.add(trigger)
+                break
+
+        self.trigger_seconds[trigger] = self.trigger_seconds.get(trigger, 0.0) + clock() - started
+        return found
+
+    def _matches(self, trigger: Regex) -> list:
+        """Global regex matches over the spans (memoized)."""
+        found = self.matches.get(trigger)
+        if found is None:
+            found = []
+            if self.found(trigger.anchor):
+                found = self._confirm(trigger, self.spans, trigger not in self.compiled.collecting)
+            self.matches[trigger] = found
+        return found
+
+    def found(self, trigger, ranges=None) -> bool:
+        trigger = _trigger(trigger)
+        if ranges is not None:
+            if isinstance(trigger, Regex):
+                return any(self._find(trigger.anchor, s, e) for s, e in ranges) \
+                    and bool(self._confirm(trigger, ranges, True))
+            return any(self._find(trigger, s, e) for s, e in ranges)
+
+        hit = self._found.get(trigger)
+        if hit is None:
+            if isinstance(trigger, Regex):
+                hit = bool(self._matches(trigger))
+            else:
+                hit = any(self._find(trigger, s, e) for s, e in self.spans)
+            self._found[trigger] = hit
+        return hit
+
+    def found_anywhere(self, trigger) -> bool:
+        """found() over the whole config, whatever the spans (for `unless`)."""
+        if self.spans == [(0, self.size)]:
+            return self.found(trigger)
+        return self.found(trigger, [(0, self.size)])
+
+    def collected(self, trigger: Regex, ranges=None) -> list:
+        if ranges is None:
+            return list(self._matches(trigger))
+        if not any(self._find(trigger.anchor, s, e) for s, e in ranges):
+            return []
+        return self._confirm(trigger, ranges, False)
+
+    # --------------------------------------------------------
+    # Stanza hits
+    # --------------------------------------------------------
+    def _literal_spans(self, literal):
+        """(starts, ends) arrays of every occurrence of a literal in the spans."""
+        finditer = re.compile(re.escape(_text(literal))).finditer
+        text = self._haystack(literal)
+        starts = np.array(
+            [m.start() for start, end in self.spans for m in finditer(text, start, end)], dtype=np.int64
+        )
+        return starts, starts + len(_text(literal))
+
+    def _newlines(self) -> np.ndarray:
+        """Offsets of every line break in raw (made on first use)."""
+        if self._newlines_at is None:
+            # Chunked: large temporaries cost more in page faults than the scan itself
+            ascii = self.raw.isascii()
+            parts = [np.zeros(0, dtype=np.int64)]
+            for start in range(0, len(self.raw), REGEX_CHUNK):
+                chunk = self.raw[start:start + REGEX_CHUNK]
+                if ascii:
+                    codes = np.frombuffer(chunk.encode("ascii"), dtype=np.uint8)
+                else:
+                    codes = np.frombuffer(chunk.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+                parts.append(np.flatnonzero(codes == 10) + start)
+            self._newlines_at = np.concatenate(parts)
+        return self._newlines_at
+
+    def _long_lines(self, start: int, end: int) -> list:
+        """(start, end) of lines in raw[start:end] longer than MAX_REGEX_LINE."""
+        if self._long is None:
+            # A longer line covers a whole aligned block of this size, so
+            # a break in every block rules them out without the line table
+            block = MAX_REGEX_LINE // 2 + 1
+            find = self.raw.find
+            if all([find("\n", at, at + block) >= 0 for at in range(0, self.size - block + 1, block)]):
+                self._long = ()
+            else:
+                bounds = np.concatenate(([-1], self._newlines(), [self.size]))
+                long = np.flatnonzero(np.diff(bounds) - 1 > MAX_REGEX_LINE)
+                self._long = (bounds[long] + 1, bounds[long + 1])
+        if not self._long:
+            return []
+
+        line_starts, line_ends = self._long
+        lo = np.searchsorted(line_ends, start, side="right")
+        hi = np.searchsorted(line_starts, end, side="left")
+        found = []
+        for line_start, line_end in zip(line_starts[lo:hi].tolist(), line_ends[lo:hi].tolist()):
+            line_start, line_end = max(line_start, start), min(line_end, end)
+            if line_end - line_start > MAX_REGEX_LINE:
+                found.append((line_start, line_end))
+        return found
+
+    def _regex_spans(self, trigger: Regex):
+        """(starts, ends) arrays of the first match on each line holding the anchor."""
+        clock = time.perf_counter
+        started = clock()
+        deadline = self._deadline(trigger, started)
+
+        # Lines holding the anchor, from the line-break table
+        newlines = self._newlines()
+        line = np.unique(np.searchsorted(newlines, self._literal_spans(trigger.anchor)[0]))
+        line_starts = np.where(line > 0, newlines[np.maximum(line - 1, 0)] + 1, 0)
+        line_ends = np.append(newlines, self.size)[line]
+
+        too_long = line_ends - line_starts > MAX_REGEX_LINE
+        if too_long.any():
+            # Matching it could run unbounded: the rule is skipped, never passed silently
+            first = int(line_starts[too_long][0])
+            self.overlong.setdefault(trigger, self.raw[first:first + 40].strip())
+
+        text = self.lower if trigger.on_lower else self.raw
+        find = trigger.regex.match if trigger.line_start else trigger.regex.search
+        bounds = list(zip(line_starts[~too_long].tolist(), line_ends[~too_long].tolist()))
+        starts, ends = [], []
+        for block in range(0, len(bounds), 1024):
+            found = [m for m in (find(text, s, e) for s, e in bounds[block:block + 1024]) if m is not None]
+            starts += [m.start() for m in found]
+            ends += [m.end() for m in found]
+            if clock() > deadline:
+                self.overrun.add(trigger)
+                break
+
+        self.trigger_seconds[trigger] = self.trigger_seconds.get(trigger, 0.0) + clock() - started
+        return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+    def stanza_hits(self, kind: str) -> dict:
+        """
+        {stanza name: frozenset of triggers found} for stanzas of `kind`
+        within the spans. Each trigger is located once and its matches
+        are assigned to the stanza range holding them.
+        """
+        hits_of = self._stanza_hits.get(kind)
+        if hits_of is not None:
+            return hits_of
+
+        stanzas = self.stanza_index.get(kind) or {}
+        triggers = self.compiled.stanza_triggers.get(kind, ())
+        hits_of = self._stanza_hits[kind] = {}
+        if not stanzas or not triggers or not self.spans:
+            return hits_of
+
+        names = list(stanzas)
+        flats = list(stanzas.values())
+        flat = np.fromiter(chain.from_iterable(flats), dtype=np.int64)
+        owners = np.repeat(np.arange(len(names)), [len(f) // 2 for f in flats])
+        order = np.argsort(flat[0::2], kind="stable")
+        starts, ends, owners = flat[0::2][order], flat[1::2][order], owners[order]
+
+        matrix = np.zeros((len(names), len(triggers)), dtype=bool)
+        for column, trigger in enumerate(triggers):
+            if isinstance(trigger, Regex):
+                if not self.found(trigger.anchor):
+                    continue
+                begin, finish = self._regex_spans(trigger)
+            else:
+                begin, finish = self._literal_spans(trigger)
+            # The range starting at or before a match must also hold its end
+            slot = np.searchsorted(starts, begin, side="right") - 1
+            inside = (slot >= 0) & (finish <= ends[np.maximum(slot, 0)])
+            matrix[owners[slot[inside]], column] = True
+
+        # Only stanzas the spans reach are known; the rest are looked up on demand
+        keep = np.ones(len(names), dtype=bool)
+        if self.spans != [(0, self.size)]:
+            span_starts = np.array([s for s, _ in self.spans], dtype=np.int64)
+            span_ends = np.array([e for _, e in self.spans], dtype=np.int64)
+            first = np.array([f[0] for f in flats], dtype=np.int64)
+            slot = np.searchsorted(span_starts, first, side="right") - 1
+            keep = (slot >= 0) & (first < span_ends[np.maximum(slot, 0)])
+
+        # Stanzas mostly share a handful of hit sets: build each once. Rows
+        # are packed into fixed-size byte keys (np.unique on axis=0 is slow).
+        keys = np.packbits(matrix, axis=1)
+        keys = keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sets = [frozenset(t for t, hit in zip(triggers, row) if hit) for row in matrix[first].tolist()]
+        for name, pattern, kept in zip(names, inverse.ravel().tolist(), keep.tolist()):
+            if kept:
+                hits_of[name] = sets[pattern]
+        return hits_of
+
+    # --------------------------------------------------------
+    # Rule evaluation
+    # --------------------------------------------------------
+    def _fires(self, rule: Rule, ranges=None) -> bool:
+        found = self.found
+        if not all(found(t, ranges) for t in rule.present):
+            return False
+        if rule.any_of and not any(found(t, ranges) for t in rule.any_of):
+            return False
+        return not any(found(t, ranges) for t in rule.absent)
+
+    @staticmethod
+    def _fires_on(rule: Rule, hits: frozenset) -> bool:
+        if not all(t in hits for t in rule.present):
+            return False
+        if rule.any_of and not any(t in hits for t in rule.any_of):
+            return False
+        return not any(t in hits for t in rule.absent)
+
+    def _findings(self, rule: Rule, ranges=None, name=None) -> list:
+        if not self._fires(rule, ranges):
+            return []
+
+        if rule.collect is None:
+            return [rule.message.format(name=name) if name is not None else rule.message]
+
+        hits = self.collected(rule.collect, ranges)
+        if rule.match_filter:
+            hits = [h for h in hits if any(w in h.lower() for w in rule.match_filter)]
+        if not hits:
+            return []
+        if rule.message and "{matches}" in rule.message:
+            return [rule.message.format(matches=", ".join(hits), name=name)]
+        return hits
+
+    def _skip_reason(self, rule: Rule):
+        for trigger in rule.triggers():
+            if trigger in self.overlong:
+                return f"line '{self.overlong[trigger]}…' is longer than {MAX_REGEX_LINE} characters"
+        if any(t in self.overrun for t in rule.triggers()):
+            return f"exceeded {rule.budget * 1000:.0f} ms budget"
+        return None
+
+    def _run(self, rule: Rule, evaluate, *args):
+        """
+        Run evaluate(rule, deadline, *args) within the rule's budget
+        (minus time already spent confirming its regexes). Over budget,
+        or when one of its regexes met a line longer than MAX_REGEX_LINE,
+        the rule is skipped: recorded in `skipped` and None returned.
+        Records the run in TIMINGS when enabled.
+        """
+
+        start = time.perf_counter()
+        regex_seconds = sum(self.trigger_seconds.get(t, 0.0) for t in rule.triggers())
+
+        result = None
+        reason = self._skip_reason(rule)
+        if reason is None:
+            try:
+                result = evaluate(rule, start + rule.budget - regex_seconds, *args)
+            except _BudgetExceeded:
+                reason = f"exceeded {rule.budget * 1000:.0f} ms budget"
+            else:
+                # Regexes confirmed during evaluation may have hit a limit too
+                reason = self._skip_reason(rule)
+
+        if reason is not None:
+            result = None
+            self.skipped[rule.rule_id] = reason
+
+        if TIMINGS.enabled:
+            seconds = time.perf_counter() - start + regex_seconds
+            matches = sum(len(self.matches.get(t, ())) for t in rule.triggers())
+            TIMINGS.record(rule.rule_id, seconds, matches, self.size)
+        return result
+
+    def stanza_findings(self, rule: Rule, names=None) -> dict:
+        """
+        {stanza name: [findings]} for a scoped rule, in config order. A
+        skipped rule returns {SKIPPED: [flag]} instead.
+        """
+        result = self._run(rule, self._stanza_findings, names)
+        if result is None:
+            return {SKIPPED: [skipped_finding(rule.rule_id, self.skipped[rule.rule_id])]}
+        return result
+
+    def _stanza_findings(self, rule: Rule, deadline: float, names=None) -> dict:
+        stanzas = self.stanza_index.get(rule.scope, {})
+        selected = list(stanzas) if names is None else [name for name in stanzas if name in names]
+        prefix = rule.scope_name
+        if prefix is not None:
+            selected = [name for name in selected if name.startswith(prefix)]
+
+        def label(name):
+            return name if prefix is None else name[len(prefix):].strip()
+
+        if any(self.found_anywhere(t) for t in rule.unless):
+            return {name: [] for name in selected}
+
+        # Decide once per distinct hit set; stanzas mostly share a handful
+        hits_of = self.stanza_hits(rule.scope)
+        fired = {hits for hits in {hits_of.get(name) for name in selected}
+                 if hits is not None and self._fires_on(rule, hits)}
+
+        findings = {}
+        for i, name in enumerate(selected):
+            if i % 1024 == 0 and time.perf_counter() > deadline:
+                raise _BudgetExceeded
+            hits = hits_of.get(name)
+            if hits is None or rule.collect is not None:
+                # Outside the scanned spans, or collecting: match this stanza directly
+                findings[name] = self._findings(rule, _pairs(stanzas[name]), label(name))
+            elif hits in fired:
+                findings[name] = [rule.message.format(name=label(name))]
+            else:
+                findings[name] = []
+        return findings
+
+    def evaluate_rule(self, rule: Rule) -> list:
+        """[findings]; a skipped rule yields a single flag finding instead."""
+        result = self._run(rule, self._evaluate_rule)
+        if result is None:
+            return [skipped_finding(rule.rule_id, self.skipped[rule.rule_id])]
+        return result
+
+    def _evaluate_rule(self, rule: Rule, deadline: float) -> list:
+        if rule.scope is not None:
+            found = self._stanza_findings(rule, deadline)
+            return [f for findings in found.values() for f in findings]
+
+        if any(self.found_anywhere(t) for t in rule.unless):
+            return []
+
+        if rule.fallback_for is not None and self.stanza_index.get(rule.fallback_for):
+            return []
+
+        return self._findings(rule)
+
+    def evaluate(self) -> dict:
+        """{rule_id: [findings]} for every compiled rule (empty list = passed)."""
+        return {rule.rule_id: self.evaluate_rule(rule) for rule in self.compiled.rules}
+
+
+# ------------------------------------------------------------
+#  INCREMENTAL RE-EVALUATION (stanza-level change tracking)
+# ------------------------------------------------------------
+RESIDUAL = ""  # stanza kind for top-level lines the index does not cover
+
+
+def _merge_ranges(ranges) -> list:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+
+def residual_ranges(raw: str, stanza_index: dict) -> list:
+    """[start, end) gaps of raw not covered by any indexed stanza."""
+    covered = _merge_ranges(
+        r for names in stanza_index.values() for flat in names.values() for r in _pairs(flat)
+    )
+    gaps, pos = [], 0
+    for start, end in covered:
+        if start > pos:
+            gaps.append((pos, start))
+        pos = end
+    if pos < len(raw):
+        gaps.append((pos, len(raw)))
+    return gaps
+
+
+def _digest(raw: str, ranges) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for start, end in ranges:
+        h.update(raw[start:end].encode("utf-8", errors="surrogatepass"))
+        h.update(b"\0")
+    return h.digest()
+
+
+def stanza_digests(raw: str, stanza_index: dict) -> dict:
+    """{(kind, name): digest} per indexed stanza, plus (RESIDUAL, "") for the rest."""
+    digests = {
+        (kind, name): _digest(raw, _pairs(flat))
+        for kind, names in stanza_index.items()
+        for name, flat in names.items()
+    }
+    digests[(RESIDUAL, "")] = _digest(raw, residual_ranges(raw, stanza_index))
+    return digests
+
+
+def changed_stanzas(old: dict, new: dict) -> dict:
+    """{kind: {names}} of stanzas added, removed or edited between two digest maps."""
+    changed = {}
+    for key in old.keys() | new.keys():
+        if old.get(key) != new.get(key):
+            changed.setdefault(key[0], set()).add(key[1])
+    return changed
+
+
+class RuleSnapshot:
+    """
+    Per-device evaluation state: stanza digests plus each rule's
+    findings. Scoped rules keep {stanza name: findings} so a single
+    edited interface only re-runs that interface; `held` names the
+    scoped rules an `unless` trigger suppressed.
+    """
+
+    __slots__ = ("version", "digests", "results", "held")
+
+    def __init__(self, version: str, digests: dict, results: dict, held: frozenset = frozenset()):
+        self.version = version
+        self.digests = digests
+        self.results = results
+        self.held = held
+
+    def evaluate(self) -> dict:
+        """{rule_id: [findings]}, same shape as Scan.evaluate()."""
+        return {
+            rule_id: [f for found in result.values() for f in found] if isinstance(result, dict) else result
+            for rule_id, result in self.results.items()
+        }
+
+
+def _held(scan: "Scan", rules) -> frozenset:
+    """Ids of the scoped rules whose `unless` holds for this config."""
+    return frozenset(
+        rule.rule_id for rule in rules
+        if rule.scope is not None and any(scan.found_anywhere(t) for t in rule.unless)
+    )
+
+
+def _scan_ranges(stanza_index: dict, plan: dict) -> list:
+    """Union of the stanza ranges the planned scoped rules re-run over."""
+    ranges = []
+    for rule, names in plan.items():
+        for name, flat in stanza_index.get(rule.scope, {}).items():
+            if names is None or name in names:
+                ranges += _pairs(flat)
+    return _merge_ranges(ranges)
+
+
+def evaluate_incremental(compiled: CompiledRules, raw: str, stanza_index: dict = None,
+                         previous: RuleSnapshot = None) -> RuleSnapshot:
+    """
+    Evaluate `compiled` against a new snapshot of a device. With the
+    previous snapshot of the same device, scoped rules only re-run for
+    the stanzas of their scope that changed, and those findings are
+    merged into the cached ones. Unscoped rules match anywhere in the
+    config, so they re-run in full whenever anything changed.
+    """
+
+    stanza_index = stanza_index or {}
+    digests = stanza_digests(raw, stanza_index)
+
+    if previous is None or previous.version != compiled.version:
+        scan = compiled.scan(raw, stanza_index)
+        results = {
+            rule.rule_id: scan.stanza_findings(rule) if rule.scope is not None else scan.evaluate_rule(rule)
+            for rule in compiled.rules
+        }
+        return RuleSnapshot(compiled.version, digests, results, _held(scan, compiled.rules))
+
+    changed = changed_stanzas(previous.digests, digests)
+    if not changed:
+        return RuleSnapshot(compiled.version, digests, previous.results, previous.held)
+
+    results = dict(previous.results)
+
+    whole_rules = [rule for rule in compiled.rules if rule.scope is None]
+    whole = compiled.subset(whole_rules).scan(raw, stanza_index)
+    for rule in whole_rules:
+        results[rule.rule_id] = whole.evaluate_rule(rule)
+    held = _held(whole, compiled.rules)
+
+    # scoped rule -> changed stanza names to re-run (None = every stanza)
+    plan = {}
+    for rule in compiled.rules:
+        if rule.scope is None:
+            continue
+        # A flipped `unless`, or a rule skipped last time, has no per-stanza
+        # results worth merging into
+        if ((rule.rule_id in held) != (rule.rule_id in previous.held)
+                or SKIPPED in previous.results.get(rule.rule_id, {})):
+            plan[rule] = None
+        elif rule.scope in changed:
+            # Deleted stanzas drop out in the merge below, they are not re-run
+            plan[rule] = changed[rule.scope] & stanza_index.get(rule.scope, {}).keys()
+
+    scan = None
+    if plan:
+        scan = compiled.subset(list(plan)).scan(raw, stanza_index, _scan_ranges(stanza_index, plan))
+
+    for rule, names in plan.items():
+        fresh = scan.stanza_findings(rule, names)
+        if names is None or SKIPPED in fresh:
+            results[rule.rule_id] = fresh
+            continue
+
+        cached = previous.results[rule.rule_id]
+        results[rule.rule_id] = {
+            name: fresh[name] if name in names else cached[name]
+            for name in stanza_index.get(rule.scope, {})
+            if name in fresh or name in cached
+        }
+
+    return RuleSnapshot(compiled.version, digests, results, held)
+
+
+# ------------------------------------------------------------
+#  DEFAULT REGISTRY (rules are declared in audit_rules.py)
+# ------------------------------------------------------------
+RULES = RuleRegistry()
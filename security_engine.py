@@ -3,86 +3,70 @@
 #  Produces structured findings used in UI + PDF exports
 # ============================================================
 
-import re
+from audit_rules import RULES, scan, sections
+from rule_engine import TIMINGS
+from utils.parser import interface_table
 
-def find_weak_passwords(raw_text):
-    patterns = [
-        r"password 0 \S+",
-        r"username \S+ password",
-        r"enable password \S+",
-        r"enable secret \S+",
-        r"password \S+",
-        r"secret \S+",
-    ]
 
-    weak_keywords = ["cisco", "admin", "1234", "12345", "password"]
+# -------------------------------------------------------------
+# Static checks are declared in audit_rules.py ("security.*").
+# run_security_audit() evaluates them in one scan; each find_*
+# helper compiles and scans only the rules of its own section.
+# -------------------------------------------------------------
+def _section_findings(raw_text, section):
+    compiled = RULES.compile("security")
+    own = compiled.subset([rule for rule in compiled.rules if rule.section == section])
+    found = own.scan(raw_text or "").evaluate()
+    return [f for rule in own.rules for f in found[rule.rule_id]]
 
-    found = []
 
-    for p in patterns:
-        matches = re.findall(p, raw_text, re.IGNORECASE)
-        for m in matches:
-            # Check if weak phrase appears
-            if any(w in m.lower() for w in weak_keywords):
-                found.append(m)
+def _weak_passwords(findings):
+    return list(set(findings))
 
-    return list(set(found))
 
+def _status(findings):
+    return findings[0] if findings else "OK"
 
-def find_missing_aaa(raw_text):
-    if "aaa new-model" not in raw_text.lower():
-        return "AAA is NOT enabled"
-    return "OK"
 
+def find_weak_passwords(raw_text):
+    return _weak_passwords(_section_findings(raw_text, "weak_passwords"))
 
-def find_stp_issues(raw_text):
-    issues = []
-    if "spanning-tree portfast" not in raw_text.lower():
-        issues.append("No STP PortFast detected")
-
-    if "bpduguard" not in raw_text.lower():
-        issues.append("No BPDU Guard detected")
 
-    return issues
+def find_missing_aaa(raw_text):
+    return _status(_section_findings(raw_text, "aaa_status"))
 
 
-def find_default_vlan(raw_text):
-    issues = []
-    # default VLAN has risks
-    vlan10 = re.findall(r"interface vlan ?1", raw_text, re.IGNORECASE)
-    if vlan10:
-        issues.append("VLAN 1 active — not recommended")
+def find_stp_issues(raw_text):
+    return _section_findings(raw_text, "stp_issues")
 
-    trunks = re.findall(r"switchport trunk allowed vlan.*1", raw_text)
-    if trunks:
-        issues.append("VLAN 1 allowed on trunk")
 
-    return issues
+def find_default_vlan(raw_text):
+    return _section_findings(raw_text, "default_vlan_risks")
 
 
 def find_no_logging(raw_text):
-    if "logging buffered" not in raw_text.lower():
-        return "Logging not configured"
-    return "OK"
+    return _status(_section_findings(raw_text, "logging"))
 
 
 def find_cdp_exposure(raw_text):
-    if "cdp run" in raw_text.lower():
-        return "CDP is enabled — may expose topology"
-    return "OK"
+    return _status(_section_findings(raw_text, "cdp_exposure"))
 
 
-def find_interface_problems(parsed):
+def find_interface_problems(parsed, intfs=None):
     problems = []
 
-    intfs = parsed.get("interfaces", {})
+    if intfs is None:
+        intfs = interface_table(parsed)
 
-    for name, data in intfs.items():
-        if data.get("status") == "down":
-            problems.append(f"{name} is down")
+    with TIMINGS.timed("security.interfaces", len(intfs)) as check:
+        for name, data in intfs.items():
+            if data.get("status") == "down":
+                problems.append(f"{name} is down")
 
-        if data.get("ip") in ["0.0.0.0", None]:
-            problems.append(f"{name} missing IP")
+            if data.get("ip") in ["0.0.0.0", None]:
+                problems.append(f"{name} missing IP")
+
+        check.matches = len(problems)
 
     return problems
 
@@ -91,16 +75,21 @@ def find_interface_problems(parsed):
 # MAIN AUDIT WRAPPER
 # -------------------------------------------------------------
 def run_security_audit(parsed):
-    raw = parsed.get("raw", "")
+    return build_security_audit(parsed, scan(parsed.get("raw", ""), "security"))
+
+
+def build_security_audit(parsed, findings, interfaces=None):
+    """Project {rule_id: [findings]} onto this engine's report schema."""
+    found = sections(findings, "security")
 
     audit = {
-        "weak_passwords": find_weak_passwords(raw),
-        "aaa_status": find_missing_aaa(raw),
-        "stp_issues": find_stp_issues(raw),
-        "default_vlan_risks": find_default_vlan(raw),
-        "logging": find_no_logging(raw),
-        "cdp_exposure": find_cdp_exposure(raw),
-        "interface_warnings": find_interface_problems(parsed),
+        "weak_passwords": _weak_passwords(found["weak_passwords"]),
+        "aaa_status": _status(found["aaa_status"]),
+        "stp_issues": found["stp_issues"],
+        "default_vlan_risks": found["default_vlan_risks"],
+        "logging": _status(found["logging"]),
+        "cdp_exposure": _status(found["cdp_exposure"]),
+        "interface_warnings": find_interface_problems(parsed, interfaces),
     }
 
     return audit
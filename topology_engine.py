@@ -2,6 +2,21 @@
 #  NETWORK TOPOLOGY GENERATOR (Mermaid.js)
 # ============================================================
 
+import os
+import re
+
+import numpy as np
+
+
+# Per-view budget: beyond this a browser-side Mermaid layout stalls
+MERMAID_MAX_NODES = int(os.getenv("NETDOC_MERMAID_MAX_NODES", "120"))
+MERMAID_MAX_EDGES = int(os.getenv("NETDOC_MERMAID_MAX_EDGES", "240"))
+
+
+def _label(text: str) -> str:
+    return str(text).replace('"', "#quot;")
+
+
 def generate_topology_mermaid(parsed):
     """
     parsed["cdp_neighbors"] expected:
@@ -17,8 +32,10 @@ def generate_topology_mermaid(parsed):
 
     mermaid = ["graph TD"]
 
-    # Add main device node
-    mermaid.append(f'    {hostname}["{hostname}"]')
+    # Node ids are positional (n0, n1, ...): names like "SW1.corp" or
+    # "Gi1/0/1" are not valid Mermaid ids. Each device is declared once.
+    ids = {hostname: "n0"}
+    mermaid.append(f'    n0["{_label(hostname)}"]')
 
     # Build links
     for local_intf, info in neighbors.items():
@@ -26,16 +43,333 @@ def generate_topology_mermaid(parsed):
         remote_intf = info.get("port", "")
 
         # Add remote node
-        mermaid.append(f'    {remote_dev}["{remote_dev}"]')
+        if remote_dev not in ids:
+            ids[remote_dev] = f"n{len(ids)}"
+            mermaid.append(f'    {ids[remote_dev]}["{_label(remote_dev)}"]')
 
         # Create a labeled connection
         mermaid.append(
-            f'    {hostname} -- "{local_intf} ↔ {remote_intf}" --> {remote_dev}'
+            f'    n0 -- "{_label(local_intf)} ↔ {_label(remote_intf)}" --> {ids[remote_dev]}'
         )
 
     # If no neighbors, show placeholder
     if not neighbors:
         mermaid.append('    Empty["No CDP/LLDP neighbors detected"]')
-        mermaid.append(f"    {hostname} --> Empty")
+        mermaid.append("    n0 --> Empty")
 
     return "\n".join(mermaid)
+
+
+# ============================================================
+#  LEVEL-OF-DETAIL VIEWS (utils.topology_graph.TopologyGraph)
+#
+#  overview  — one node per group (site / role), links summed
+#  group     — one group's devices as a subgraph, neighbors in
+#              other groups collapsed into one stub per group,
+#              paged so no view exceeds the node/edge budget
+# ============================================================
+
+_GROUP_RE = re.compile(r"^([A-Za-z]+)")
+
+
+def default_group(name: str) -> str:
+    """"nyc-core1" -> "nyc", "LON.dist2" -> "LON", "SW12" -> "SW"."""
+    head = re.split(r"[-_.]", name, 1)[0]
+    if head != name:
+        return head
+    match = _GROUP_RE.match(name)
+    return match.group(1) if match else name
+
+
+def group_codes(graph, groups=None):
+    """
+    (names, codes): codes[node_id] indexes the group name of every
+    node. groups is {device: group}, a callable, or None for
+    default_group(); devices missing from a dict fall back to it.
+    """
+
+    if groups is None:
+        label = default_group
+    elif callable(groups):
+        label = groups
+    else:
+        label = lambda name: groups.get(name) or default_group(name)
+
+    names, code_of = [], {}
+    codes = np.empty(len(graph.names), dtype=np.int32)
+    for nid, name in enumerate(graph.names):
+        group = label(name)
+        code = code_of.get(group)
+        if code is None:
+            code = code_of[group] = len(names)
+            names.append(group)
+        codes[nid] = code
+    return names, codes
+
+
+def _edges(graph):
+    """(src, dst, inferred_only) of every live link."""
+    live = graph.live_slots()
+    src = np.frombuffer(graph.src, dtype=np.int32)[live]
+    dst = np.frombuffer(graph.dst, dtype=np.int32)[live]
+    inferred = np.frombuffer(graph.inferred, dtype=np.int8)[live]
+    refs = np.frombuffer(graph.refs, dtype=np.int32)[live]
+    return src, dst, refs == inferred
+
+
+# group_scene() stub code for groups folded past the node budget
+_OTHER_STUB = np.iinfo(np.int64).min
+
+
+def _stub_key(s: int) -> str:
+    if s == _OTHER_STUB:
+        return "so"
+    return f"s{s}" if s >= 0 else f"sp{-s}"
+
+
+class Scene:
+    """
+    One renderable view: nodes [(key, label, kind)] with kind "device",
+    "group" or "stub", and edges [(key, key, label, style)] with style
+    "solid", "subnet" (inferred only) or "stub". Rendered to Mermaid
+    here and to SVG by topology_layout.
+    """
+
+    __slots__ = ("title", "direction", "nodes", "edges", "note")
+
+    def __init__(self, title: str, direction: str = "TD"):
+        self.title = title
+        self.direction = direction
+        self.nodes = []
+        self.edges = []
+        self.note = None
+
+    def mermaid(self) -> str:
+        lines = [f"graph {self.direction}"]
+
+        devices = [node for node in self.nodes if node[2] == "device"]
+        if devices:
+            lines.append(f'    subgraph G["{_label(self.title)}"]')
+            for key, label, _ in devices:
+                lines.append(f'        {key}["{_label(label)}"]')
+            lines.append("    end")
+
+        for key, label, kind in self.nodes:
+            if kind == "group":
+                lines.append(f'    {key}["{_label(label)}"]')
+            elif kind == "stub":
+                lines.append(f'    {key}(["{_label(label)}"])')
+
+        for a, b, label, style in self.edges:
+            if style == "subnet":
+                lines.append(f"    {a} -. subnet .- {b}")
+            elif style == "stub":
+                lines.append(f"    {a} -.-|{label}| {b}" if label else f"    {a} -.- {b}")
+            else:
+                lines.append(f"    {a} ---|{label}| {b}" if label else f"    {a} --- {b}")
+
+        if self.note:
+            lines.append(f'    more["{_label(self.note)}"]')
+        return "\n".join(lines)
+
+
+class TopologyViews:
+    """
+    Budgeted Mermaid views over one TopologyGraph snapshot. Grouping
+    and the edge arrays are computed once per graph version; each
+    view is then a handful of array ops plus string formatting.
+    """
+
+    def __init__(self, graph, groups=None, max_nodes: int = MERMAID_MAX_NODES,
+                 max_edges: int = MERMAID_MAX_EDGES):
+        self.graph = graph
+        self.max_nodes = max_nodes
+        self.max_edges = max_edges
+        self.version = graph.version
+
+        self.groups, self.codes = group_codes(graph, groups)
+        self.src, self.dst, self.inferred_only = _edges(graph)
+
+        active = np.zeros(len(graph.names), dtype=bool)
+        active[graph.nodes()] = True
+        self.active = active
+        self.sizes = np.bincount(self.codes[active], minlength=len(self.groups))
+        self._page_sizes = {}
+
+    # --------------------------------------------------------
+    # Overview
+    # --------------------------------------------------------
+    def overview_scene(self) -> "Scene":
+        """One node per group; edge labels count the links between groups."""
+        sizes = self.sizes
+        shown = np.flatnonzero(sizes)
+        if len(shown) > self.max_nodes:
+            shown = shown[np.argsort(-sizes[shown], kind="stable")[:self.max_nodes]]
+
+        keep = np.zeros(len(self.groups), dtype=bool)
+        keep[shown] = True
+
+        gs, gd = self.codes[self.src], self.codes[self.dst]
+        lo, hi = np.minimum(gs, gd), np.maximum(gs, gd)
+        cross = (lo != hi) & keep[lo] & keep[hi]
+        pairs, counts = np.unique(lo[cross].astype(np.int64) * len(self.groups) + hi[cross], return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:self.max_edges]
+
+        scene = Scene("Overview", "LR")
+        for g in shown.tolist():
+            scene.nodes.append((f"g{g}", f"{self.groups[g]} ({int(sizes[g])})", "group"))
+        for i in order.tolist():
+            a, b = divmod(int(pairs[i]), len(self.groups))
+            scene.edges.append((f"g{a}", f"g{b}", str(int(counts[i])), "solid"))
+
+        hidden = int(np.count_nonzero(sizes)) - len(shown)
+        if hidden > 0:
+            scene.note = f"… {hidden} smaller groups"
+        return scene
+
+    def overview(self) -> str:
+        return self.overview_scene().mermaid()
+
+    # --------------------------------------------------------
+    # Group drill-down
+    # --------------------------------------------------------
+    def members(self, group: str) -> np.ndarray:
+        code = self.groups.index(group)
+        return np.flatnonzero((self.codes == code) & self.active)
+
+    def page_size(self, group: str) -> int:
+        """
+        Devices per page of `group`. Stubs count against max_nodes too:
+        a group whose devices and outside groups fit is one page,
+        otherwise every page leaves a fifth of max_nodes for stubs.
+        """
+
+        size = self._page_sizes.get(group)
+        if size is None:
+            members = self.members(group)
+            size = max(1, self.max_nodes - max(1, self.max_nodes // 5))
+            if len(members) <= self.max_nodes:
+                mine = np.zeros(len(self.codes), dtype=bool)
+                mine[members] = True
+                ends = np.concatenate((self.dst[mine[self.src]], self.src[mine[self.dst]]))
+                outside = np.unique(self.codes[ends[~mine[ends]]])
+                if len(members) + len(outside) <= self.max_nodes:
+                    size = max(1, len(members))
+            self._page_sizes[group] = size
+        return size
+
+    def pages(self, group: str) -> int:
+        return max(1, -(-len(self.members(group)) // self.page_size(group)))
+
+    def group_scene(self, group: str, page: int = 0) -> "Scene":
+        """
+        Devices of `group` (page `page` of pages(group)) inside one
+        subgraph. Links leaving the page end on a stub per other
+        group (or per other page of this group), labelled with a count.
+        Devices plus stubs never exceed max_nodes: past the free slots,
+        the stubs with the fewest links fold into one "other" stub.
+        """
+
+        graph = self.graph
+        members = self.members(group)
+        size = self.page_size(group)
+        chunk = members[page * size:(page + 1) * size]
+
+        on_page = np.zeros(len(graph.names), dtype=bool)
+        on_page[chunk] = True
+
+        # Orient every touching link as (device on page, other end)
+        fwd = on_page[self.src]
+        rev = on_page[self.dst] & ~fwd
+        a = np.concatenate((self.src[fwd], self.dst[rev]))
+        b = np.concatenate((self.dst[fwd], self.src[rev]))
+        guessed = np.concatenate((self.inferred_only[fwd], self.inferred_only[rev]))
+
+        # Device pairs on the page; a pair is drawn as inferred (subnet
+        # match only) when none of its links was reported by CDP/LLDP
+        inner = on_page[b]
+        ia, ib = a[inner], b[inner]
+        internal, pair = np.unique(np.stack((np.minimum(ia, ib), np.maximum(ia, ib)), axis=1), axis=0, return_inverse=True)
+        reported = np.bincount(pair.ravel(), weights=~guessed[inner], minlength=len(internal)) > 0
+
+        # Outside ends: by group, except this group's other pages
+        code = self.groups.index(group)
+        oa, ob = a[~inner], b[~inner]
+        stub = self.codes[ob].astype(np.int64)
+        same = stub == code
+        position = np.searchsorted(members, ob[same])
+        stub[same] = -1 - position // size
+
+        # Stub budget: keep the busiest, fold the rest into OTHER_STUB
+        stubs, stub_of = np.unique(stub, return_inverse=True)
+        slots = self.max_nodes - len(chunk)
+        folded = 0
+        if len(stubs) > slots:
+            links = np.bincount(stub_of, minlength=len(stubs))
+            kept = np.zeros(len(stubs), dtype=bool)
+            kept[np.argsort(-links, kind="stable")[:max(slots - 1, 0)]] = True
+            folded = len(stubs) - int(kept.sum())
+            stub = np.where(kept[stub_of], stub, _OTHER_STUB)
+            if slots == 0:
+                oa, stub = oa[kept[stub_of]], stub[kept[stub_of]]
+        external, counts = np.unique(np.stack((oa, stub), axis=1), axis=0, return_counts=True)
+
+        title = group if self.pages(group) == 1 else f"{group} ({page + 1}/{self.pages(group)})"
+        scene = Scene(title, "TD")
+        for nid in chunk.tolist():
+            scene.nodes.append((f"n{nid}", graph.names[nid], "device"))
+
+        for s in np.unique(external[:, 1]).tolist() if len(external) else ():
+            if s == _OTHER_STUB:
+                scene.nodes.append(("so", f"{folded} more groups …", "stub"))
+                continue
+            name = self.groups[s] if s >= 0 else f"{group} page {-s}"
+            scene.nodes.append((_stub_key(s), f"{name} …", "stub"))
+
+        budget = self.max_edges
+        for (x, y), seen in zip(internal[:budget].tolist(), reported[:budget].tolist()):
+            scene.edges.append((f"n{x}", f"n{y}", "", "solid" if seen else "subnet"))
+        budget -= min(len(internal), budget)
+
+        for (x, s), count in zip(external[:budget].tolist(), counts[:budget].tolist()):
+            scene.edges.append((f"n{x}", _stub_key(s), str(count) if count > 1 else "", "stub"))
+
+        dropped = len(internal) + len(external) - self.max_edges
+        notes = []
+        if dropped > 0:
+            notes.append(f"{dropped} more links")
+        if slots == 0 and folded:
+            notes.append(f"{folded} linked groups not shown")
+        if notes:
+            scene.note = "… " + ", ".join(notes)
+        return scene
+
+    def group_view(self, group: str, page: int = 0) -> str:
+        return self.group_scene(group, page).mermaid()
+
+    def views(self):
+        """Yield {"id", "title", "mermaid"}: the overview, then every group page."""
+        yield {"id": "overview", "title": "Overview", "mermaid": self.overview()}
+        for g in np.flatnonzero(self.sizes).tolist():
+            group = self.groups[g]
+            for page in range(self.pages(group)):
+                yield {
+                    "id": f"{group}:{page}",
+                    "title": group if page == 0 else f"{group} ({page + 1})",
+                    "mermaid": self.group_view(group, page),
+                }
+
+
+def render_topology(graph, groups=None, view: str = "overview", page: int = 0, **budget) -> str:
+    """
+    One Mermaid view of a fleet graph: small graphs render in full as
+    a single group page; larger ones start at the overview and drill
+    into view=<group name>.
+    """
+
+    views = TopologyViews(graph, groups, **budget)
+    if view == "overview" and len(graph) <= views.max_nodes:
+        return TopologyViews(graph, lambda name: "Fleet", **budget).group_view("Fleet")
+    if view == "overview":
+        return views.overview()
+    return views.group_view(view, page)
@@ -0,0 +1,201 @@
+# ============================================================
+#  TOPOLOGY LAYOUT + SVG (server side)
+#
+#  Force-directed layout in NumPy for topology_engine scenes, so
+#  the browser receives finished SVG instead of re-running the
+#  Mermaid layout on every rerun. Coordinates are cached by graph
+#  fingerprint (memory LRU + shared disk store): an unchanged
+#  view is never laid out twice.
+# ============================================================
+
+import json
+import os
+from hashlib import blake2b
+from html import escape
+
+import numpy as np
+
+from utils.cache import DiskStore, LRUCache, TieredCache
+from utils.parse_cache import CACHE_DIR
+
+
+LAYOUT_VERSION = "1"
+LAYOUT_CACHE_ENTRIES = int(os.getenv("NETDOC_LAYOUT_CACHE_ENTRIES", "256"))
+LAYOUT_CACHE_MB = int(os.getenv("NETDOC_LAYOUT_CACHE_MB", "64"))
+LAYOUT_ITERATIONS = int(os.getenv("NETDOC_LAYOUT_ITERATIONS", "150"))
+
+# Above this many nodes repulsion is computed against grid cells
+# instead of every other node (O(n * cells) instead of O(n^2))
+EXACT_REPULSION_NODES = 600
+GRID_CELLS = 24
+
+_cache = TieredCache(
+    LRUCache(LAYOUT_CACHE_ENTRIES),
+    DiskStore(os.path.join(CACHE_DIR, "layout"), LAYOUT_CACHE_MB * 1024 * 1024),
+)
+
+
+# ---------------------------------------------------------------
+# Fruchterman–Reingold, vectorised
+# ---------------------------------------------------------------
+def _push(pos: np.ndarray, bodies: np.ndarray, weight) -> np.ndarray:
+    """Sum over bodies of weight * k^2 / d along each (node - body) direction."""
+    dx = pos[:, 0, None] - bodies[None, :, 0]
+    dy = pos[:, 1, None] - bodies[None, :, 1]
+    scale = weight / np.maximum(dx * dx + dy * dy, 1e-6)
+    return np.stack(((dx * scale).sum(axis=1), (dy * scale).sum(axis=1)), axis=1)
+
+
+def _repulsion(pos: np.ndarray, k2: float) -> np.ndarray:
+    n = len(pos)
+    if n <= EXACT_REPULSION_NODES:
+        # A node's push on itself is zero (dx = dy = 0)
+        return _push(pos, pos, k2)
+
+    # Grid approximation: each cell acts as one body at its centroid
+    cells = GRID_CELLS
+    lo = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - lo, 1e-9)
+    cell = np.minimum(((pos - lo) / span * cells).astype(np.int64), cells - 1)
+    code = cell[:, 0] * cells + cell[:, 1]
+
+    mass = np.bincount(code, minlength=cells * cells).astype(np.float64)
+    used = np.flatnonzero(mass)
+    centroid = np.stack([
+        np.bincount(code, weights=pos[:, d], minlength=cells * cells)[used] / mass[used]
+        for d in (0, 1)
+    ], axis=1)
+    return _push(pos, centroid, k2 * mass[used])
+
+
+def force_layout(n: int, edges: np.ndarray, iterations: int = LAYOUT_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """
+    (n, 2) coordinates in [0, 1] for n nodes and an (m, 2) int array of
+    edges. Deterministic for a given seed. A weak pull to the centre
+    keeps disconnected components on the canvas.
+    """
+
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.full((1, 2), 0.5)
+
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    k = 1.0 / np.sqrt(n)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    src, dst = edges[:, 0], edges[:, 1]
+
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        disp = _repulsion(pos, k * k)
+
+        if len(edges):
+            delta = pos[src] - pos[dst]
+            dist = np.maximum(np.linalg.norm(delta, axis=1), 1e-9)
+            pull = delta * (dist / k)[:, None]
+            for d in (0, 1):
+                disp[:, d] -= np.bincount(src, weights=pull[:, d], minlength=n)
+                disp[:, d] += np.bincount(dst, weights=pull[:, d], minlength=n)
+
+        disp -= (pos - 0.5) * (k * n * 0.05)
+
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        pos += disp / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature -= cooling
+
+    lo, hi = pos.min(axis=0), pos.max(axis=0)
+    return (pos - lo) / np.maximum(hi - lo, 1e-9)
+
+
+# ---------------------------------------------------------------
+# Cached layout of a scene
+# ---------------------------------------------------------------
+def scene_key(scene) -> str:
+    """Fingerprint of a scene's node keys and edges (labels do not move nodes)."""
+    h = blake2b(digest_size=16)
+    h.update(LAYOUT_VERSION.encode())
+    for key, _, _ in scene.nodes:
+        h.update(key.encode() + b"\0")
+    h.update(b"\1")
+    for a, b, _, _ in scene.edges:
+        h.update(f"{a}-{b};".encode())
+    return h.hexdigest()
+
+
+def scene_layout(scene) -> dict:
+    """{node key: (x, y)} in [0, 1], computed once per scene fingerprint."""
+    key = scene_key(scene)
+    cached = _cache.get(key)
+    if cached is not None:
+        return {k: tuple(v) for k, v in json.loads(cached).items()}
+
+    index = {node[0]: i for i, node in enumerate(scene.nodes)}
+    edges = np.array(
+        [(index[a], index[b]) for a, b, _, _ in scene.edges if a in index and b in index],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    seed = int(key[:8], 16)
+    pos = force_layout(len(index), edges, seed=seed)
+
+    coords = {node: (round(float(x), 4), round(float(y), 4)) for node, (x, y) in zip(index, pos.tolist())}
+    _cache.put(key, json.dumps(coords))
+    return coords
+
+
+def layout_stats() -> dict:
+    return _cache.stats()
+
+
+# ---------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------
+_NODE_FILL = {"device": "#dbeafe", "group": "#dcfce7", "stub": "#f3f4f6"}
+_EDGE_DASH = {"solid": "", "subnet": ' stroke-dasharray="6 4"', "stub": ' stroke-dasharray="2 4"'}
+
+
+def render_svg(scene, width: int = 1200, height: int = 800, margin: int = 60) -> str:
+    """Static SVG of a scene at its cached layout."""
+    coords = scene_layout(scene)
+    sx = lambda x: margin + x * (width - 2 * margin)
+    sy = lambda y: margin + y * (height - 2 * margin)
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">',
+        f'<text x="{margin}" y="24" font-size="16">{escape(scene.title)}</text>',
+        '<g stroke="#64748b" stroke-width="1.2">',
+    ]
+    for a, b, label, style in scene.edges:
+        if a not in coords or b not in coords:
+            continue
+        (x1, y1), (x2, y2) = coords[a], coords[b]
+        out.append(
+            f'<line x1="{sx(x1):.1f}" y1="{sy(y1):.1f}" x2="{sx(x2):.1f}" y2="{sy(y2):.1f}"{_EDGE_DASH[style]}/>'
+        )
+        if label:
+            out.append(
+                f'<text x="{sx((x1 + x2) / 2):.1f}" y="{sy((y1 + y2) / 2):.1f}" stroke="none" '
+                f'fill="#334155">{escape(label)}</text>'
+            )
+    out.append("</g>")
+
+    for key, label, kind in scene.nodes:
+        x, y = coords[key]
+        out.append(
+            f'<g transform="translate({sx(x):.1f},{sy(y):.1f})">'
+            f'<circle r="7" fill="{_NODE_FILL[kind]}" stroke="#1e293b"/>'
+            f'<text x="10" y="4">{escape(label)}</text></g>'
+        )
+
+    if scene.note:
+        out.append(f'<text x="{margin}" y="{height - 16}" fill="#64748b">{escape(scene.note)}</text>')
+    out.append("</svg>")
+    return "".join(out)
+
+
+def view_svg(views, view: str = "overview", page: int = 0, **size) -> str:
+    """SVG counterpart of topology_engine.render_topology() for a TopologyViews."""
+    scene = views.overview_scene() if view == "overview" else views.group_scene(view, page)
+    return render_svg(scene, **size)
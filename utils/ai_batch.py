@@ -0,0 +1,260 @@
+# ===============================================================
+#  NetDoc AI — CONCURRENT AI DOCUMENTATION (asyncio)
+#  Documents many devices with a bounded number of requests in
+#  flight, under per-minute request and token budgets, retrying
+#  transient API errors with jittered backoff. Records stream back
+#  in completion order; cached answers never touch the API.
+#
+#  Run:  python -m utils.ai_batch BACKUP_DIR OUT.jsonl
+# ===============================================================
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+from ai_engine import (
+    MODEL, TEMPERATURE, MAX_TOKENS, build_messages, completion_args,
+    get_async_client, parse_ai_output, store_response,
+)
+from utils.ai_cache import responses, response_key
+
+
+AI_CONCURRENCY = int(os.getenv("NETDOC_AI_CONCURRENCY", "8"))
+AI_RPM = int(os.getenv("NETDOC_AI_RPM", "500"))
+AI_TPM = int(os.getenv("NETDOC_AI_TPM", "200000"))
+AI_RETRIES = int(os.getenv("NETDOC_AI_RETRIES", "5"))
+AI_BACKOFF = float(os.getenv("NETDOC_AI_BACKOFF", "1.0"))
+AI_BACKOFF_MAX = float(os.getenv("NETDOC_AI_BACKOFF_MAX", "60"))
+
+# Rate limits, timeouts and server-side failures are worth another try
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRY_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+# ---------------------------------------------------------------
+# Token buckets (requests per minute, tokens per minute)
+# ---------------------------------------------------------------
+class TokenBucket:
+    """
+    Refills at per_minute / 60 per second up to `capacity` (default: a
+    full minute's budget). Waiters queue on a lock, so they are served
+    in arrival order.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A request bigger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.rate)
+                self._refill()
+            self.level -= amount
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) after the fact; may go into debt."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    def __init__(self, rpm: float = AI_RPM, tpm: float = AI_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def acquire(self, tokens: int):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+    def settle(self, estimated: int, used: int):
+        """Swap the up-front estimate for the usage the API reported."""
+        self.tokens.adjust(used - estimated)
+
+
+def estimate_tokens(messages) -> int:
+    """Prompt at ~4 characters per token plus the full completion budget."""
+    return sum(len(m["content"]) for m in messages) // 4 + MAX_TOKENS
+
+
+# ---------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------
+def is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUS
+    return isinstance(exc, (asyncio.TimeoutError, OSError)) or type(exc).__name__ in RETRY_ERRORS
+
+
+def _retry_after(exc: Exception):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    Full jitter: uniform over [0, min(cap, base * 2^attempt)], so
+    clients that failed together do not retry together. A server's
+    Retry-After wins when present.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, AI_BACKOFF)
+    return random.uniform(0, min(AI_BACKOFF_MAX, AI_BACKOFF * 2 ** attempt))
+
+
+# ---------------------------------------------------------------
+# One device
+# ---------------------------------------------------------------
+async def document_device(name, parsed, client, limiter: RateLimiter,
+                          retries: int = AI_RETRIES, use_cache: bool = True) -> dict:
+    """
+    AI documentation record for one device. Never raises: a failure
+    building the prompt, reading or storing the cache, or a request
+    that is not retryable or still fails after `retries` retries, is
+    reported in the record's `error`.
+    """
+
+    start = time.perf_counter()
+    record = {"device": name, "docs": None, "error": None, "cached": False, "attempts": 0}
+
+    try:
+        messages = build_messages(parsed)
+        key = response_key(messages, MODEL, TEMPERATURE)
+
+        raw_text = responses.get(key) if use_cache else None
+        if raw_text is not None:
+            record["docs"] = parse_ai_output(raw_text)
+            record["cached"] = True
+        else:
+            estimate = estimate_tokens(messages)
+            while True:
+                record["attempts"] += 1
+                await limiter.acquire(estimate)
+                try:
+                    completion = await client.chat.completions.create(**completion_args(messages))
+                except Exception as e:
+                    # A failed request used none of its token estimate
+                    limiter.settle(estimate, 0)
+                    if record["attempts"] > retries or not is_retryable(e):
+                        raise
+                    await asyncio.sleep(backoff_delay(record["attempts"], _retry_after(e)))
+                    continue
+
+                used = getattr(getattr(completion, "usage", None), "total_tokens", None)
+                if used is not None:
+                    limiter.settle(estimate, used)
+                record["docs"] = store_response(key, completion.choices[0].message.content, use_cache)
+                break
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+# ---------------------------------------------------------------
+# Fan out with bounded in-flight requests, yield in completion order
+# ---------------------------------------------------------------
+async def iter_ai_docs(items, client=None, concurrency: int = AI_CONCURRENCY,
+                       limiter: RateLimiter = None, retries: int = AI_RETRIES, use_cache: bool = True):
+    """
+    items: iterable of (name, parsed) pairs, consumed lazily; at most
+    `concurrency` devices are in flight. `client` is an AsyncOpenAI (or
+    compatible) client, created from the API key when omitted. Yields
+    one document_device() record per device as it completes.
+    """
+
+    own_client = client is None
+    client = client or get_async_client()
+    limiter = limiter or RateLimiter()
+    limit = max(concurrency, 1)
+    pending = set()
+
+    try:
+        for name, parsed in items:
+            pending.add(asyncio.create_task(
+                document_device(name, parsed, client, limiter, retries, use_cache)
+            ))
+            if len(pending) >= limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Consumer stopped early: do not leave requests running
+        for task in pending:
+            task.cancel()
+        if own_client:
+            await client.close()
+
+
+def generate_ai_docs_batch(items, **kwargs) -> dict:
+    """Blocking wrapper: {device: record} for every (name, parsed) pair."""
+
+    async def _collect():
+        return {record["device"]: record async for record in iter_ai_docs(items, **kwargs)}
+
+    return asyncio.run(_collect())
+
+
+# ---------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------
+def _parsed_configs(root: str):
+    from utils.ingest import iter_parse_directory
+
+    for path, parsed, error in iter_parse_directory(root):
+        if error:
+            print(f"skip {path}: {error}", file=sys.stderr)
+        else:
+            yield path, parsed
+
+
+async def _write_jsonl(root: str, out: str) -> dict:
+    start = time.perf_counter()
+    done = failed = cached = 0
+
+    with open(out, "w", encoding="utf-8") as fh:
+        async for record in iter_ai_docs(_parsed_configs(root)):
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+            fh.flush()
+
+            done += 1
+            failed += record["error"] is not None
+            cached += record["cached"]
+            if done % 50 == 0 or record["error"]:
+                print(f"[{done}] {failed} failed — {record['device']}: {record['error'] or 'ok'}", file=sys.stderr)
+
+    return {
+        "devices": done, "failed": failed, "cached": cached,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m utils.ai_batch BACKUP_DIR OUT.jsonl")
+
+    print(json.dumps(asyncio.run(_write_jsonl(sys.argv[1], sys.argv[2]))))
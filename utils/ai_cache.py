@@ -0,0 +1,102 @@
+# ===============================================================
+#  NetDoc AI — AI RESPONSE CACHE
+#  Memory LRU → shared disk store, entries expire after a TTL.
+#  Keyed by (normalized prompt, model, temperature)
+# ===============================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.cache import DiskStore, LRUCache, TieredCache
+from utils.parse_cache import CACHE_DIR
+
+
+AI_CACHE_TTL = int(os.getenv("NETDOC_AI_CACHE_TTL", str(7 * 24 * 3600)))
+AI_CACHE_ENTRIES = int(os.getenv("NETDOC_AI_CACHE_ENTRIES", "256"))
+AI_CACHE_MB = int(os.getenv("NETDOC_AI_CACHE_MB", "256"))
+
+
+class ResponseCache:
+    """
+    TieredCache of completion texts wrapped in {"expires", "text"}
+    envelopes. An expired entry counts as a miss and is deleted from
+    both tiers on sight; size bounds are the LRU entry count and the
+    disk store's byte budget.
+    """
+
+    def __init__(self, directory: str, ttl: int = AI_CACHE_TTL,
+                 entries: int = AI_CACHE_ENTRIES, max_mb: int = AI_CACHE_MB):
+        self.ttl = ttl
+        self._cache = TieredCache(
+            LRUCache(entries),
+            DiskStore(directory, max_mb * 1024 * 1024) if directory else None,
+        )
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        raw = self._cache.get(key)
+        entry = json.loads(raw) if raw is not None else None
+
+        with self._lock:
+            if entry is not None and entry["expires"] <= time.time():
+                self.expired += 1
+                entry = None
+                self._cache.delete(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry["text"]
+
+    def put(self, key: str, text: str, ttl: int = None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        self._cache.put(key, json.dumps({"expires": expires, "text": text}))
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+    def clear_memory(self):
+        self._cache.memory.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "tiers": self._cache.stats(),
+        }
+
+
+# ---------------------------------------------------------------
+# Cache key
+# ---------------------------------------------------------------
+def normalize_prompt(text: str) -> str:
+    """Whitespace-insensitive: re-indenting the prompt template keeps its cache."""
+    return " ".join(text.split())
+
+
+def response_key(messages: list, model: str, temperature: float) -> str:
+    payload = json.dumps(
+        {
+            "messages": [[m["role"], normalize_prompt(m["content"])] for m in messages],
+            "model": model,
+            "temperature": round(float(temperature), 4),
+        },
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+responses = ResponseCache(os.path.join(CACHE_DIR, "ai"))
+
+
+def cache_stats() -> dict:
+    return responses.stats()
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.parser import parse_config
+from utils.batch import iter_parse_parallel, merge_by_device
 
 st.set_page_config(page_title="NetDoc AI", layout="wide")
 
@@ -13,13 +13,16 @@ uploaded_files = st.file_uploader(
 )
 
 if uploaded_files and st.button("Generate Report"):
-    combined = ""
-    for f in uploaded_files:
-        combined += f"\n\n# FILE: {f.name}\n"
-        combined += f.read().decode("utf-8")
+    progress = st.progress(0.0, text="Processing your configs...")
+    files = [(f.name, f.getvalue()) for f in uploaded_files]
 
-    with st.spinner("Processing your configs..."):
-        result = parse_config(combined)
+    # Each file is parsed as its own device across a process pool
+    results = []
+    for done in iter_parse_parallel(files):
+        results.append(done)
+        progress.progress(len(results) / len(files), text=f"Parsed {done[0]}")
 
-    st.success("Report generated successfully!")
+    result = merge_by_device(results)
+
+    st.success(f"Report generated successfully for {len(result)} device(s)!")
     st.json(result)
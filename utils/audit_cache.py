@@ -0,0 +1,150 @@
+# ===============================================================
+#  NetDoc AI — AUDIT RESULT CACHE
+#  Memory LRU → AuditReport table → run the audit
+#  Keyed by (organization, canonical config hash, ruleset version)
+# ===============================================================
+
+import json
+import os
+
+from audit_rules import RULES
+from utils.cache import LRUCache
+from utils.parse_cache import config_hash
+from utils.parser import PARSER_VERSION
+
+
+AUDIT_CACHE_ENTRIES = int(os.getenv("NETDOC_AUDIT_CACHE_ENTRIES", "512"))
+
+# Bump whenever a cached report changes shape (sections, keys, summary
+# format) without any rule changing, so older reports are not served.
+REPORT_SCHEMA_VERSION = "1"
+
+_memory = LRUCache(AUDIT_CACHE_ENTRIES)
+
+# Engine name for AuditPipeline.reports(): keyed on every rule of every engine
+ALL_ENGINES = "all"
+
+
+# ---------------------------------------------------------------
+# Cache key
+# ---------------------------------------------------------------
+def ruleset_version(engine: str) -> str:
+    """
+    Changes when a rule of this engine, the parser output or the report
+    schema changes, e.g. "main-3f2a…-p6-r1".
+    """
+    rules = RULES.compile(None if engine == ALL_ENGINES else engine).version
+    return f"{engine}-{rules}-p{PARSER_VERSION}-r{REPORT_SCHEMA_VERSION}"
+
+
+def audit_key(text: str, engine: str) -> tuple:
+    return config_hash(text), ruleset_version(engine)
+
+
+# ---------------------------------------------------------------
+# Database tier (imported lazily: database.py needs DATABASE_URL)
+# ---------------------------------------------------------------
+def _db_get(digest: str, version: str, org_id=None):
+    from database import AuditReport, SessionLocal
+
+    # Reports never cross organizations, even for identical configs
+    same_org = AuditReport.org_id.is_(None) if org_id is None else AuditReport.org_id == org_id
+
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(AuditReport.audit_json)
+            .filter(AuditReport.config_hash == digest, AuditReport.ruleset_version == version, same_org)
+            .order_by(AuditReport.created_at.desc())
+            .first()
+        )
+    finally:
+        db.close()
+
+    return row[0] if row else None
+
+
+def _db_put(digest: str, version: str, value: str, user_id=None, org_id=None):
+    from database import AuditReport, SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(AuditReport(
+            user_id=user_id, org_id=org_id, audit_json=value,
+            config_hash=digest, ruleset_version=version,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------
+# Cached audit
+# ---------------------------------------------------------------
+def run_audit_cached(text: str, audit_fn, engine: str = "main", user=None, use_db: bool = True) -> dict:
+    """
+    audit_fn(text) memoized by (user's organization, config hash,
+    ruleset version). A miss is audited once and saved as an
+    AuditReport for `user`, so reopening the same device later (in any
+    worker) is a lookup for that organization only. Every hit hands
+    back a fresh dict the caller is free to mutate.
+    """
+
+    digest, version = audit_key(text, engine)
+    org_id = getattr(user, "org_id", None)
+    key = f"{org_id}-{digest}-{version}"
+
+    value = _memory.get(key)
+    if value is None and use_db:
+        value = _db_get(digest, version, org_id)
+        if value is not None:
+            _memory.put(key, value)
+
+    if value is not None:
+        return json.loads(value)
+
+    audit = audit_fn(text)
+    value = json.dumps(audit)
+    _memory.put(key, value)
+
+    if use_db:
+        _db_put(
+            digest, version, value,
+            user_id=getattr(user, "id", None), org_id=org_id,
+        )
+    return audit
+
+
+def purge_stale(engine: str = None) -> int:
+    """
+    Delete cached AuditReports written under an older ruleset version
+    (rules of `engine` or of every engine, parser, report schema).
+    Reports saved without a cache key are left alone. Returns the
+    number of rows removed.
+    """
+
+    from database import AuditReport, SessionLocal
+
+    engines = [engine] if engine else sorted({rule.engine for rule in RULES.rules()}) + [ALL_ENGINES]
+
+    db = SessionLocal()
+    try:
+        removed = 0
+        for name in engines:
+            removed += (
+                db.query(AuditReport)
+                .filter(
+                    AuditReport.ruleset_version.like(f"{name}-%"),
+                    AuditReport.ruleset_version != ruleset_version(name),
+                )
+                .delete(synchronize_session=False)
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    return removed
+
+
+def cache_stats() -> dict:
+    return _memory.stats()
@@ -0,0 +1,73 @@
+# ===============================================================
+#  NetDoc AI — PARALLEL PER-FILE PARSING
+# ===============================================================
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.parser import parse_device
+
+
+# ---------------------------------------------------------------
+# Worker (must stay top-level so the process pool can pickle it)
+# ---------------------------------------------------------------
+def parse_file_bytes(name: str, data: bytes) -> tuple:
+    """
+    Parse one uploaded file. Returns (name, device, error); the compact
+    Device keeps pickling and the pending results small.
+    """
+    try:
+        device = parse_device(io.BytesIO(data))
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+    return name, device, None
+
+
+# ---------------------------------------------------------------
+# Fan out across a process pool, yield as each file finishes
+# ---------------------------------------------------------------
+def iter_parse_parallel(files, max_workers: int = None):
+    """
+    files: iterable of (name, bytes) pairs.
+    Yields (name, device, error) in completion order. A single file is
+    parsed inline since starting a pool would cost more than the parse.
+    """
+
+    files = list(files)
+    workers = max_workers or os.cpu_count() or 1
+
+    if len(files) <= 1 or workers == 1:
+        for name, data in files:
+            yield parse_file_bytes(name, data)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        futures = [pool.submit(parse_file_bytes, name, data) for name, data in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# ---------------------------------------------------------------
+# Merge per-file results into a per-device map
+# ---------------------------------------------------------------
+def merge_by_device(results) -> dict:
+    """
+    Key each parsed file by hostname. Files that share a hostname (or
+    have none) are disambiguated with the file name so nothing is lost.
+    """
+
+    devices = {}
+
+    for name, device, error in results:
+        if error:
+            devices[f"ERROR ({name})"] = {"file": name, "error": error}
+            continue
+
+        key = device.hostname
+        if key in devices or key == "UnknownDevice":
+            key = f"{key} ({name})"
+
+        devices[key] = {"file": name, **device.to_dict()}
+
+    return devices
@@ -0,0 +1,232 @@
+# ===============================================================
+#  NetDoc AI — CACHE PRIMITIVES (in-process LRU + shared disk store)
+# ===============================================================
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+# ---------------------------------------------------------------
+# In-process LRU
+# ---------------------------------------------------------------
+class LRUCache:
+    """
+    Thread-safe bounded LRU map with hit/miss counters. With max_bytes,
+    put() takes each value's size and the least recently used entries
+    are also dropped once the sizes add up past max_bytes.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size: int = 0):
+        with self._lock:
+            self._bytes += size - self._sizes.pop(key, 0)
+            if size:
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and self._data
+            ):
+                old, _ = self._data.popitem(last=False)
+                self._bytes -= self._sizes.pop(old, 0)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            self._bytes -= self._sizes.pop(key, 0)
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self) -> dict:
+        return {"entries": len(self._data), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+# ---------------------------------------------------------------
+# Shared on-disk store
+# ---------------------------------------------------------------
+class DiskStore:
+    """
+    Directory of `<key[:2]>/<key><suffix>` text files shared by every
+    worker process. Writes are atomic (temp file + os.replace), reads
+    bump the file mtime, and the oldest files are evicted once the
+    directory grows past max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".json"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        path = self._path(key)
+        folder = os.path.dirname(path)
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(value)
+            if self._size is None or self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _scan(self) -> list:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        return entries
+
+    def _evict(self):
+        """Drop least recently used files until the store is under 90% of max_bytes."""
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+
+        if total > self.max_bytes:
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+        self._size = total
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._size,
+        }
+
+
+# ---------------------------------------------------------------
+# LRU in front of the disk store
+# ---------------------------------------------------------------
+class TieredCache:
+    """
+    Memory LRU first, then the shared DiskStore. The disk holds
+    encode(value) strings; the memory LRU holds values as they are,
+    sized by their encoded length, so a memory hit decodes nothing.
+    """
+
+    def __init__(self, memory: LRUCache, disk: DiskStore = None, encode=None, decode=None):
+        self.memory = memory
+        self.disk = disk
+        self.encode = encode or str
+        self.decode = decode or str
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        text = self.disk.get(key)
+        if text is None:
+            return None
+        value = self.decode(text)
+        self.memory.put(key, value, len(text))
+        return value
+
+    def put(self, key: str, value):
+        text = self.encode(value)
+        self.memory.put(key, value, len(text))
+        if self.disk is not None:
+            self.disk.put(key, text)
+
+    def delete(self, key: str):
+        self.memory.pop(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        disk = self.disk.stats() if self.disk is not None else {}
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + disk.get("hits", 0)
+
+        return {
+            "memory": memory,
+            "disk": disk,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,153 @@
+# ===============================================================
+#  NetDoc AI — FLEET COMPLIANCE MATRIX
+#  devices x rules uint8 matrix + severity-weighted risk scores,
+#  so fleet rollups are array ops instead of dict loops.
+# ===============================================================
+
+import numpy as np
+
+from audit_rules import RULES
+
+
+class ComplianceMatrix:
+    """
+    failed[i, j] == 1 when device i fails rule j. `meta` holds one
+    label list per device attribute (site, role, plan, ...) used by
+    the group-by helpers; unknown values are "". Labels are encoded to
+    integer codes once, so every group-by is a bincount.
+    """
+
+    def __init__(self, devices, rule_ids, failed, meta=None):
+        self.devices = np.asarray(devices, dtype=object)
+        self.rule_ids = list(rule_ids)
+        self.failed = np.asarray(failed, dtype=np.uint8)
+        self.weights = np.array([RULES[r].weight for r in self.rule_ids], dtype=np.float32)
+        self.meta = {}
+        for key, values in (meta or {}).items():
+            names, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+            self.meta[key] = (names.tolist(), codes.ravel())
+
+        self._column = {rule_id: j for j, rule_id in enumerate(self.rule_ids)}
+        self._scores = None
+
+    # -----------------------------------------------------------
+    # Construction
+    # -----------------------------------------------------------
+    @classmethod
+    def from_records(cls, records, meta=None, engine: str = "audit"):
+        """
+        Build from utils.fleet records ({"device", "failed_rules", "error"}).
+        meta: {device: {"site": ..., "role": ..., "plan": ...}}. Records
+        with an error are left out, since they were never audited.
+        """
+
+        rule_ids = [rule.rule_id for rule in RULES.rules(engine)]
+        column = {rule_id: j for j, rule_id in enumerate(rule_ids)}
+        meta = meta or {}
+
+        devices, rows, cols = [], [], []
+        for record in records:
+            if record.get("error"):
+                continue
+            i = len(devices)
+            devices.append(record["device"])
+            for rule_id in record.get("failed_rules", ()):
+                j = column.get(rule_id)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+
+        failed = np.zeros((len(devices), len(rule_ids)), dtype=np.uint8)
+        failed[rows, cols] = 1
+
+        keys = sorted({key for info in meta.values() for key in info})
+        labels = {
+            key: [str(meta.get(device, {}).get(key) or "") for device in devices]
+            for key in keys
+        }
+        return cls(devices, rule_ids, failed, labels)
+
+    def __len__(self):
+        return len(self.devices)
+
+    def column(self, rule_id: str) -> np.ndarray:
+        return self.failed[:, self._column[rule_id]]
+
+    # -----------------------------------------------------------
+    # Fleet-wide rates and scores
+    # -----------------------------------------------------------
+    def fail_rates(self) -> dict:
+        """{rule_id: fraction of devices failing it}."""
+        if not len(self):
+            return dict.fromkeys(self.rule_ids, 0.0)
+        rates = self.failed.mean(axis=0, dtype=np.float64)
+        return dict(zip(self.rule_ids, rates.tolist()))
+
+    def fail_rate(self, *rule_ids: str) -> float:
+        """Fraction of devices failing any of the given rules (e.g. both BPDU Guard variants)."""
+        if not len(self):
+            return 0.0
+        cols = [self._column[r] for r in rule_ids]
+        return float(self.failed[:, cols].any(axis=1).mean())
+
+    def scores(self) -> np.ndarray:
+        """Per-device risk: sum of the severity weights of every failed rule."""
+        if self._scores is None:
+            self._scores = self.failed @ self.weights
+        return self._scores
+
+    def riskiest(self, n: int = 50) -> list:
+        """[(device, score)] for the n highest scores, highest first."""
+        scores = self.scores()
+        n = min(n, len(scores))
+        if n <= 0:
+            return []
+
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return list(zip(self.devices[top].tolist(), scores[top].tolist()))
+
+    # -----------------------------------------------------------
+    # Group-bys (site / role / plan ...)
+    # -----------------------------------------------------------
+    def _groups(self, by: str):
+        groups = self.meta.get(by)
+        if groups is None:
+            raise KeyError(f"No '{by}' metadata on this matrix")
+        return groups
+
+    def group_fail_rates(self, by: str) -> dict:
+        """{group: {rule_id: fraction of the group's devices failing}}."""
+        names, codes = self._groups(by)
+        width = len(self.rule_ids)
+        counts = np.bincount(codes, minlength=len(names))
+
+        # One bincount over the failing cells, keyed by (group, rule)
+        rows, cols = np.nonzero(self.failed)
+        sums = np.bincount(codes[rows] * width + cols, minlength=len(names) * width)
+        rates = sums.reshape(len(names), width) / np.maximum(counts, 1)[:, None]
+
+        return {
+            name: dict(zip(self.rule_ids, row.tolist()))
+            for name, row in zip(names, rates)
+        }
+
+    def group_scores(self, by: str) -> dict:
+        """{group: {"devices", "mean", "max", "total"}} of risk scores."""
+        names, codes = self._groups(by)
+        scores = self.scores().astype(np.float64)
+
+        counts = np.bincount(codes, minlength=len(names))
+        totals = np.bincount(codes, weights=scores, minlength=len(names))
+        maxima = np.zeros(len(names))
+        np.maximum.at(maxima, codes, scores)
+
+        return {
+            name: {
+                "devices": int(count),
+                "mean": float(total / count) if count else 0.0,
+                "max": float(peak),
+                "total": float(total),
+            }
+            for name, count, total, peak in zip(names, counts, totals, maxima)
+        }
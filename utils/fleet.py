@@ -0,0 +1,228 @@
+# ===============================================================
+#  NetDoc AI — FLEET BATCH AUDIT
+#  Parse + audit many devices across a process pool, streaming
+#  per-device results (and JSON Lines) as each one finishes.
+#
+#  Run:  python -m utils.fleet BACKUP_DIR audit.jsonl
+# ===============================================================
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from audit_engine import audit_findings, build_audit, failed_rules
+from utils.ingest import iter_config_paths, parse_path
+from utils.link_inference import device_addresses, infer_graph_links
+from utils.parser import parse_config
+from utils.topology_graph import TOPOLOGY_PATH, TopologyGraph, device_links
+from utils.topology_snapshots import SnapshotStore
+
+# Times a device in flight when a worker dies (OOM kill, segfault) is
+# re-queued on a fresh pool before it is reported as failed
+POOL_RETRIES = int(os.getenv("NETDOC_FLEET_POOL_RETRIES", "1"))
+
+
+# ---------------------------------------------------------------
+# Worker (must stay top-level so the process pool can pickle it)
+# ---------------------------------------------------------------
+def _load(item) -> dict:
+    """Parse a path on disk or a (name, text/bytes) pair."""
+    if isinstance(item, (str, os.PathLike)):
+        return parse_path(os.fspath(item), keep_raw=True)
+
+    _, data = item
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="ignore")
+    return parse_config(data)
+
+
+def _record(item) -> dict:
+    name = item if isinstance(item, (str, os.PathLike)) else item[0]
+    return {
+        "device": os.fspath(name), "hostname": None, "audit": None,
+        "failed_rules": [], "links": None, "addresses": None, "error": None,
+    }
+
+
+def audit_item(item) -> dict:
+    """
+    Parse and audit one device. Never raises: a failure is reported in
+    the record's `error` so one bad config cannot sink the batch. Only
+    the audit and neighbor links travel back to the parent, not the
+    parsed config (links feed utils.topology_graph).
+    """
+
+    start = time.perf_counter()
+    record = _record(item)
+
+    try:
+        parsed = _load(item)
+        findings = audit_findings(parsed)
+        record["hostname"] = parsed.get("hostname")
+        record["audit"] = build_audit(parsed, findings)
+        record["failed_rules"] = failed_rules(parsed, findings)
+        record["links"] = device_links(parsed)
+        record["addresses"] = device_addresses(parsed)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+# ---------------------------------------------------------------
+# Fan out with bounded in-flight work, yield in completion order
+# ---------------------------------------------------------------
+def _failed(item, error: BaseException) -> dict:
+    """Record for a device whose worker never returned one."""
+    record = _record(item)
+    record["error"] = f"{type(error).__name__}: {error}"
+    record["seconds"] = None
+    return record
+
+
+def iter_audit_fleet(items, max_workers: int = None, max_in_flight: int = None):
+    """
+    items: iterable of config paths and/or (name, text|bytes) pairs.
+    It is consumed lazily, so a 20k-device directory walk never sits in
+    memory; at most max_in_flight (default 4 x workers) are queued.
+    Yields one audit_item() record per device as it completes.
+
+    A worker that dies breaks the whole pool: the pool is rebuilt and
+    the devices that were in flight are retried (POOL_RETRIES times),
+    then reported with an `error` like any other failed device.
+    """
+
+    items = iter(items)
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for item in items:
+            yield audit_item(item)
+        return
+
+    limit = max(max_in_flight or workers * 4, workers)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = {}  # future -> (item, pool breaks it has been through)
+    retry = []
+
+    def broke(item, breaks, error):
+        """Device lost with a broken pool: queue a retry, or its failure record."""
+        if breaks < POOL_RETRIES:
+            retry.append((item, breaks + 1))
+            return None
+        return _failed(item, error)
+
+    try:
+        while True:
+            records = []
+            broken = False
+            while len(pending) < limit and not broken:
+                if retry:
+                    item, breaks = retry.pop()
+                else:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    breaks = 0
+                try:
+                    pending[pool.submit(audit_item, item)] = (item, breaks)
+                except BrokenProcessPool as e:
+                    records.append(broke(item, breaks, e))
+                    broken = True
+
+            if not pending and not broken:
+                return
+
+            done = ()
+            if not broken:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+            if broken:
+                # Every other future of a broken pool fails as well
+                done, _ = wait(pending)
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=workers)
+
+            for future in done:
+                item, breaks = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    records.append(future.result())
+                elif isinstance(error, BrokenProcessPool):
+                    records.append(broke(item, breaks, error))
+                else:
+                    records.append(_failed(item, error))
+
+            for record in records:
+                if record is not None:
+                    yield record
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def audit_directory(root: str, **kwargs):
+    """iter_audit_fleet() over every archived config under root."""
+    return iter_audit_fleet(iter_config_paths(root), **kwargs)
+
+
+# ---------------------------------------------------------------
+# JSON Lines sink
+# ---------------------------------------------------------------
+def write_jsonl(records, out, progress=None) -> dict:
+    """
+    Write each record as one JSON line the moment it arrives (flushed,
+    so a partial file is usable if the run is interrupted). `out` is a
+    path or a text file object. progress(done, failed, record) is called
+    after every line. Returns {"devices", "failed", "seconds"}.
+    """
+
+    start = time.perf_counter()
+    done = failed = 0
+
+    fh = open(out, "w", encoding="utf-8") if isinstance(out, (str, os.PathLike)) else out
+    try:
+        for record in records:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+            fh.flush()
+
+            done += 1
+            failed += record.get("error") is not None
+            if progress is not None:
+                progress(done, failed, record)
+    finally:
+        if fh is not out:
+            fh.close()
+
+    return {"devices": done, "failed": failed, "seconds": round(time.perf_counter() - start, 2)}
+
+
+# ---------------------------------------------------------------
+# Nightly CLI
+# ---------------------------------------------------------------
+def _print_progress(done, failed, record):
+    if done % 100 == 0 or record.get("error"):
+        status = record["error"] or "ok"
+        print(f"[{done}] {failed} failed — {record['device']}: {status}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m utils.fleet BACKUP_DIR OUT.jsonl")
+
+    # Links of every audited device also refresh the saved fleet topology
+    topology = TopologyGraph.load_or_new(TOPOLOGY_PATH)
+
+    def _progress(done, failed, record):
+        topology.update_records((record,))
+        _print_progress(done, failed, record)
+
+    summary = write_jsonl(audit_directory(sys.argv[1]), sys.argv[2], progress=_progress)
+    infer_graph_links(topology)
+    topology.save(TOPOLOGY_PATH)
+    summary["topology"] = topology.stats()
+    summary["snapshot"] = SnapshotStore().take(topology).id
+    print(json.dumps(summary))
@@ -0,0 +1,75 @@
+# ===============================================================
+#  NetDoc AI — ON-DISK INGESTION (memory-mapped, bytes-level)
+#  For sweeping backup directories without decoding whole files.
+# ===============================================================
+
+import mmap
+import os
+
+from utils.parser import parse_config_binary, parse_config_stream
+from utils.show_parser import is_show_output
+
+
+CONFIG_SUFFIXES = (".txt", ".cfg", ".conf", ".ios", ".log")
+
+
+# ---------------------------------------------------------------
+# Line iteration straight off the mapping
+# ---------------------------------------------------------------
+def _mapped_lines(mm: mmap.mmap):
+    return iter(mm.readline, b"")
+
+
+def _first_meaningful_line(mm: mmap.mmap) -> str:
+    """Decode just the first non-blank, non-comment line (show bundle sniffing)."""
+    for line in _mapped_lines(mm):
+        stripped = line.strip()
+        if stripped and stripped[:1] not in (b"!", b"#"):
+            mm.seek(0)
+            return line.decode("utf-8", errors="ignore")
+
+    mm.seek(0)
+    return ""
+
+
+# ---------------------------------------------------------------
+# Single file
+# ---------------------------------------------------------------
+def parse_path(path: str, keep_raw: bool = False) -> dict:
+    """
+    Parse a config file on disk. The file is memory-mapped and the
+    tokenizer + field regexes run on bytes; only extracted values are
+    decoded. Show bundles and keep_raw=True need text, so those fall
+    back to the streaming text parser.
+    """
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_config_stream(f, keep_raw=keep_raw)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if keep_raw or is_show_output(_first_meaningful_line(mm)):
+                return parse_config_stream(_mapped_lines(mm), keep_raw=keep_raw)
+
+            return parse_config_binary(_mapped_lines(mm))
+
+
+# ---------------------------------------------------------------
+# Backup directory sweep
+# ---------------------------------------------------------------
+def iter_config_paths(root: str, suffixes: tuple = CONFIG_SUFFIXES):
+    """Yield every config file under root (recursive, sorted per directory)."""
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(suffixes):
+                yield os.path.join(folder, name)
+
+
+def iter_parse_directory(root: str, suffixes: tuple = CONFIG_SUFFIXES):
+    """Yield (path, parsed, error) for each archived config under root."""
+    for path in iter_config_paths(root, suffixes):
+        try:
+            yield path, parse_path(path), None
+        except (OSError, ValueError) as e:
+            yield path, None, f"{type(e).__name__}: {e}"
@@ -0,0 +1,252 @@
+# ===============================================================
+#  NetDoc AI — COMPACT PARSED-DEVICE MODEL
+#  __slots__ classes + interned names; converts to/from the
+#  legacy parse_config() dict without storing any field twice.
+# ===============================================================
+
+from sys import intern
+
+from utils.show_parser import show_fields
+
+
+def _intern(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+def _interned(values) -> tuple:
+    return tuple(intern(v) for v in values)
+
+
+# ---------------------------------------------------------------
+# Interface
+# ---------------------------------------------------------------
+class Interface:
+    __slots__ = (
+        "name", "description", "ip", "mask", "vlan",
+        "mode", "status", "protocol", "shutdown",
+    )
+
+    def __init__(self, name, description=None, ip=None, mask=None, vlan=None,
+                 mode=None, status=None, protocol=None, shutdown=False):
+        self.name = intern(name)
+        self.description = description
+        self.ip = ip
+        self.mask = mask
+        self.vlan = _intern(vlan)
+        self.mode = _intern(mode)
+        self.status = _intern(status)
+        self.protocol = _intern(protocol)
+        self.shutdown = shutdown
+
+    def to_dict(self) -> dict:
+        """Shape audit_engine / utils.report expect for parsed["interfaces"][name]."""
+        return {
+            "description": self.description,
+            "ip": self.ip,
+            "mask": self.mask,
+            "vlan": self.vlan,
+            "mode": self.mode,
+            "status": self.status,
+            "protocol": self.protocol,
+            "shutdown": self.shutdown,
+        }
+
+    def __repr__(self):
+        return f"Interface({self.name!r}, ip={self.ip!r}, status={self.status!r})"
+
+
+# ---------------------------------------------------------------
+# VLAN
+# ---------------------------------------------------------------
+class Vlan:
+    __slots__ = ("id", "name", "status")
+
+    def __init__(self, id, name=None, status=None):
+        self.id = intern(str(id))
+        self.name = _intern(name)
+        self.status = _intern(status)
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "status": self.status}
+
+    def __repr__(self):
+        return f"Vlan({self.id!r}, name={self.name!r})"
+
+
+# ---------------------------------------------------------------
+# CDP / LLDP neighbor
+# ---------------------------------------------------------------
+class Neighbor:
+    __slots__ = ("device", "local_port", "remote_port", "protocol")
+
+    def __init__(self, device, local_port=None, remote_port=None, protocol="cdp"):
+        self.device = intern(device)
+        self.local_port = _intern(local_port)
+        self.remote_port = _intern(remote_port)
+        self.protocol = _intern(protocol)
+
+    def to_dict(self) -> dict:
+        """Shape topology_engine expects for parsed["cdp_neighbors"][local_port]."""
+        return {"device": self.device, "port": self.remote_port}
+
+    def __repr__(self):
+        return f"Neighbor({self.device!r}, {self.local_port!r} -> {self.remote_port!r})"
+
+
+# ---------------------------------------------------------------
+# Device
+# ---------------------------------------------------------------
+def _columns(tables: dict) -> dict:
+    """Show tables with every column as a tuple of interned values."""
+    return {
+        command: {k: _interned_column(v) for k, v in table.items()}
+        for command, table in tables.items()
+    }
+
+
+def _interned_column(values):
+    return tuple(_intern(v) for v in values) if isinstance(values, list) else _intern(values)
+
+
+def _lists(tables: dict) -> dict:
+    return {
+        command: {k: list(v) if isinstance(v, tuple) else v for k, v in table.items()}
+        for command, table in tables.items()
+    }
+
+
+class Device:
+    """
+    One parsed device, holding each parse_config() field once: the
+    legacy lists as interned tuples and show tables column by column.
+    The structured show fields (interfaces dict, cdp_neighbors,
+    version, vlan_names) are rebuilt from those columns on demand.
+    `interfaces` is only set for a dict of interfaces that did not come
+    from a show table.
+    """
+
+    __slots__ = (
+        "hostname", "interface_refs", "vlan_refs", "neighbor_refs",
+        "ospf", "bgp", "acls", "raw", "stanza_index", "show",
+        "interfaces",
+    )
+
+    def __init__(self, hostname, interface_refs=(), vlan_refs=(), neighbor_refs=(),
+                 ospf=(), bgp=(), acls=(), raw=None, stanza_index=None, show=None,
+                 interfaces=None):
+        self.hostname = intern(hostname)
+        self.interface_refs = None if interface_refs is None else _interned(interface_refs)
+        self.vlan_refs = _interned(vlan_refs)
+        self.neighbor_refs = _interned(neighbor_refs)
+        self.ospf = _interned(ospf)
+        self.bgp = _interned(bgp)
+        self.acls = _interned(acls)
+        self.raw = raw
+        self.stanza_index = stanza_index
+        self.show = None if show is None else _columns(show)
+        self.interfaces = interfaces or None
+
+    # -----------------------------------------------------------
+    # Legacy dict <-> Device
+    # -----------------------------------------------------------
+    @classmethod
+    def from_parsed(cls, parsed: dict) -> "Device":
+        """
+        Build a Device from a parse_config() dict. A dict of interfaces
+        comes from the show tables and is not stored again; any other
+        dict is kept as Interface objects.
+        """
+
+        interface_refs = parsed.get("interfaces", [])
+        interfaces = None
+        if isinstance(interface_refs, dict):
+            if "ip interface brief" not in parsed.get("show", {}):
+                interfaces = {
+                    intern(name): Interface(name, **{
+                        k: v for k, v in info.items() if k in Interface.__slots__
+                    })
+                    for name, info in interface_refs.items()
+                }
+            interface_refs = None
+
+        return cls(
+            parsed.get("hostname", "UnknownDevice"),
+            interface_refs=interface_refs,
+            vlan_refs=parsed.get("vlans", []),
+            neighbor_refs=parsed.get("neighbors", []),
+            ospf=parsed.get("ospf", []),
+            bgp=parsed.get("bgp", []),
+            acls=parsed.get("acls", []),
+            raw=parsed.get("raw"),
+            stanza_index=parsed.get("stanza_index"),
+            show=parsed.get("show"),
+            interfaces=interfaces,
+        )
+
+    def to_dict(self) -> dict:
+        """Legacy parse_config() dict, equal to what the parser returned."""
+        fields = show_fields(self.show) if self.show is not None else {}
+        shown = fields.pop("interfaces", None)
+
+        if self.interface_refs is not None:
+            interfaces = list(self.interface_refs)
+        else:
+            interfaces = shown or self.interface_table()
+
+        parsed = {
+            "hostname": self.hostname,
+            "interfaces": interfaces,
+            "vlans": list(self.vlan_refs),
+            "ospf": list(self.ospf),
+            "bgp": list(self.bgp),
+            "acls": list(self.acls),
+            "neighbors": list(self.neighbor_refs),
+        }
+        if self.raw is not None:
+            parsed["raw"] = self.raw
+        if self.show is not None:
+            parsed["show"] = _lists(self.show)
+            parsed.update(fields)
+        # Last, where stanza_index(parsed) adds it
+        if self.stanza_index is not None:
+            parsed["stanza_index"] = self.stanza_index
+        return parsed
+
+    # -----------------------------------------------------------
+    # Structured views
+    # -----------------------------------------------------------
+    def interface_table(self) -> dict:
+        """{name: {...}} view used by audit_engine / security_engine / report."""
+        if self.show is not None and "ip interface brief" in self.show:
+            return show_fields({"ip interface brief": self.show["ip interface brief"]})["interfaces"]
+        return {name: intf.to_dict() for name, intf in (self.interfaces or {}).items()}
+
+    def neighbor_list(self) -> list:
+        """Neighbor objects from the `show cdp / lldp neighbors` tables."""
+        neighbors = []
+        for protocol in ("cdp", "lldp"):
+            rows = (self.show or {}).get(f"{protocol} neighbors")
+            if rows:
+                neighbors += map(Neighbor, rows["device"], rows["local_port"], rows["remote_port"],
+                                 [protocol] * len(rows["device"]))
+        return neighbors
+
+    def neighbor_table(self) -> dict:
+        """{local_port: {"device", "port"}} view used by topology_engine."""
+        table = {}
+        for n in self.neighbor_list():
+            table.setdefault(n.local_port, n.to_dict())
+        return table
+
+    def vlan_table(self) -> dict:
+        """{id: Vlan} for every VLAN id, named from `show vlan brief`."""
+        rows = (self.show or {}).get("vlan brief")
+        shown = dict(zip(rows["vlan"], zip(rows["name"], rows["status"]))) if rows else {}
+        return {vid: Vlan(vid, *shown.get(vid, ())) for vid in self.vlan_refs}
+
+    def __repr__(self):
+        interfaces = len(self.interface_refs or ()) or len(self.interface_table())
+        return (
+            f"Device({self.hostname!r}, interfaces={interfaces}, "
+            f"vlans={len(self.vlan_refs)}, neighbors={len(self.neighbor_refs)})"
+        )
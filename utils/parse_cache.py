@@ -0,0 +1,78 @@
+# ===============================================================
+#  NetDoc AI — CONTENT-ADDRESSED PARSE CACHE
+#  Memory LRU → shared disk store → parse_config()
+# ===============================================================
+
+import hashlib
+import json
+import os
+import tempfile
+from itertools import filterfalse
+from operator import methodcaller
+
+from utils.cache import DiskStore, LRUCache, TieredCache
+from utils.parser import PARSER_VERSION, parse_config
+
+
+CACHE_DIR = os.getenv(
+    "NETDOC_CACHE_DIR", os.path.join(tempfile.gettempdir(), "netdoc-cache")
+)
+PARSE_CACHE_ENTRIES = int(os.getenv("NETDOC_PARSE_CACHE_ENTRIES", "256"))
+PARSE_MEMORY_MB = int(os.getenv("NETDOC_PARSE_MEMORY_MB", "128"))
+PARSE_CACHE_MB = int(os.getenv("NETDOC_PARSE_CACHE_MB", "512"))
+
+_is_comment = methodcaller("startswith", ("!", "#"))
+
+# Parsed dicts in memory (bounded by their JSON size), JSON on disk
+_cache = TieredCache(
+    LRUCache(PARSE_CACHE_ENTRIES, PARSE_MEMORY_MB * 1024 * 1024),
+    DiskStore(os.path.join(CACHE_DIR, "parse"), PARSE_CACHE_MB * 1024 * 1024),
+    encode=json.dumps,
+    decode=json.loads,
+)
+
+
+# ---------------------------------------------------------------
+# Cache key
+# ---------------------------------------------------------------
+def canonicalize(text: str) -> str:
+    """Same normalization as clean_config(), done with C-level iterators."""
+    lines = map(str.rstrip, text.splitlines())
+    return "\n".join(filterfalse(_is_comment, filter(None, lines)))
+
+
+def config_hash(text: str) -> str:
+    """SHA-256 of the canonical config; whitespace/comment edits hash the same."""
+    canonical = canonicalize(text).encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def cache_key(text: str) -> str:
+    return f"{config_hash(text)}-p{PARSER_VERSION}"
+
+
+# ---------------------------------------------------------------
+# Cached parse
+# ---------------------------------------------------------------
+def parse_config_cached(text: str) -> dict:
+    """
+    Drop-in replacement for parse_config(). Callers get a shallow copy
+    of the cached dict, so stanza_index() adding the index to it never
+    grows the entry past the size it was accounted at.
+    """
+
+    key = cache_key(text)
+
+    hit = _cache.get(key)
+    if hit is None:
+        hit = parse_config(text)
+        _cache.put(key, hit)
+    return dict(hit)
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def clear_memory_cache():
+    _cache.memory.clear()
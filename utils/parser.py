@@ -3,36 +3,233 @@
 # ===============================================================
 
 import re
+from itertools import chain
+
+import numpy as np
+
+from utils.models import Device
+from utils.show_parser import ShowSections, is_show_output, merge_show_tables
+
+# Bump whenever parse_config output changes shape or content, so cached
+# results from older parsers are never served (see utils/parse_cache.py).
+PARSER_VERSION = "6"
+
+
+# ---------------------------------------------------------------
+# Precompiled field patterns (shared by the helpers + parse_config)
+# ---------------------------------------------------------------
+HOSTNAME_RE = re.compile(r"hostname (\S+)")
+VLAN_RE = re.compile(r"vlan (\d+)")
+INTERFACE_RE = re.compile(r"interface (\S+)")
+OSPF_RE = re.compile(r"router ospf (\d+)")
+BGP_RE = re.compile(r"router bgp (\d+)")
+ACL_RE = re.compile(r"access-list (\S+)")
+NAMED_ACL_RE = re.compile(r"ip access-list (\S+)")
+CDP_NEIGHBOR_RE = re.compile(r"cdp neighbor (\S+)")
+LLDP_NEIGHBOR_RE = re.compile(r"lldp neighbor (\S+)")
+NEIGHBOR_RE = re.compile(r"neighbor (\S+)")
+
+# Keyword gates + patterns used by _collect(), in str and bytes flavours.
+# The bytes set lets utils/ingest.py scan memory-mapped files directly
+# and decode only the fields it extracts.
+_KEYWORDS = ("hostname ", "interface ", "vlan ", "router ", "access-list ", "neighbor ")
+_PATTERNS = (
+    HOSTNAME_RE, INTERFACE_RE, VLAN_RE, OSPF_RE, BGP_RE, ACL_RE,
+    NAMED_ACL_RE, CDP_NEIGHBOR_RE, LLDP_NEIGHBOR_RE, NEIGHBOR_RE,
+)
+_TEXT_SYNTAX = (_KEYWORDS, _PATTERNS)
+_BYTES_SYNTAX = (
+    tuple(k.encode() for k in _KEYWORDS),
+    tuple(re.compile(p.pattern.encode()) for p in _PATTERNS),
+)
 
 
 # ---------------------------------------------------------------
 # Clean config text
 # ---------------------------------------------------------------
 def clean_config(text: str) -> str:
-    lines = text.splitlines()
+    # Skip empty & noisy (! / # comment) lines
+    return "\n".join([line for line in map(str.rstrip, text.splitlines()) if line and line[0] not in "!#"])
+
+
+# ---------------------------------------------------------------
+# Stanza blocks (streaming tokenizer)
+# ---------------------------------------------------------------
+class Stanza:
+    """
+    One top-level config line plus the indented lines under it, e.g.
+    `interface Gi1/0/1` with its `switchport ...` lines.
+    """
+
+    __slots__ = ("line", "lines")
+
+    def __init__(self, line: str, lines: list = None):
+        self.line = line
+        self.lines = lines if lines is not None else []
+
+    def __repr__(self):
+        return f"Stanza({self.line!r}, lines={len(self.lines)})"
+
+
+def iter_stanzas(lines, binary: bool = False):
+    """
+    Single-pass tokenizer: turns an iterable of raw config lines into
+    top-level stanzas. Blank lines and `!` / `#` comments are dropped
+    exactly like clean_config(). Each stanza is yielded as soon as the
+    next top-level line starts, so callers only hold one block at a time.
+
+    binary=True accepts bytes lines (indexing bytes yields ints).
+    """
+
+    bang, hash_, space, tab = (33, 35, 32, 9) if binary else ("!", "#", " ", "\t")
+    top = None
 
-    cleaned = []
     for line in lines:
         line = line.rstrip()
 
-        # Skip empty & noisy lines
         if not line:
             continue
-        if line.startswith("!"):
+        first = line[0]
+        if first == bang or first == hash_:
             continue
-        if line.startswith("#"):
+
+        if top is not None and (first == space or first == tab):
+            top.lines.append(line)
             continue
 
-        cleaned.append(line)
+        if top is not None:
+            yield top
+        top = Stanza(line)
+
+    if top is not None:
+        yield top
+
+
+# ---------------------------------------------------------------
+# Stanza index: (kind, name) -> offsets into parsed["raw"]
+# ---------------------------------------------------------------
+# Top-level commands whose stanzas are indexed. Anything else (including
+# the bulk of `show` output in a show-tech) is skipped so the index stays
+# proportional to the config sections audit rules actually look at.
+INDEXED_KINDS = {
+    "interface", "line", "router", "vlan", "access-list", "aaa",
+    "username", "enable", "spanning-tree", "cdp", "lldp", "logging",
+    "snmp-server", "ntp", "tacacs-server", "radius-server", "banner",
+}
+
+
+def stanza_key(line: str):
+    """
+    Classify a top-level config line as (kind, name), e.g.
+      interface Gi1/0/1               -> ("interface", "Gi1/0/1")
+      line vty 0 4                    -> ("line", "vty 0 4")
+      ip access-list extended MGMT    -> ("ip access-list", "MGMT")
+      access-list 10 permit any       -> ("access-list", "10")
+      no cdp run                      -> ("cdp", "no run")
+    Returns None for lines that are not indexed.
+    """
+
+    head, _, rest = line.partition(" ")
+    negated = head == "no"
+    if negated:
+        head, _, rest = rest.partition(" ")
+
+    if head == "ip":
+        if not rest.startswith("access-list "):
+            return None
+        words = rest.split()
+        if len(words) > 2 and words[1] in ("standard", "extended"):
+            words = words[1:]
+        head = "ip access-list"
+        name = words[1] if len(words) > 1 else ""
+    elif head not in INDEXED_KINDS:
+        return None
+    elif head in ("interface", "line", "router", "vlan"):
+        name = rest.strip()
+    else:
+        name = rest.split(None, 1)[0] if rest.strip() else ""
+
+    if negated:
+        name = f"no {name}".rstrip()
+
+    return head, name
+
+
+def _index_add(index: dict, key: tuple, start: int, end: int):
+    """Ranges are stored flat per name: [start0, end0, start1, end1, ...]."""
+    kind, name = key
+    names = index.get(kind)
+    if names is None:
+        names = index[kind] = {}
+    ranges = names.get(name)
+    if ranges is None:
+        names[name] = [start, end]
+        return
+
+    # Consecutive one-line stanzas (numbered ACL entries, aaa lines)
+    # collapse into a single range.
+    if ranges[-1] + 1 == start:
+        ranges[-1] = end
+    else:
+        ranges += (start, end)
 
-    return "\n".join(cleaned)
+
+def _pairs(flat: list) -> list:
+    return [(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+
+
+def stanza_index(parsed: dict) -> dict:
+    """
+    parsed["stanza_index"], built from parsed["raw"] on first use and
+    kept in `parsed` ({} when raw was not kept).
+    """
+
+    index = parsed.get("stanza_index")
+    if index is None:
+        index = _stanza_index(parsed.get("raw") or "")
+        if "raw" in parsed:
+            parsed["stanza_index"] = index
+    return index
+
+
+def section_ranges(parsed: dict, kind: str, name: str = None) -> list:
+    """[start, end) offsets into parsed["raw"] for one stanza kind (and name)."""
+    sections = stanza_index(parsed).get(kind, {})
+
+    if name is not None:
+        return _pairs(sections.get(name, []))
+
+    return [r for flat in sections.values() for r in _pairs(flat)]
+
+
+def iter_sections(parsed: dict, kind: str):
+    """Yield (name, text) for every indexed stanza of `kind`."""
+    raw = parsed.get("raw", "")
+
+    for name, flat in stanza_index(parsed).get(kind, {}).items():
+        yield name, "\n".join(raw[start:end] for start, end in _pairs(flat))
+
+
+def section_text(parsed: dict, kind: str, name: str = None) -> str:
+    """Text of the matching stanzas only, so rules need not scan all of raw."""
+    raw = parsed.get("raw", "")
+    return "\n".join(raw[start:end] for start, end in section_ranges(parsed, kind, name))
+
+
+def interface_table(parsed: dict) -> dict:
+    """
+    {name: {status, protocol, ip, ...}} from `show` bundles. Plain configs
+    only carry a list of interface names, which yields {}.
+    """
+    interfaces = parsed.get("interfaces", {})
+    return interfaces if isinstance(interfaces, dict) else {}
 
 
 # ---------------------------------------------------------------
 # Extract hostname
 # ---------------------------------------------------------------
 def extract_hostname(text: str) -> str:
-    match = re.search(r"hostname (\S+)", text)
+    match = HOSTNAME_RE.search(text)
     return match.group(1) if match else "UnknownDevice"
 
 
@@ -40,14 +237,14 @@ def extract_hostname(text: str) -> str:
 # Extract VLANs
 # ---------------------------------------------------------------
 def extract_vlans(text: str) -> list:
-    return re.findall(r"vlan (\d+)", text)
+    return VLAN_RE.findall(text)
 
 
 # ---------------------------------------------------------------
 # Extract interfaces
 # ---------------------------------------------------------------
 def extract_interfaces(text: str) -> list:
-    matches = re.findall(r"interface (\S+)", text)
+    matches = INTERFACE_RE.findall(text)
     return matches
 
 
@@ -55,34 +252,297 @@ def extract_interfaces(text: str) -> list:
 # Extract OSPF process IDs
 # ---------------------------------------------------------------
 def extract_ospf(text: str) -> list:
-    return re.findall(r"router ospf (\d+)", text)
+    return OSPF_RE.findall(text)
 
 
 # ---------------------------------------------------------------
 # Extract BGP AS numbers
 # ---------------------------------------------------------------
 def extract_bgp(text: str) -> list:
-    return re.findall(r"router bgp (\d+)", text)
+    return BGP_RE.findall(text)
 
 
 # ---------------------------------------------------------------
 # Extract ACL names / numbers
 # ---------------------------------------------------------------
 def extract_acls(text: str) -> list:
-    acl1 = re.findall(r"access-list (\S+)", text)
-    acl2 = re.findall(r"ip access-list (\S+)", text)
-    return list(set(acl1 + acl2))
+    acl1 = ACL_RE.findall(text)
+    acl2 = NAMED_ACL_RE.findall(text)
+    return list(dict.fromkeys(acl1 + acl2))
 
 
 # ---------------------------------------------------------------
 # Extract CDP / LLDP neighbors
 # ---------------------------------------------------------------
 def extract_neighbors(text: str) -> list:
-    cdp = re.findall(r"cdp neighbor (\S+)", text)
-    lldp = re.findall(r"lldp neighbor (\S+)", text)
-    generic = re.findall(r"neighbor (\S+)", text)
+    cdp = CDP_NEIGHBOR_RE.findall(text)
+    lldp = LLDP_NEIGHBOR_RE.findall(text)
+    generic = NEIGHBOR_RE.findall(text)
 
-    return list(set(cdp + lldp + generic))
+    return list(dict.fromkeys(cdp + lldp + generic))
+
+
+# ---------------------------------------------------------------
+# Single traversal over the stanzas (streams, show bundles, bytes)
+# ---------------------------------------------------------------
+def _decode_all(values: list) -> list:
+    return [v.decode("utf-8", errors="replace") for v in values]
+
+
+def _collect(stanzas, keep_raw: bool = True, binary: bool = False) -> dict:
+    """
+    Fill every parsed field in one walk over the stanzas. Each pattern
+    only runs on stanzas that contain its keyword, and none of them can
+    match across a newline, so the result is identical to running the
+    extract_* helpers over the whole cleaned text.
+
+    With keep_raw=False no cleaned copy of the config is kept, so memory
+    stays bounded by the largest single stanza. Like parse_config(), the
+    stanza index is left to stanza_index().
+
+    binary=True walks bytes stanzas and decodes only the extracted
+    fields; raw is not available in that mode.
+    """
+
+    (
+        (kw_hostname, kw_interface, kw_vlan, kw_router, kw_acl, kw_neighbor),
+        (hostname_re, interface_re, vlan_re, ospf_re, bgp_re, acl_re,
+         named_acl_re, cdp_re, lldp_re, neighbor_re),
+    ) = _BYTES_SYNTAX if binary else _TEXT_SYNTAX
+    newline = b"\n" if binary else "\n"
+    keep_raw = keep_raw and not binary
+
+    hostname = None
+    interfaces, vlans, ospf, bgp = [], [], [], []
+    acls, named_acls = [], []
+    cdp, lldp, generic = [], [], []
+    cleaned = []
+
+    for stanza in stanzas:
+        if keep_raw:
+            cleaned.append(stanza.line)
+            cleaned += stanza.lines
+
+        # Patterns never span a newline, so one findall over the joined
+        # stanza gives the same matches, in order, as one per line.
+        block = newline.join((stanza.line, *stanza.lines)) if stanza.lines else stanza.line
+
+        if hostname is None and kw_hostname in block:
+            match = hostname_re.search(block)
+            if match:
+                hostname = match.group(1)
+
+        if kw_interface in block:
+            interfaces += interface_re.findall(block)
+
+        if kw_vlan in block:
+            vlans += vlan_re.findall(block)
+
+        if kw_router in block:
+            ospf += ospf_re.findall(block)
+            bgp += bgp_re.findall(block)
+
+        if kw_acl in block:
+            acls += acl_re.findall(block)
+            named_acls += named_acl_re.findall(block)
+
+        if kw_neighbor in block:
+            cdp += cdp_re.findall(block)
+            lldp += lldp_re.findall(block)
+            generic += neighbor_re.findall(block)
+
+    if binary:
+        if hostname is not None:
+            hostname = hostname.decode("utf-8", errors="replace")
+        interfaces, vlans, ospf, bgp = map(_decode_all, (interfaces, vlans, ospf, bgp))
+        acls, named_acls = _decode_all(acls), _decode_all(named_acls)
+        cdp, lldp, generic = _decode_all(cdp), _decode_all(lldp), _decode_all(generic)
+
+    parsed = {
+        "hostname": hostname or "UnknownDevice",
+        "interfaces": interfaces,
+        "vlans": vlans,
+        "ospf": ospf,
+        "bgp": bgp,
+        "acls": list(dict.fromkeys(acls + named_acls)),
+        "neighbors": list(dict.fromkeys(cdp + lldp + generic)),
+    }
+
+    if keep_raw:
+        parsed["raw"] = "\n".join(cleaned)
+
+    return parsed
+
+
+def _parse_lines(lines, keep_raw: bool = True) -> dict:
+    """
+    Shared driver for every entrypoint. If the first meaningful line is a
+    `show ...` header the lines are also routed through the show-section
+    splitter (same single pass) and its tables are merged into the result.
+    """
+
+    lines = iter(lines)
+    head = []
+    for line in lines:
+        head.append(line)
+        if line.strip() and line[0] not in "!#":
+            break
+    lines = chain(head, lines)
+
+    sections = None
+    if head and is_show_output(head[-1]):
+        sections = ShowSections()
+        lines = sections.tap(lines)
+
+    parsed = _collect(iter_stanzas(lines), keep_raw=keep_raw)
+
+    if sections is not None:
+        merge_show_tables(parsed, sections)
+
+    return parsed
+
+
+# ---------------------------------------------------------------
+# Whole-text fast path (parse_config on a plain config string)
+# ---------------------------------------------------------------
+# Kinds whose stanza name is the rest of the line (see stanza_key);
+# they make up the bulk of a config and are classified with numpy.
+_LINE_NAMED = ("interface", "line", "router", "vlan")
+_HEAD_WIDTH = max(map(len, _LINE_NAMED)) + 1
+
+
+def _char_codes(text: str) -> np.ndarray:
+    if text.isascii():
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+
+
+def _clean_ascii(text: str):
+    """
+    clean_config() with numpy, for ASCII text. None when the text holds
+    trailing blanks or control characters other than tab and newline,
+    which splitlines() / rstrip() treat specially.
+    """
+
+    if not text.isascii():
+        return None
+
+    data = text.encode("ascii") + b"\n"
+    codes = np.frombuffer(data, dtype=np.uint8)
+    breaks = np.flatnonzero(codes == 10)
+    if np.count_nonzero(codes < 32) != len(breaks) + data.count(b"\t"):
+        return None
+
+    heads = np.concatenate(([0], breaks[:-1] + 1))
+    lengths = breaks - heads
+    filled = lengths > 0
+    last = codes[breaks - 1]
+    if np.any(filled & ((last == 32) | (last == 9))):
+        return None
+
+    first = codes[heads]
+    keep = filled & (first != 33) & (first != 35)
+
+    # Every kept line with its newline, minus the final one: "\n".join()
+    return codes[np.repeat(keep, lengths + 1)][:-1].tobytes().decode("ascii")
+
+
+def _stanza_index(raw: str) -> dict:
+    """
+    {kind: {name: [start, end, ...]}} for cleaned text: top-level lines
+    are picked out with numpy, and only lines outside _LINE_NAMED go
+    through stanza_key() one by one. A kind whose names are all distinct
+    is stored in one step; repeated names fall back to _index_add() in
+    config order, so consecutive ranges still merge.
+    """
+
+    if not raw:
+        return {}
+
+    codes = _char_codes(raw + "\n")
+    breaks = np.flatnonzero(codes == 10)
+    starts = np.concatenate(([0], breaks[:-1] + 1))
+    lengths = breaks - starts
+
+    first = codes[starts]
+    top = (first != 32) & (first != 9)
+    top[0] = True  # an indented first line still opens a stanza
+    starts, lengths = starts[top], lengths[top]
+    stanza_ends = np.append(starts[1:] - 1, len(raw))
+
+    # Leading characters of each top-level line. A kind never spells a
+    # newline, so reading on into the next line cannot fake a match.
+    head = codes[np.minimum(starts[:, None] + np.arange(_HEAD_WIDTH), len(codes) - 1)]
+    kind_of = np.full(len(starts), -1)
+    for k, kind in enumerate(_LINE_NAMED):
+        word = np.array([ord(c) for c in kind])
+        follow = head[:, len(kind)]
+        kind_of[(head[:, :len(kind)] == word).all(axis=1) & ((follow == 32) | (follow == 10))] = k
+
+    line_ends = (starts + lengths).tolist()
+    starts, stanza_ends = starts.tolist(), stanza_ends.tolist()
+    entries = {}  # kind -> ([position], [name]) in config order
+    for k, kind in enumerate(_LINE_NAMED):
+        picked = np.flatnonzero(kind_of == k).tolist()
+        if picked:
+            skip = len(kind) + 1
+            entries[kind] = (picked, [raw[starts[i] + skip:line_ends[i]].strip() for i in picked])
+
+    # Everything else (no ..., ip access-list, aaa, username ...), one by one
+    for i in np.flatnonzero(kind_of < 0).tolist():
+        key = stanza_key(raw[starts[i]:line_ends[i]])
+        if key is not None:
+            positions, names = entries.setdefault(key[0], ([], []))
+            positions.append(i)
+            names.append(key[1])
+
+    index = {}
+    for kind, (positions, names) in sorted(entries.items(), key=lambda item: min(item[1][0])):
+        if positions != sorted(positions):
+            positions, names = map(list, zip(*sorted(zip(positions, names))))
+        ranges = dict(zip(names, ([starts[i], stanza_ends[i]] for i in positions)))
+        if len(ranges) == len(names):
+            index[kind] = ranges
+            continue
+        for i, name in zip(positions, names):
+            _index_add(index, (kind, name), starts[i], stanza_ends[i])
+
+    return index
+
+
+def _parse_text(text: str) -> dict:
+    """
+    parse_config() for a plain config: clean once and run each field
+    pattern over the whole cleaned text, as the original parser did.
+    That is faster here than the per-stanza walk of _collect(), which
+    is kept for streams, bytes and show bundles (they go through
+    _parse_lines() for the table merge).
+    """
+
+    raw = _clean_ascii(text)
+    if raw is None:
+        raw = clean_config(text)
+    if raw and is_show_output(raw.partition("\n")[0]):
+        return _parse_lines(text.splitlines())
+
+    hostname = HOSTNAME_RE.search(raw)
+    # `ip access-list X` always contains `access-list X`, and a CDP / LLDP
+    # neighbor line always contains `neighbor X`: those patterns only
+    # decide the order of the de-duplicated lists, so they run when present.
+    named_acls = NAMED_ACL_RE.findall(raw) if "ip access-list " in raw else []
+    cdp = CDP_NEIGHBOR_RE.findall(raw) if "cdp neighbor " in raw else []
+    lldp = LLDP_NEIGHBOR_RE.findall(raw) if "lldp neighbor " in raw else []
+
+    return {
+        "hostname": hostname.group(1) if hostname else "UnknownDevice",
+        "interfaces": INTERFACE_RE.findall(raw),
+        "vlans": VLAN_RE.findall(raw),
+        "ospf": OSPF_RE.findall(raw),
+        "bgp": BGP_RE.findall(raw),
+        "acls": list(dict.fromkeys(ACL_RE.findall(raw) + named_acls)),
+        "neighbors": list(dict.fromkeys(cdp + lldp + NEIGHBOR_RE.findall(raw))),
+        "raw": raw,
+    }
 
 
 # ---------------------------------------------------------------
@@ -92,19 +552,67 @@ def parse_config(text: str) -> dict:
     """
     Main parser used by ALL modules.
     Returns normalized structured config data.
+
+    For `show` command bundles (show version / vlan brief / ip interface
+    brief / cdp neighbors ...) `interfaces` is a dict of per-interface
+    status and `cdp_neighbors`, `version` and the columnar `show` tables
+    are filled in as well.
+
+    The stanza index only audits read is not built here: call
+    stanza_index(parsed) where it is needed.
     """
 
-    cleaned = clean_config(text)
+    return _parse_text(text)
 
-    parsed = {
-        "hostname": extract_hostname(cleaned),
-        "interfaces": extract_interfaces(cleaned),
-        "vlans": extract_vlans(cleaned),
-        "ospf": extract_ospf(cleaned),
-        "bgp": extract_bgp(cleaned),
-        "acls": extract_acls(cleaned),
-        "neighbors": extract_neighbors(cleaned),
-        "raw": cleaned
-    }
 
-    return parsed
+# ---------------------------------------------------------------
+# STREAMING PARSE ENTRYPOINT (file objects / line iterators)
+# ---------------------------------------------------------------
+def _text_lines(source):
+    """Return str lines from a text/binary file object or any line iterable."""
+    lines = iter(source)
+    first = next(lines, None)
+
+    if first is None:
+        return iter(())
+
+    lines = chain((first,), lines)
+    if isinstance(first, bytes):
+        return (line.decode("utf-8", errors="ignore") for line in lines)
+
+    return lines
+
+
+def parse_config_stream(source, keep_raw: bool = False) -> dict:
+    """
+    Parse a config from a file object (text or binary) or an iterable of
+    lines without ever loading the whole upload into memory.
+
+    Returns the same dict as parse_config(). `raw` is only included when
+    keep_raw=True, since it is a full copy of the cleaned config.
+    """
+
+    return _parse_lines(_text_lines(source), keep_raw=keep_raw)
+
+
+def parse_config_binary(lines) -> dict:
+    """
+    Parse an iterable of bytes lines (e.g. a memory-mapped file) without
+    decoding them; only the extracted field values are decoded. Plain
+    configs only: no raw, stanza index or show-table merge.
+    """
+
+    return _collect(iter_stanzas(lines, binary=True), binary=True)
+
+
+# ---------------------------------------------------------------
+# TYPED ENTRYPOINT (utils.models.Device)
+# ---------------------------------------------------------------
+def parse_device(source, keep_raw: bool = False) -> Device:
+    """
+    parse_config_stream() into a compact Device, for holding many
+    parsed devices at once (see utils.batch). Device.to_dict() gives
+    the dict back.
+    """
+
+    return Device.from_parsed(parse_config_stream(source, keep_raw=keep_raw))
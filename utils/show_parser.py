@@ -0,0 +1,340 @@
+# ===============================================================
+#  NetDoc AI — SHOW COMMAND OUTPUT PARSER
+#  Splits `show ...` bundles / show-tech dumps into sections and
+#  hands each one to a precompiled table parser (columnar rows).
+# ===============================================================
+
+import re
+
+
+# ---------------------------------------------------------------
+# Section headers
+#   show version
+#   SW1#sh ip int br
+#   ------------------ show cdp neighbors ------------------
+# ---------------------------------------------------------------
+HEADER_RE = re.compile(
+    r"^-*\s*(?:([A-Za-z0-9][\w.\-]*)[#>]\s*)?sh(?:o|ow)?\s+(\S.*?)\s*-*$"
+)
+
+KNOWN_COMMANDS = (
+    ("version",),
+    ("vlan", "brief"),
+    ("ip", "interface", "brief"),
+    ("cdp", "neighbors"),
+    ("lldp", "neighbors"),
+    ("running-config",),
+    ("startup-config",),
+)
+
+
+def canonical_command(command: str) -> str:
+    """Expand IOS abbreviations: 'ip int br' -> 'ip interface brief'."""
+    words = command.lower().split()
+
+    for known in KNOWN_COMMANDS:
+        if len(words) == len(known) and all(k.startswith(w) for w, k in zip(words, known)):
+            return " ".join(known)
+
+    return " ".join(words)
+
+
+def match_header(line: str):
+    """Return (prompt_hostname, canonical command) for a show header line, else None."""
+    if "sh" not in line:
+        return None
+
+    match = HEADER_RE.match(line)
+    if not match:
+        return None
+
+    return match.group(1), canonical_command(match.group(2))
+
+
+def is_show_output(line: str) -> bool:
+    """True when the first meaningful line of an upload is a show header."""
+    return match_header(line.strip()) is not None
+
+
+# ---------------------------------------------------------------
+# Interface name expansion (Gig1/0/1 -> GigabitEthernet1/0/1)
+# ---------------------------------------------------------------
+INTERFACE_TYPES = (
+    "GigabitEthernet", "FastEthernet", "TenGigabitEthernet",
+    "TwentyFiveGigE", "FortyGigabitEthernet", "HundredGigE",
+    "Ethernet", "Port-channel", "Vlan", "Loopback", "Tunnel",
+    "Serial", "mgmt",
+)
+
+_INTF_SPLIT_RE = re.compile(r"^([A-Za-z][A-Za-z\-]*)\s*(\d.*)$")
+
+
+def expand_interface(name: str) -> str:
+    match = _INTF_SPLIT_RE.match(name.strip())
+    if not match:
+        return name
+
+    prefix, number = match.groups()
+    lowered = prefix.lower()
+
+    for full in INTERFACE_TYPES:
+        if full.lower().startswith(lowered):
+            return full + number
+
+    return prefix + number
+
+
+# ---------------------------------------------------------------
+# Table parsers — one per command, fed line by line
+# ---------------------------------------------------------------
+class TableParser:
+    """Columnar rows: {column: [values...]}, one list per column."""
+
+    columns = ()
+    row_re = None
+
+    def __init__(self):
+        self.rows = {c: [] for c in self.columns}
+
+    def feed(self, line: str):
+        match = self.row_re.match(line)
+        if match:
+            self.add_row(match.groups())
+
+    def add_row(self, values):
+        for column, value in zip(self.columns, values):
+            self.rows[column].append(value)
+
+    def __len__(self):
+        return len(self.rows[self.columns[0]]) if self.columns else 0
+
+    def result(self):
+        return self.rows
+
+
+class VersionParser(TableParser):
+    """`show version` is key/value facts rather than a table."""
+
+    FACTS = (
+        ("os_version", re.compile(r"Version ([^,\s]+)")),
+        ("model", re.compile(r"Cisco IOS Software, (?:[^,]*?\s)?\(?([A-Z0-9][\w\-]+)\)?,")),
+        ("model", re.compile(r"^[Cc]isco (\S+) .*processor")),
+        ("serial", re.compile(r"(?:System serial number|Processor board ID)\s*:?\s*(\S+)")),
+        ("hostname", re.compile(r"^(\S+) uptime is ")),
+    )
+
+    def __init__(self):
+        self.facts = {}
+
+    def feed(self, line: str):
+        for key, pattern in self.FACTS:
+            if key in self.facts:
+                continue
+            match = pattern.search(line)
+            if match:
+                self.facts[key] = match.group(1)
+
+    def __len__(self):
+        return len(self.facts)
+
+    def result(self):
+        return self.facts
+
+
+class VlanBriefParser(TableParser):
+    columns = ("vlan", "name", "status", "ports")
+    row_re = re.compile(r"^(\d+)\s+(\S+)\s+(active|act/\S+|suspended|sus/\S+)\s*(.*)$")
+    wrap_re = re.compile(r"^\s+(\S.*)$")
+
+    def feed(self, line: str):
+        match = self.row_re.match(line)
+        if match:
+            self.add_row(match.groups())
+            return
+
+        # Long port lists wrap onto indented continuation lines
+        wrapped = self.wrap_re.match(line)
+        if wrapped and len(self):
+            ports = self.rows["ports"]
+            ports[-1] = f"{ports[-1]}, {wrapped.group(1)}".strip(", ")
+
+
+class IpInterfaceBriefParser(TableParser):
+    columns = ("interface", "ip", "ok", "method", "status", "protocol")
+    row_re = re.compile(
+        r"^(\S+)\s+(\S+)\s+(?:(YES|NO)\s+(\S+)\s+)?"
+        r"(administratively down|up|down|deleted)\s+(up|down)\s*$"
+    )
+
+
+_IF = r"[A-Za-z][A-Za-z\-]*\s?\d+(?:/\d+)*(?:[.:]\d+)?"
+
+
+class NeighborsParser(TableParser):
+    """
+    `show cdp neighbors` / `show lldp neighbors`. Accepts the full IOS
+    layout (device, local intf, holdtime, capability, platform, port),
+    the LLDP layout, long device IDs wrapped onto their own line, and
+    the short three-column form collectors emit (device, local, port).
+    """
+
+    columns = ("device", "local_port", "remote_port")
+
+    cdp_re = re.compile(
+        rf"^(\S+)?\s+({_IF})\s+\d+\s+(?:[A-Za-z]\s+)*\S+\s+({_IF})\s*$"
+    )
+    lldp_re = re.compile(rf"^(\S+)\s+({_IF})\s+\d+\s+[A-Za-z,]*\s+(\S+)\s*$")
+    short_re = re.compile(rf"^(\S+)\s+({_IF})\s+({_IF})\s*$")
+    device_only_re = re.compile(r"^(\S+)$")
+
+    def __init__(self):
+        super().__init__()
+        self.pending_device = None
+
+    def feed(self, line: str):
+        for pattern in (self.cdp_re, self.lldp_re, self.short_re):
+            match = pattern.match(line)
+            if match:
+                device, local, remote = match.groups()
+                device = device or self.pending_device
+                self.pending_device = None
+                if device:
+                    self.add_row((device, expand_interface(local), expand_interface(remote)))
+                return
+
+        alone = self.device_only_re.match(line)
+        self.pending_device = alone.group(1) if alone else None
+
+
+TABLE_PARSERS = {
+    "version": VersionParser,
+    "vlan brief": VlanBriefParser,
+    "ip interface brief": IpInterfaceBriefParser,
+    "cdp neighbors": NeighborsParser,
+    "lldp neighbors": NeighborsParser,
+}
+
+
+# ---------------------------------------------------------------
+# Section splitter
+# ---------------------------------------------------------------
+class ShowSections:
+    """
+    Single-pass splitter. tap() passes every line straight through (so
+    the config tokenizer still sees the whole upload) while routing the
+    lines of each recognised `show` section to its table parser.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.prompt_hostname = None
+
+    def tap(self, lines):
+        current = None
+
+        for line in lines:
+            header = match_header(line) if "sh" in line else None
+
+            if header is not None:
+                prompt, command = header
+                if prompt and self.prompt_hostname is None:
+                    self.prompt_hostname = prompt
+
+                parser_cls = TABLE_PARSERS.get(command)
+                if parser_cls is None:
+                    current = None
+                else:
+                    current = self.tables.get(command)
+                    if current is None:
+                        current = self.tables[command] = parser_cls()
+            elif current is not None and line.strip():
+                current.feed(line.rstrip())
+
+            yield line
+
+    def results(self) -> dict:
+        return {command: table.result() for command, table in self.tables.items() if len(table)}
+
+
+# ---------------------------------------------------------------
+# Merge show tables into the parsed dict
+# ---------------------------------------------------------------
+def show_fields(tables: dict) -> dict:
+    """
+    The structured fields ShowSections.results() tables yield:
+    version, vlan_names, interfaces (as a dict) and cdp_neighbors,
+    each only when its table has rows.
+    """
+
+    fields = {}
+
+    version = tables.get("version", {})
+    if version:
+        fields["version"] = {k: v for k, v in version.items() if k != "hostname"}
+
+    vlan_rows = tables.get("vlan brief")
+    if vlan_rows:
+        fields["vlan_names"] = dict(zip(vlan_rows["vlan"], vlan_rows["name"]))
+
+    intf_rows = tables.get("ip interface brief")
+    if intf_rows:
+        interfaces = {}
+        for name, ip, method, status, protocol in zip(
+            intf_rows["interface"], intf_rows["ip"], intf_rows["method"],
+            intf_rows["status"], intf_rows["protocol"],
+        ):
+            vlan = name[4:] if name.lower().startswith("vlan") and name[4:].isdigit() else None
+            interfaces[name] = {
+                "ip": None if ip == "unassigned" else ip,
+                "method": method,
+                "status": status,
+                "protocol": protocol,
+                "vlan": vlan,
+            }
+        fields["interfaces"] = interfaces
+
+    neighbors = {}
+    for command in ("cdp neighbors", "lldp neighbors"):
+        rows = tables.get(command)
+        if not rows:
+            continue
+        for device, local, remote in zip(rows["device"], rows["local_port"], rows["remote_port"]):
+            neighbors.setdefault(local, {"device": device, "port": remote})
+    if neighbors:
+        fields["cdp_neighbors"] = neighbors
+
+    return fields
+
+
+def merge_show_tables(parsed: dict, sections: ShowSections) -> dict:
+    """
+    Fill the structured fields audit_engine / topology_engine / report
+    read: interfaces as a dict, cdp_neighbors, VLAN ids and version.
+    """
+
+    tables = sections.results()
+    parsed["show"] = tables
+    fields = show_fields(tables)
+
+    if "version" in fields:
+        parsed["version"] = fields["version"]
+
+    if parsed.get("hostname", "UnknownDevice") == "UnknownDevice":
+        version = tables.get("version", {})
+        parsed["hostname"] = sections.prompt_hostname or version.get("hostname", "UnknownDevice")
+
+    if "vlan_names" in fields:
+        parsed["vlans"] = list(dict.fromkeys(tables["vlan brief"]["vlan"] + parsed.get("vlans", [])))
+        parsed["vlan_names"] = fields["vlan_names"]
+
+    if "interfaces" in fields:
+        parsed["interfaces"] = fields["interfaces"]
+
+    neighbors = fields.get("cdp_neighbors")
+    if neighbors:
+        parsed["cdp_neighbors"] = neighbors
+        parsed["neighbors"] = list(dict.fromkeys(
+            [n["device"] for n in neighbors.values()] + parsed.get("neighbors", [])
+        ))
+
+    return parsed
@@ -0,0 +1,242 @@
+# ===============================================================
+#  NetDoc AI — TOPOLOGY ANALYTICS
+#  Paths, single points of failure and loop candidates over the
+#  CSR arrays of a utils.topology_graph.TopologyGraph.
+# ===============================================================
+
+import numpy as np
+
+
+# ---------------------------------------------------------------
+# Breadth-first search (level-synchronous, vectorised per level)
+# ---------------------------------------------------------------
+def _expand(indptr, indices, frontier):
+    """(neighbor, parent, CSR position) of every adjacency entry of the frontier."""
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return indices[:0], frontier[:0], frontier[:0]
+
+    # Gather indices[starts[k]:starts[k]+lengths[k]] for every k at once
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    positions = offsets + np.arange(total)
+    return indices[positions], np.repeat(frontier, lengths), positions
+
+
+def bfs(graph, source: str, target: str = None):
+    """
+    (dist, parent) arrays over node ids from `source`; -1 = unreached.
+    Stops after the level that reaches `target`, when given.
+    """
+
+    indptr, indices, _ = graph.csr()
+    n = len(graph.names)
+    dist = np.full(n, -1, dtype=np.int32)
+    parent = np.full(n, -1, dtype=np.int32)
+
+    start = graph.node_id(source)
+    if start is None:
+        return dist, parent
+    goal = graph.node_id(target) if target is not None else None
+
+    dist[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    level = 0
+    while len(frontier):
+        level += 1
+        nbrs, parents, _ = _expand(indptr, indices, frontier)
+        fresh = dist[nbrs] < 0
+        nbrs, parents = nbrs[fresh], parents[fresh]
+
+        # First parent wins for nodes reached twice in this level
+        nbrs, first = np.unique(nbrs, return_index=True)
+        dist[nbrs] = level
+        parent[nbrs] = parents[first]
+        if goal is not None and dist[goal] >= 0:
+            break
+        frontier = nbrs.astype(np.int64)
+
+    return dist, parent
+
+
+def shortest_path(graph, source: str, target: str):
+    """Fewest-hop device path [source, ..., target], or None if disconnected."""
+    goal = graph.node_id(target)
+    if goal is None or graph.node_id(source) is None:
+        return None
+
+    dist, parent = bfs(graph, source, target)
+    if dist[goal] < 0:
+        return None
+
+    path = [goal]
+    while parent[path[-1]] >= 0:
+        path.append(int(parent[path[-1]]))
+    return [graph.names[nid] for nid in reversed(path)]
+
+
+def hop_counts(graph, source: str) -> dict:
+    """{device: hops from source} for every reachable device."""
+    dist, _ = bfs(graph, source)
+    reached = np.flatnonzero(dist >= 0)
+    return dict(zip((graph.names[i] for i in reached.tolist()), dist[reached].tolist()))
+
+
+def components(graph) -> np.ndarray:
+    """labels[node_id] = component number (-1 for inactive node ids)."""
+    indptr, indices, _ = graph.csr()
+    labels = np.full(len(graph.names), -1, dtype=np.int32)
+    count = 0
+
+    for root in graph.nodes():
+        if labels[root] >= 0:
+            continue
+        labels[root] = count
+        frontier = np.array([root], dtype=np.int64)
+        while len(frontier):
+            nbrs, _, _ = _expand(indptr, indices, frontier)
+            nbrs = np.unique(nbrs[labels[nbrs] < 0])
+            labels[nbrs] = count
+            frontier = nbrs.astype(np.int64)
+        count += 1
+
+    return labels
+
+
+# ---------------------------------------------------------------
+# Single points of failure (iterative Tarjan low-link)
+# ---------------------------------------------------------------
+def cut_points(graph) -> dict:
+    """
+    {"articulation_points": [device], "bridges": [(device, device)]}.
+    Articulation points are devices whose loss splits the network;
+    bridges are links whose loss does. Parallel links between the same
+    pair are never bridges (the parent link is skipped by slot, not by
+    neighbor). Iterative, so 10^5-node chains do not hit the recursion
+    limit.
+    """
+
+    indptr, indices, slots = graph.csr()
+    indptr, indices, slots = indptr.tolist(), indices.tolist(), slots.tolist()
+    n = len(graph.names)
+
+    disc = [-1] * n
+    low = [0] * n
+    articulation = set()
+    bridges = []
+    clock = 0
+
+    for root in graph.nodes():
+        if disc[root] >= 0:
+            continue
+
+        disc[root] = low[root] = clock
+        clock += 1
+        root_children = 0
+        # frame: (node, slot of the link we came in on, next adjacency position)
+        stack = [[root, -1, indptr[root]]]
+
+        while stack:
+            frame = stack[-1]
+            node, via, pos = frame
+            if pos < indptr[node + 1]:
+                frame[2] = pos + 1
+                nxt, slot = indices[pos], slots[pos]
+                if slot == via:
+                    continue
+                if disc[nxt] < 0:
+                    disc[nxt] = low[nxt] = clock
+                    clock += 1
+                    if node == root:
+                        root_children += 1
+                    stack.append([nxt, slot, indptr[nxt]])
+                elif disc[nxt] < low[node]:
+                    low[node] = disc[nxt]
+                continue
+
+            stack.pop()
+            if not stack:
+                continue
+            up = stack[-1][0]
+            if low[node] < low[up]:
+                low[up] = low[node]
+            if low[node] > disc[up]:
+                bridges.append((up, node))
+            if up != root and low[node] >= disc[up]:
+                articulation.add(up)
+
+        if root_children > 1:
+            articulation.add(root)
+
+    names = graph.names
+    return {
+        "articulation_points": sorted(names[nid] for nid in articulation),
+        "bridges": sorted(tuple(sorted((names[a], names[b]))) for a, b in bridges),
+    }
+
+
+# ---------------------------------------------------------------
+# Loop candidates (STP risk)
+# ---------------------------------------------------------------
+def loop_candidates(graph, limit: int = 100) -> dict:
+    """
+    Redundant links that close a cycle. A BFS spanning forest is built
+    over the link graph; every link outside it closes exactly one
+    fundamental cycle, which STP must block. Returns
+    {"cyclomatic": m - n + c, "cycles": [[device, ...]]} with at most
+    `limit` cycles, shortest first. The graph holds no L2/L3 marking,
+    so routed links are candidates too.
+    """
+
+    indptr, indices, slots = graph.csr()
+    n = len(graph.names)
+    depth = np.full(n, -1, dtype=np.int32)
+    parent = np.full(n, -1, dtype=np.int32)
+    tree_slot = np.full(n, -1, dtype=np.int64)
+
+    # BFS forest: one tree per component, one vectorised step per level
+    roots = 0
+    for root in graph.nodes():
+        if depth[root] >= 0:
+            continue
+        roots += 1
+        depth[root] = 0
+        frontier = np.array([root], dtype=np.int64)
+        while len(frontier):
+            nbrs, parents, entry = _expand(indptr, indices, frontier)
+            fresh = depth[nbrs] < 0
+            nbrs, parents, entry = nbrs[fresh], parents[fresh], entry[fresh]
+            nbrs, first = np.unique(nbrs, return_index=True)
+            depth[nbrs] = depth[parents[first]] + 1
+            parent[nbrs] = parents[first]
+            tree_slot[nbrs] = slots[entry[first]]
+            frontier = nbrs.astype(np.int64)
+
+    live = graph.live_slots()
+    in_tree = np.zeros(len(graph.refs), dtype=bool)
+    in_tree[tree_slot[tree_slot >= 0]] = True
+    extra = live[~in_tree[live]]
+
+    src = np.frombuffer(graph.src, dtype=np.int32)[extra]
+    dst = np.frombuffer(graph.dst, dtype=np.int32)[extra]
+    # Shortest cycles first: a cycle's length is bounded by the tree depths
+    order = np.argsort(depth[src] + depth[dst], kind="stable")[:limit]
+
+    names = graph.names
+    depth_l, parent_l = depth.tolist(), parent.tolist()
+    cycles = []
+    for a, b in zip(src[order].tolist(), dst[order].tolist()):
+        left, right = [a], [b]
+        while left[-1] != right[-1]:
+            if depth_l[left[-1]] >= depth_l[right[-1]]:
+                left.append(parent_l[left[-1]])
+            else:
+                right.append(parent_l[right[-1]])
+        cycles.append([names[nid] for nid in left + right[-2::-1]])
+    cycles.sort(key=len)
+
+    return {
+        "cyclomatic": int(len(live) - len(graph) + roots),
+        "cycles": cycles,
+    }
@@ -0,0 +1,145 @@
+# ===============================================================
+#  NetDoc AI — STREAMING TOPOLOGY EXPORT (GraphML / JSON / DOT)
+#  Generators of text chunks straight off the TopologyGraph edge
+#  columns, read in fixed-size slot blocks: memory stays flat no
+#  matter how many links the fleet has.
+#
+#  Run:  python -m utils.topology_export graphml|json|dot OUT
+# ===============================================================
+
+import json
+import sys
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from utils.topology_graph import TOPOLOGY_PATH, TopologyGraph
+
+
+EXPORT_BLOCK = 4096
+
+
+# ---------------------------------------------------------------
+# Live links in fixed-size blocks of slots
+# ---------------------------------------------------------------
+def iter_links(graph, block: int = EXPORT_BLOCK):
+    """Yield (src, src_port, dst, dst_port, provenance) name tuples."""
+    names, ports = graph.names, graph.ports
+    refs = np.frombuffer(graph.refs, dtype=np.int32)
+
+    for start in range(0, len(refs), block):
+        for slot in (start + np.flatnonzero(refs[start:start + block])).tolist():
+            yield (
+                names[graph.src[slot]], ports[graph.src_port[slot]],
+                names[graph.dst[slot]], ports[graph.dst_port[slot]],
+                graph.provenance(slot),
+            )
+
+
+def iter_nodes(graph):
+    """Yield (name, reported) for every live node."""
+    for nid in graph.nodes():
+        yield graph.names[nid], graph.reported(graph.names[nid])
+
+
+# ---------------------------------------------------------------
+# Formats (each yields text chunks)
+# ---------------------------------------------------------------
+def export_graphml(graph):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="reported" for="node" attr.name="reported" attr.type="boolean"/>\n'
+        '  <key id="src_port" for="edge" attr.name="src_port" attr.type="string"/>\n'
+        '  <key id="dst_port" for="edge" attr.name="dst_port" attr.type="string"/>\n'
+        '  <key id="provenance" for="edge" attr.name="provenance" attr.type="string"/>\n'
+        '  <graph id="netdoc" edgedefault="undirected">\n'
+    )
+    for name, reported in iter_nodes(graph):
+        yield (
+            f'    <node id={quoteattr(name)}>'
+            f'<data key="reported">{str(reported).lower()}</data></node>\n'
+        )
+    for a, pa, b, pb, provenance in iter_links(graph):
+        yield (
+            f'    <edge source={quoteattr(a)} target={quoteattr(b)}>'
+            f'<data key="src_port">{_xml_text(pa)}</data>'
+            f'<data key="dst_port">{_xml_text(pb)}</data>'
+            f'<data key="provenance">{provenance}</data></edge>\n'
+        )
+    yield "  </graph>\n</graphml>\n"
+
+
+def _xml_text(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def export_json(graph):
+    """Node-link JSON (the layout networkx.node_link_graph reads)."""
+    yield '{"directed": false, "multigraph": true, "graph": {"name": "netdoc"},\n "nodes": ['
+    sep = "\n  "
+    for name, reported in iter_nodes(graph):
+        yield sep + json.dumps({"id": name, "reported": reported}, ensure_ascii=False)
+        sep = ",\n  "
+    yield '\n ],\n "links": ['
+    sep = "\n  "
+    for a, pa, b, pb, provenance in iter_links(graph):
+        yield sep + json.dumps(
+            {"source": a, "target": b, "source_port": pa, "target_port": pb, "provenance": provenance},
+            ensure_ascii=False,
+        )
+        sep = ",\n  "
+    yield "\n ]\n}\n"
+
+
+def _dot_id(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def export_dot(graph):
+    yield "graph netdoc {\n  node [shape=box];\n"
+    for name, reported in iter_nodes(graph):
+        yield f"  {_dot_id(name)}{'' if reported else ' [style=dashed]'};\n"
+    for a, pa, b, pb, provenance in iter_links(graph):
+        label = f"{pa} - {pb}" if pa or pb else ""
+        attrs = [f"label={_dot_id(label)}"] if label else []
+        if provenance != "cdp":
+            attrs.append(f"provenance={_dot_id(provenance)}")
+        if provenance == "subnet":
+            attrs.append("style=dashed")
+        yield f"  {_dot_id(a)} -- {_dot_id(b)}{' [' + ', '.join(attrs) + ']' if attrs else ''};\n"
+    yield "}\n"
+
+
+EXPORTERS = {
+    "graphml": export_graphml,
+    "json": export_json,
+    "dot": export_dot,
+}
+
+
+def write_export(graph, fmt: str, out) -> int:
+    """
+    Stream one format to `out` (path or text file object). Returns the
+    number of characters written.
+    """
+
+    chunks = EXPORTERS[fmt](graph)
+    fh = open(out, "w", encoding="utf-8") if isinstance(out, str) else out
+    written = 0
+    try:
+        for chunk in chunks:
+            fh.write(chunk)
+            written += len(chunk)
+    finally:
+        if fh is not out:
+            fh.close()
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in EXPORTERS:
+        sys.exit(f"usage: python -m utils.topology_export {'|'.join(EXPORTERS)} OUT")
+
+    size = write_export(TopologyGraph.load(TOPOLOGY_PATH), sys.argv[1], sys.argv[2])
+    print(json.dumps({"format": sys.argv[1], "chars": size}))
@@ -0,0 +1,433 @@
+# ===============================================================
+#  NetDoc AI — FLEET TOPOLOGY GRAPH
+#  Every device's CDP/LLDP neighbors in one undirected graph:
+#  interned node ids, columnar edge arrays, CSR adjacency built on
+#  demand. A device's snapshot is swapped in/out incrementally, so
+#  the whole-network map never needs the fleet re-parsed.
+# ===============================================================
+
+import json
+import os
+from array import array
+from sys import intern
+
+import numpy as np
+
+
+TOPOLOGY_PATH = os.getenv("NETDOC_TOPOLOGY_PATH", "topology.npz")
+
+# parse_config()'s hostname when the config names none
+UNKNOWN_HOSTNAME = "UnknownDevice"
+
+# Link provenance (TopologyGraph.provenance)
+REPORTED = "cdp"
+INFERRED = "subnet"
+
+
+# ---------------------------------------------------------------
+# Neighbor extraction from a parse_config() dict
+# ---------------------------------------------------------------
+def node_name(name: str) -> str:
+    """
+    CDP device ids often carry the domain ("SW1.corp.local"); hostnames
+    do not. Names with a space are device_key() labels and kept whole.
+    """
+    name = name.strip()
+    head = name.split(".", 1)[0]
+    if head.isdigit() or " " in name:
+        return name
+    return head or name
+
+
+def device_key(hostname: str, source: str = None) -> str:
+    """
+    Graph key of one device: its hostname or, when the config names
+    none, "UnknownDevice (<source file path>)" (as utils.batch labels
+    it), so hostname-less devices stay apart.
+    """
+
+    if hostname and hostname != UNKNOWN_HOSTNAME:
+        return hostname
+    return f"{UNKNOWN_HOSTNAME} ({source})" if source else UNKNOWN_HOSTNAME
+
+
+def device_links(parsed: dict) -> list:
+    """
+    [(local_port, remote_device, remote_port)] for one parsed device,
+    from the `show cdp/lldp neighbors` table only. The config's
+    `neighbors` list mixes in routing peers (BGP / OSPF), so a device
+    without a neighbor table reports no links.
+    """
+
+    return [
+        (local, node_name(info.get("device", "Unknown")), info.get("port") or "")
+        for local, info in (parsed.get("cdp_neighbors") or {}).items()
+    ]
+
+
+# ---------------------------------------------------------------
+# Graph store
+# ---------------------------------------------------------------
+class TopologyGraph:
+    """
+    Undirected, deduplicated link graph. Node and port names are
+    interned to ints once; each link lives in a slot of parallel int
+    arrays (src, dst, src_port, dst_port, refs). `refs` counts how many
+    device snapshots report the link (both ends usually do), so a slot
+    dies only when no reporter is left. Freed slots are reused, and
+    node ids stay stable for the life of the graph.
+
+    Links inferred from shared subnets (utils.link_inference) count as
+    one extra reporter and set the slot's `inferred` flag, so a link
+    seen both ways is stored once and carries both provenances.
+    """
+
+    def __init__(self):
+        self.names = []
+        self._node_id = {}
+        self._node_refs = array("i")
+        self.ports = [""]
+        self._port_id = {"": 0}
+
+        self.src = array("i")
+        self.dst = array("i")
+        self.src_port = array("i")
+        self.dst_port = array("i")
+        self.refs = array("i")
+        self.inferred = array("b")
+        self._slot = {}
+        self._free = []
+
+        self._reported = {}
+        self._inferred = set()
+        self.addresses = {}
+        self.version = 0
+        self._csr = None
+
+    # -----------------------------------------------------------
+    # Interning
+    # -----------------------------------------------------------
+    def node(self, name: str) -> int:
+        nid = self._node_id.get(name)
+        if nid is None:
+            nid = len(self.names)
+            self._node_id[intern(name)] = nid
+            self.names.append(intern(name))
+            self._node_refs.append(0)
+        return nid
+
+    def node_id(self, name: str):
+        return self._node_id.get(name)
+
+    def _port(self, name: str) -> int:
+        pid = self._port_id.get(name)
+        if pid is None:
+            pid = len(self.ports)
+            self._port_id[intern(name)] = pid
+            self.ports.append(intern(name))
+        return pid
+
+    def _key(self, a: int, pa: int, b: int, pb: int) -> tuple:
+        """Same link whichever end reports it."""
+        return (a, pa, b, pb) if (a, pa) <= (b, pb) else (b, pb, a, pa)
+
+    # -----------------------------------------------------------
+    # Incremental updates
+    # -----------------------------------------------------------
+    def _link(self, key: tuple) -> int:
+        slot = self._slot.get(key)
+        if slot is not None:
+            self.refs[slot] += 1
+            return slot
+
+        a, pa, b, pb = key
+        if self._free:
+            slot = self._free.pop()
+            self.src[slot], self.src_port[slot] = a, pa
+            self.dst[slot], self.dst_port[slot] = b, pb
+            self.refs[slot] = 1
+            self.inferred[slot] = 0
+        else:
+            slot = len(self.refs)
+            self.src.append(a)
+            self.src_port.append(pa)
+            self.dst.append(b)
+            self.dst_port.append(pb)
+            self.refs.append(1)
+            self.inferred.append(0)
+
+        self._slot[key] = slot
+        self._node_refs[a] += 1
+        self._node_refs[b] += 1
+        return slot
+
+    def _unlink(self, slot: int):
+        self.refs[slot] -= 1
+        if self.refs[slot]:
+            return
+
+        a, b = self.src[slot], self.dst[slot]
+        del self._slot[self._key(a, self.src_port[slot], b, self.dst_port[slot])]
+        self._node_refs[a] -= 1
+        self._node_refs[b] -= 1
+        self._free.append(slot)
+
+    def update_device(self, hostname: str, links) -> bool:
+        """
+        Replace everything `hostname` reported with `links`
+        ([(local_port, remote_device, remote_port)], see device_links()).
+        Costs O(old + new links of this device). Returns False (and
+        leaves the version alone) when the snapshot is unchanged.
+        """
+
+        me = self.node(node_name(hostname))
+        keys = set()
+        for local, remote, remote_port in links:
+            other = self.node(node_name(remote))
+            if other != me:
+                keys.add(self._key(me, self._port(local or ""), other, self._port(remote_port or "")))
+
+        old = self._reported.get(me)
+        if old is not None and old[1] == keys:
+            return False
+
+        if old is None:
+            self._node_refs[me] += 1
+        else:
+            for slot in old[0]:
+                self._unlink(slot)
+
+        self._reported[me] = (tuple(self._link(key) for key in keys), keys)
+        self._touch()
+        return True
+
+    def add_parsed(self, parsed: dict, source: str = None) -> bool:
+        """`source` (the config's file path) keys a device with no hostname."""
+        return self.update_device(device_key(parsed.get("hostname"), source), device_links(parsed))
+
+    def set_inferred(self, links) -> int:
+        """
+        Replace the inferred link set with `links`
+        ([(device, port, device, port)]). Only the difference to the
+        previous set is applied. Returns the number of links changed.
+        """
+
+        keys = set()
+        for a, pa, b, pb in links:
+            a, b = self.node(node_name(a)), self.node(node_name(b))
+            if a != b:
+                keys.add(self._key(a, self._port(pa or ""), b, self._port(pb or "")))
+
+        added, removed = keys - self._inferred, self._inferred - keys
+        for key in removed:
+            slot = self._slot[key]
+            self.inferred[slot] = 0
+            self._unlink(slot)
+        for key in added:
+            self.inferred[self._link(key)] = 1
+
+        self._inferred = keys
+        if added or removed:
+            self._touch()
+        return len(added) + len(removed)
+
+    def remove_device(self, hostname: str) -> bool:
+        """Drop a device's snapshot. Links its neighbors report survive."""
+        me = self._node_id.get(node_name(hostname))
+        old = self._reported.pop(me, None) if me is not None else None
+        if old is None:
+            return False
+
+        for slot in old[0]:
+            self._unlink(slot)
+        self._node_refs[me] -= 1
+        self.addresses.pop(self.names[me], None)
+        self._touch()
+        return True
+
+    def _touch(self):
+        self.version += 1
+        self._csr = None
+
+    # -----------------------------------------------------------
+    # Read side
+    # -----------------------------------------------------------
+    def reported(self, hostname: str) -> bool:
+        nid = self._node_id.get(node_name(hostname))
+        return nid is not None and nid in self._reported
+
+    def nodes(self) -> list:
+        """Ids of nodes that are reported or referenced by a live link."""
+        return [nid for nid, refs in enumerate(self._node_refs) if refs > 0]
+
+    def live_slots(self) -> np.ndarray:
+        return np.flatnonzero(np.frombuffer(self.refs, dtype=np.int32) > 0)
+
+    def provenance(self, slot: int) -> str:
+        """"cdp", "subnet" or "cdp+subnet" for one live link slot."""
+        inferred = self.inferred[slot]
+        if self.refs[slot] > inferred:
+            return f"{REPORTED}+{INFERRED}" if inferred else REPORTED
+        return INFERRED
+
+    def edge_count(self) -> int:
+        return len(self._slot)
+
+    def __len__(self):
+        return sum(1 for refs in self._node_refs if refs > 0)
+
+    def links(self, provenance: bool = False):
+        """
+        Yield (device, port, device, port) for every live link, with the
+        provenance() string appended when provenance=True.
+        """
+        names, ports = self.names, self.ports
+        for slot in self.live_slots().tolist():
+            link = (
+                names[self.src[slot]], ports[self.src_port[slot]],
+                names[self.dst[slot]], ports[self.dst_port[slot]],
+            )
+            yield link + (self.provenance(slot),) if provenance else link
+
+    def csr(self):
+        """
+        (indptr, indices, slots) over every node id. Neighbors of node i
+        are indices[indptr[i]:indptr[i+1]]; slots gives the link slot of
+        each entry. Parallel links appear once per link. Cached until
+        the next update.
+        """
+
+        if self._csr is not None:
+            return self._csr
+
+        n = len(self.names)
+        live = self.live_slots()
+        src = np.frombuffer(self.src, dtype=np.int32)[live]
+        dst = np.frombuffer(self.dst, dtype=np.int32)[live]
+
+        rows = np.concatenate((src, dst))
+        cols = np.concatenate((dst, src))
+        slots = np.concatenate((live, live)).astype(np.int32)
+
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        self._csr = (indptr, cols[order], slots[order])
+        return self._csr
+
+    def neighbors(self, hostname: str) -> list:
+        nid = self._node_id.get(node_name(hostname))
+        if nid is None:
+            return []
+        indptr, indices, _ = self.csr()
+        return sorted({self.names[i] for i in indices[indptr[nid]:indptr[nid + 1]].tolist()})
+
+    def degree(self) -> np.ndarray:
+        indptr = self.csr()[0]
+        return np.diff(indptr)
+
+    def stats(self) -> dict:
+        return {
+            "nodes": len(self),
+            "links": self.edge_count(),
+            "reported": len(self._reported),
+            "inferred": len(self._inferred),
+            "version": self.version,
+        }
+
+    # -----------------------------------------------------------
+    # Fleet construction
+    # -----------------------------------------------------------
+    @classmethod
+    def from_parsed(cls, devices) -> "TopologyGraph":
+        graph = cls()
+        for parsed in devices:
+            graph.add_parsed(parsed, parsed.get("file"))
+        return graph
+
+    def update_records(self, records) -> int:
+        """
+        Apply utils.fleet records ({"hostname", "links", "addresses",
+        "error"}). Failed records are skipped so a parse error never
+        wipes a device's known links. Interface addresses are kept for
+        utils.link_inference. Returns how many devices changed.
+        """
+
+        changed = 0
+        for record in records:
+            if record.get("error") or record.get("links") is None:
+                continue
+            hostname = device_key(record.get("hostname"), record["device"])
+            changed += self.update_device(hostname, record["links"])
+            if record.get("addresses") is not None:
+                self.addresses[node_name(hostname)] = [tuple(a) for a in record["addresses"]]
+        return changed
+
+    # -----------------------------------------------------------
+    # Persistence (one .npz: int columns + name tables)
+    # -----------------------------------------------------------
+    def save(self, path: str = TOPOLOGY_PATH):
+        reporters = sorted(self._reported)
+        owned = [self._reported[nid][0] for nid in reporters]
+        indptr = np.zeros(len(reporters) + 1, dtype=np.int64)
+        np.cumsum([len(slots) for slots in owned], out=indptr[1:])
+
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp,
+            names=np.array(json.dumps(self.names)),
+            ports=np.array(json.dumps(self.ports)),
+            columns=np.array([self.src, self.src_port, self.dst, self.dst_port, self.refs, self.inferred], dtype=np.int32)
+            .reshape(6, len(self.refs)),
+            addresses=np.array(json.dumps(self.addresses)),
+            reporters=np.array(reporters, dtype=np.int32),
+            reported_ptr=indptr,
+            reported=np.array([s for slots in owned for s in slots], dtype=np.int32),
+            version=np.array(self.version),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = TOPOLOGY_PATH) -> "TopologyGraph":
+        graph = cls()
+        with np.load(path) as data:
+            for name in json.loads(str(data["names"])):
+                graph.node(name)
+            for port in json.loads(str(data["ports"]))[1:]:
+                graph._port(port)
+
+            columns = data["columns"]
+            src, src_port, dst, dst_port, refs = (array("i", col.tolist()) for col in columns[:5])
+            graph.src, graph.src_port, graph.dst, graph.dst_port, graph.refs = src, src_port, dst, dst_port, refs
+            graph.inferred = array("b", columns[5].tolist())
+
+            for slot, count in enumerate(refs):
+                if count:
+                    key = (src[slot], src_port[slot], dst[slot], dst_port[slot])
+                    graph._slot[key] = slot
+                    graph._node_refs[src[slot]] += 1
+                    graph._node_refs[dst[slot]] += 1
+                    if graph.inferred[slot]:
+                        graph._inferred.add(key)
+                else:
+                    graph._free.append(slot)
+
+            graph.addresses = {
+                host: [tuple(a) for a in entries]
+                for host, entries in json.loads(str(data["addresses"])).items()
+            }
+
+            indptr, reported = data["reported_ptr"], data["reported"]
+            for i, nid in enumerate(data["reporters"].tolist()):
+                slots = tuple(reported[indptr[i]:indptr[i + 1]].tolist())
+                keys = {(src[s], src_port[s], dst[s], dst_port[s]) for s in slots}
+                graph._reported[nid] = (slots, keys)
+                graph._node_refs[nid] += 1
+
+            graph.version = int(data["version"])
+        return graph
+
+    @classmethod
+    def load_or_new(cls, path: str = TOPOLOGY_PATH) -> "TopologyGraph":
+        return cls.load(path) if os.path.exists(path) else cls()
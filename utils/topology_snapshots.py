@@ -0,0 +1,266 @@
+# ===============================================================
+#  NetDoc AI — TOPOLOGY SNAPSHOTS + DIFF
+#  Each snapshot keeps sorted 64-bit fingerprints of its devices
+#  and links plus a 16-ary XOR hash tree over them, so diffing two
+#  snapshots only descends into buckets that differ.
+# ===============================================================
+
+import calendar
+import json
+import os
+import time
+from hashlib import blake2b
+
+import numpy as np
+
+from utils.cache import LRUCache
+
+
+SNAPSHOT_DIR = os.getenv("NETDOC_TOPOLOGY_SNAPSHOTS", "topology_snapshots")
+SNAPSHOT_ENTRIES = int(os.getenv("NETDOC_TOPOLOGY_SNAPSHOT_ENTRIES", "8"))
+
+ID_TIME = "%Y%m%dT%H%M%S"
+FANOUT_BITS = 4
+MAX_LEAF_BITS = 20
+
+
+# ---------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, elementwise on uint64."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _name_fps(names) -> np.ndarray:
+    return np.fromiter(
+        (int.from_bytes(blake2b(name.encode(), digest_size=8).digest(), "little") for name in names),
+        dtype=np.uint64, count=len(names),
+    )
+
+
+def graph_fingerprints(graph):
+    """
+    (node_fp, nodes, edge_fp, slots) for the live part of a
+    TopologyGraph. A device's fingerprint is the hash of its name; a
+    link's combines both (device, port) ends order-independently.
+    """
+
+    nodes = np.array(graph.nodes(), dtype=np.int64)
+    name_fp = _name_fps(graph.names)
+    port_fp = _mix(_name_fps(graph.ports) + np.uint64(1))
+
+    slots = graph.live_slots()
+    column = lambda values: np.frombuffer(values, dtype=np.int32)[slots]
+    end_a = _mix(name_fp[column(graph.src)] ^ port_fp[column(graph.src_port)])
+    end_b = _mix(name_fp[column(graph.dst)] ^ port_fp[column(graph.dst_port)])
+    with np.errstate(over="ignore"):
+        edge_fp = _mix(np.minimum(end_a, end_b) ^ _mix(np.maximum(end_a, end_b) + np.uint64(0x9E3779B97F4A7C15)))
+
+    return name_fp[nodes], nodes, edge_fp, slots
+
+
+# ---------------------------------------------------------------
+# XOR hash tree over a sorted fingerprint array
+# ---------------------------------------------------------------
+def _leaf_bits(n: int) -> int:
+    """Deep enough for ~8 fingerprints per leaf bucket."""
+    bits = FANOUT_BITS
+    while (1 << bits) * 8 < n and bits < MAX_LEAF_BITS:
+        bits += FANOUT_BITS
+    return bits
+
+
+def hash_tree(fps: np.ndarray) -> list:
+    """levels[i] holds the XOR of every fingerprint in each of 16**(i+1) buckets."""
+    bits = _leaf_bits(len(fps))
+    leaf = np.zeros(1 << bits, dtype=np.uint64)
+    if len(fps):
+        bucket = (fps >> np.uint64(64 - bits)).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        leaf[bucket[starts]] = np.bitwise_xor.reduceat(fps, starts)
+
+    levels = [leaf]
+    while len(levels[0]) > 1 << FANOUT_BITS:
+        levels.insert(0, np.bitwise_xor.reduce(levels[0].reshape(-1, 1 << FANOUT_BITS), axis=1))
+    return levels
+
+
+def _bucket_slice(fps: np.ndarray, bucket: int, bits: int) -> slice:
+    shift = 64 - bits
+    lo = np.uint64(bucket << shift)
+    hi = np.uint64((bucket << shift) + (1 << shift) - 1)
+    return slice(int(np.searchsorted(fps, lo, "left")), int(np.searchsorted(fps, hi, "right")))
+
+
+def tree_diff(old_fp, old_tree, new_fp, new_tree):
+    """
+    (removed, added) positions into old_fp / new_fp. Only buckets whose
+    hashes differ are expanded, so the work follows the size of the
+    change (times the tree depth), not the size of either snapshot.
+    """
+
+    depth = min(len(old_tree), len(new_tree))
+    width = 1 << FANOUT_BITS
+    buckets = np.arange(width)
+
+    for level in range(depth):
+        if level:
+            buckets = (buckets[:, None] * width + np.arange(width)).ravel()
+        buckets = buckets[old_tree[level][buckets] != new_tree[level][buckets]]
+        if not len(buckets):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    bits = depth * FANOUT_BITS
+    removed, added = [], []
+    for bucket in buckets.tolist():
+        old_range, new_range = _bucket_slice(old_fp, bucket, bits), _bucket_slice(new_fp, bucket, bits)
+        a, b = old_fp[old_range], new_fp[new_range]
+        # Fingerprints may repeat (equal labels), so no assume_unique
+        removed.append(old_range.start + np.flatnonzero(~np.isin(a, b)))
+        added.append(new_range.start + np.flatnonzero(~np.isin(b, a)))
+
+    return np.concatenate(removed), np.concatenate(added)
+
+
+# ---------------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------------
+class TopologySnapshot:
+    """
+    Devices and links of a TopologyGraph at one point in time, sorted
+    by fingerprint. Labels are kept alongside so a diff can name what
+    changed without the graph itself.
+    """
+
+    def __init__(self, snapshot_id, taken_at, node_fp, node_labels, edge_fp, edge_labels, label=""):
+        self.id = snapshot_id
+        self.taken_at = taken_at
+        self.label = label
+        self.node_fp = node_fp
+        self.node_labels = node_labels
+        self.edge_fp = edge_fp
+        self.edge_labels = edge_labels
+        self.node_tree = hash_tree(node_fp)
+        self.edge_tree = hash_tree(edge_fp)
+
+    @property
+    def root(self) -> tuple:
+        """Whole-snapshot fingerprint: equal roots mean nothing changed."""
+        return (
+            int(np.bitwise_xor.reduce(self.node_tree[0])), len(self.node_fp),
+            int(np.bitwise_xor.reduce(self.edge_tree[0])), len(self.edge_fp),
+        )
+
+    @classmethod
+    def from_graph(cls, graph, label: str = "") -> "TopologySnapshot":
+        node_fp, nodes, edge_fp, slots = graph_fingerprints(graph)
+
+        order = np.argsort(node_fp, kind="stable")
+        node_labels = [graph.names[nid] for nid in nodes[order].tolist()]
+
+        order_e = np.argsort(edge_fp, kind="stable")
+        names, ports = graph.names, graph.ports
+        edge_labels = [
+            [names[graph.src[s]], ports[graph.src_port[s]], names[graph.dst[s]], ports[graph.dst_port[s]]]
+            for s in slots[order_e].tolist()
+        ]
+
+        node_fp, edge_fp = node_fp[order], edge_fp[order_e]
+        content = blake2b(node_fp.tobytes(), digest_size=4)
+        content.update(edge_fp.tobytes())
+
+        # Time + graph version + content hash: two processes snapshotting
+        # different graphs within the same second cannot share an id
+        taken_at = time.time()
+        snapshot_id = f"{time.strftime(ID_TIME, time.gmtime(taken_at))}-{graph.version}-{content.hexdigest()}"
+        return cls(snapshot_id, taken_at, node_fp, node_labels, edge_fp, edge_labels, label)
+
+    def save(self, path: str):
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            node_fp=self.node_fp,
+            edge_fp=self.edge_fp,
+            meta=np.array(json.dumps({
+                "id": self.id, "taken_at": self.taken_at, "label": self.label,
+                "nodes": self.node_labels, "links": self.edge_labels,
+            })),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TopologySnapshot":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                meta["id"], meta["taken_at"], data["node_fp"], meta["nodes"],
+                data["edge_fp"], meta["links"], meta.get("label", ""),
+            )
+
+
+def diff_snapshots(old: TopologySnapshot, new: TopologySnapshot) -> dict:
+    """{"added_devices", "removed_devices", "added_links", "removed_links"}."""
+    gone_n, new_n = tree_diff(old.node_fp, old.node_tree, new.node_fp, new.node_tree)
+    gone_e, new_e = tree_diff(old.edge_fp, old.edge_tree, new.edge_fp, new.edge_tree)
+
+    return {
+        "from": old.id,
+        "to": new.id,
+        "added_devices": sorted(new.node_labels[i] for i in new_n.tolist()),
+        "removed_devices": sorted(old.node_labels[i] for i in gone_n.tolist()),
+        "added_links": sorted(tuple(new.edge_labels[i]) for i in new_e.tolist()),
+        "removed_links": sorted(tuple(old.edge_labels[i]) for i in gone_e.tolist()),
+    }
+
+
+# ---------------------------------------------------------------
+# On-disk store (one .npz per snapshot, ids sort by time)
+# ---------------------------------------------------------------
+class SnapshotStore:
+    def __init__(self, directory: str = SNAPSHOT_DIR, entries: int = SNAPSHOT_ENTRIES):
+        self.directory = directory
+        self._loaded = LRUCache(entries)
+
+    def _path(self, snapshot_id: str) -> str:
+        return os.path.join(self.directory, f"{snapshot_id}.npz")
+
+    def ids(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[:-4] for name in os.listdir(self.directory)
+            if name.endswith(".npz") and not name.endswith(".tmp.npz")
+        )
+
+    def load(self, snapshot_id: str) -> TopologySnapshot:
+        snapshot = self._loaded.get(snapshot_id)
+        if snapshot is None:
+            snapshot = TopologySnapshot.load(self._path(snapshot_id))
+            self._loaded.put(snapshot_id, snapshot)
+        return snapshot
+
+    def latest(self, before: float = None):
+        """Newest snapshot (taken at or before `before`, a Unix time), or None."""
+        for snapshot_id in reversed(self.ids()):
+            if before is None or calendar.timegm(time.strptime(snapshot_id[:15], ID_TIME)) <= before:
+                return self.load(snapshot_id)
+        return None
+
+    def take(self, graph, label: str = "") -> TopologySnapshot:
+        """Snapshot the graph unless it is identical to the latest one."""
+        snapshot = TopologySnapshot.from_graph(graph, label)
+        latest = self.latest()
+        if latest is not None and latest.root == snapshot.root:
+            return latest
+
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot.save(self._path(snapshot.id))
+        self._loaded.put(snapshot.id, snapshot)
+        return snapshot
+
+    def diff(self, old_id: str, new_id: str) -> dict:
+        return diff_snapshots(self.load(old_id), self.load(new_id))